@@ -0,0 +1,172 @@
+"""rental_api 부하 테스트
+
+일정한 요청률(rps)로 조회/변경 요청을 보내고 p50/p99 지연 시간을 출력한다.
+지연 시간은 요청이 예정된 시각부터 측정하므로, 서버가 밀리면 대기 시간도 함께 반영된다.
+
+사용 예:
+    python benchmarks/api_load.py --rate 300 --duration 10          # 임시 복사본으로 서버를 직접 띄움
+    python benchmarks/api_load.py --url http://127.0.0.1:8765 --rate 300
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rental_api import RentalService  # noqa: E402
+from rental_engine import DATA_FILE, RentalManagement  # noqa: E402
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def fetch(reader, writer, method, path, body=None):
+    payload = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n\r\n".encode('latin-1')
+        + payload
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    response = await reader.readexactly(length)
+    return int(status_line.split()[1]), response
+
+
+def build_requests(targets, write_ratio):
+    """요청 (메서드, 경로, 본문) 을 무작위로 생성"""
+    while True:
+        building, tenant = random.choice(targets)
+        path_args = f"{quote(building)}/{quote(tenant)}"
+        if random.random() < write_ratio:
+            yield 'POST', '/payments', {'building': building, 'tenant': tenant,
+                                        'date': '2024-01-01', 'amount': 1000}
+            continue
+        yield random.choice((
+            ('GET', '/balances', None),
+            ('GET', '/balances?unpaid_only=1', None),
+            ('GET', '/tenants', None),
+            ('GET', f"/tenants/{path_args}", None),
+            ('GET', f"/payments/{path_args}", None),
+            ('GET', f"/reports/{path_args}", None),
+        ))
+
+
+async def run_load(host, port, targets, rate, duration, connections, write_ratio):
+    schedule = asyncio.Queue()
+    latencies = []
+    errors = 0
+    requests = build_requests(targets, write_ratio)
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while True:
+                scheduled = await schedule.get()
+                if scheduled is None:
+                    return
+                method, path, body = next(requests)
+                status, _ = await fetch(reader, writer, method, path, body)
+                latencies.append(time.perf_counter() - scheduled)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    workers = [asyncio.create_task(worker()) for _ in range(connections)]
+    start = time.perf_counter()
+    interval = 1.0 / rate
+    sent = 0
+    while True:
+        scheduled = start + sent * interval
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        schedule.put_nowait(scheduled)
+        sent += 1
+    for _ in workers:
+        schedule.put_nowait(None)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+async def main_async(args):
+    service = server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+        rental_manager = RentalManagement(args.data)
+    else:
+        # 실제 데이터가 바뀌지 않도록 임시 복사본으로 서버 실행
+        work_dir = tempfile.mkdtemp(prefix='rental_api_load_')
+        data_file = os.path.join(work_dir, 'rental_data.json')
+        shutil.copy2(args.data, data_file)
+        rental_manager = RentalManagement(data_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        rental_manager.load_data()
+
+    targets = [(building, tenant) for building, tenants in rental_manager.buildings.items() for tenant in tenants]
+    if not targets:
+        print("임대인이 없는 데이터로는 부하 테스트를 할 수 없습니다.")
+        return 1
+
+    if not args.url:
+        service = RentalService(rental_manager)
+        server = await service.start('127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    try:
+        latencies, errors, elapsed = await run_load(host, port, targets, args.rate, args.duration,
+                                                    args.connections, args.write_ratio)
+    finally:
+        if server:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+
+    print(f"요청 {len(latencies):,}건 / {elapsed:.1f}초 = {len(latencies) / elapsed:.0f} rps (목표 {args.rate} rps)")
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.1f}ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms, "
+          f"최대 {max(latencies, default=0) * 1000:.1f}ms, 오류 {errors}건")
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="rental_api 부하 테스트")
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (생략하면 임시 서버를 띄움)")
+    parser.add_argument('--data', default=os.path.join(ROOT, DATA_FILE), help="데이터 파일 경로")
+    parser.add_argument('--rate', type=float, default=300, help="초당 요청 수 (기본값: 300)")
+    parser.add_argument('--duration', type=float, default=10, help="측정 시간(초) (기본값: 10)")
+    parser.add_argument('--connections', type=int, default=16, help="동시 연결 수 (기본값: 16)")
+    parser.add_argument('--write-ratio', type=float, default=0.02, help="변경 요청 비율 (기본값: 0.02)")
+    args = parser.parse_args(argv)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""벤치마크 공통 준비: 합성 포트폴리오 파일과 로드된 엔진
+
+규모는 환경 변수로 바꿀 수 있다 (기본값: 건물 10 x 임대인 20, 최대 5년 이력).
+    RENTAL_BENCH_BUILDINGS, RENTAL_BENCH_TENANTS, RENTAL_BENCH_YEARS
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rental_engine import RentalManagement  # noqa: E402
+from synthetic import generate_portfolio  # noqa: E402
+
+BENCH_BUILDINGS = int(os.environ.get('RENTAL_BENCH_BUILDINGS', 10))
+BENCH_TENANTS = int(os.environ.get('RENTAL_BENCH_TENANTS', 20))
+BENCH_YEARS = int(os.environ.get('RENTAL_BENCH_YEARS', 5))
+
+
+def remove_snapshots(data_file):
+    """컴파일된 스냅샷을 지워 다음 load_data 가 JSON 을 읽게 한다"""
+    for suffix in ('.snapshot0', '.snapshot1'):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(data_file + suffix)
+
+
+def wait_for_snapshot():
+    """백그라운드 스냅샷 생성이 측정에 섞이지 않도록 끝날 때까지 대기"""
+    with contextlib.suppress(ImportError):
+        import rental_snapshot
+        rental_snapshot.compiler.wait()
+
+
+def load_quietly(rental_manager, compile_snapshot=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        rental_manager.load_data(compile_snapshot)
+    return rental_manager
+
+
+@pytest.fixture(scope='session')
+def portfolio_file(tmp_path_factory):
+    data = generate_portfolio(BENCH_BUILDINGS, BENCH_TENANTS, BENCH_YEARS, seed=1)
+    path = tmp_path_factory.mktemp('portfolio') / 'rental_data.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def loaded_manager(portfolio_file):
+    """읽기 전용으로만 사용하는 로드된 엔진 (변경하는 벤치마크는 fresh_manager 사용)
+
+    기준값과 비교할 수 있도록 컴파일된 스냅샷이 아닌 JSON 에서 불러온다.
+    """
+    wait_for_snapshot()
+    remove_snapshots(portfolio_file)
+    rental_manager = load_quietly(RentalManagement(portfolio_file))
+    wait_for_snapshot()
+    return rental_manager
+
+
+@pytest.fixture
+def fresh_manager(portfolio_file, tmp_path):
+    """테스트마다 새로 로드한 엔진 (저장하면 임시 폴더의 복사본에 기록)"""
+    data_file = tmp_path / 'rental_data.json'
+    shutil.copyfile(portfolio_file, data_file)
+    rental_manager = load_quietly(RentalManagement(str(data_file)))
+    wait_for_snapshot()
+    return rental_manager
@@ -0,0 +1,67 @@
+"""rental_engine 가져오기 시간 측정
+
+새 파이썬 프로세스에서 rental_engine 만 가져오는 데 걸리는 시간을 여러 번 재고,
+최솟값이 예산을 넘거나 GUI/무거운 모듈이 함께 로드되면 종료 코드 1 을 돌려준다.
+프로세스 풀 작업자나 서비스에 엔진을 넣을 때의 시작 비용을 지키기 위한 검사다.
+
+사용 예:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 30 --runs 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 엔진과 함께 로드되면 안 되는 모듈
+FORBIDDEN_MODULES = ('tkinter', 'tkcalendar', 'matplotlib', 'pandas', 'numpy', 'win32api', 'xlsxwriter')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def measure(module, runs):
+    """새 프로세스에서 모듈을 가져오는 시간(초) 목록과 로드된 모듈 목록"""
+    timings = []
+    modules = set()
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE.format(module=module)], cwd=ROOT)
+        result = json.loads(output)
+        timings.append(result['elapsed'])
+        modules.update(result['modules'])
+    return timings, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="rental_engine 가져오기 시간 측정")
+    parser.add_argument('--module', default='rental_engine')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=50.0, help="허용 가져오기 시간 (기본값: 50ms)")
+    args = parser.parse_args(argv)
+
+    timings, modules = measure(args.module, args.runs)
+    best = min(timings) * 1000
+    median = sorted(timings)[len(timings) // 2] * 1000
+    print(f"{args.module}: 최소 {best:.1f}ms, 중앙값 {median:.1f}ms ({args.runs}회, 예산 {args.budget_ms:.0f}ms)")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN_MODULES if name in modules]
+    if loaded:
+        print(f"실패: 함께 로드되면 안 되는 모듈이 로드됨: {', '.join(loaded)}")
+        failed = True
+    if best > args.budget_ms:
+        print("실패: 가져오기 시간이 예산을 초과함")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
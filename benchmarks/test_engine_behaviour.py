@@ -0,0 +1,462 @@
+"""엔진 동작 검사: API 쓰기, 스냅샷, 저장 충돌, 백업, 변경 이력
+
+    python -m pytest benchmarks/test_engine_behaviour.py
+"""
+import asyncio
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import rental_audit
+import rental_cli
+import rental_profiling
+from conftest import load_quietly, remove_snapshots, wait_for_snapshot
+from rental_api import HttpError, RentalService, write_bulk_payments, write_payment
+from rental_audit import AuditLog
+from rental_backup import BackupStore
+from rental_engine import RentalManagement, SaveConflictError
+
+
+def all_tenants(rental_manager):
+    return [(building, tenant) for building, tenants in rental_manager.buildings.items() for tenant in tenants]
+
+
+def run_writes(rental_manager, requests):
+    """API 작성자 작업으로 (처리 함수, 본문) 요청을 순서대로 실행하고 결과(또는 예외) 목록을 돌려준다"""
+    async def main():
+        service = RentalService(rental_manager)
+        server = await service.start('127.0.0.1', 0)
+        try:
+            return await asyncio.gather(*(service.submit_write(handler, body) for handler, body in requests),
+                                        return_exceptions=True)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_failed_api_write_leaves_data_unchanged(fresh_manager):
+    # 잘못된 요청은 400 으로 실패하고 데이터, 버전, 파일을 바꾸지 않는다
+    building, tenant = all_tenants(fresh_manager)[0]
+    version = fresh_manager.version
+    data = fresh_manager.to_json_data()
+    with open(fresh_manager.data_file, 'rb') as f:
+        saved = f.read()
+
+    results = run_writes(fresh_manager, [
+        (write_payment, {'building': building, 'tenant': '없는 임대인', 'date': '2024-01-01', 'amount': 1000}),
+        (write_payment, {'building': building, 'tenant': tenant, 'date': '2024-13-01', 'amount': 1000}),
+        (write_payment, {'building': building, 'tenant': tenant}),
+        (write_bulk_payments, {'payments': 'x'}),
+    ])
+    assert all(isinstance(result, HttpError) and result.status == 400 for result in results)
+    assert fresh_manager.version == version
+    assert fresh_manager.to_json_data() == data
+    with open(fresh_manager.data_file, 'rb') as f:
+        assert f.read() == saved
+
+    # 일부만 잘못된 일괄 요청은 올바른 항목만 반영하고 저장한다
+    payments = [{'building': building, 'tenant': tenant, 'date': '2024-02-01', 'amount': 1000}, 'x', {'amount': 1}]
+    [result] = run_writes(fresh_manager, [(write_bulk_payments, {'payments': payments})])
+    assert result['imported'] == 1
+    assert [error['index'] for error in result['errors']] == [1, 2]
+    with open(fresh_manager.data_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == fresh_manager.to_json_data() != data
+
+
+def test_failed_api_save_rolls_back_and_recovers(fresh_manager, monkeypatch):
+    # 저장에 실패한 묶음은 되돌리고 파일의 내용을 게시하며, 충돌이 이후의 쓰기를 막지 않는다
+    building, tenant = all_tenants(fresh_manager)[0]
+    other_building, other = all_tenants(fresh_manager)[-1]
+    data = fresh_manager.to_json_data()
+    save_data = fresh_manager.save_data
+
+    def failing_save(force=False):
+        raise OSError("디스크가 가득 찼습니다")
+
+    monkeypatch.setattr(fresh_manager, 'save_data', failing_save)
+    [result] = run_writes(fresh_manager, [
+        (write_payment, {'building': building, 'tenant': tenant, 'date': '2024-01-01', 'amount': 1000}),
+    ])
+    assert isinstance(result, HttpError) and result.status == 500
+    assert fresh_manager.to_json_data() == fresh_manager.snapshot().to_json_data() == data
+
+    # 같은 임대인을 파일에서 고쳤으면 409 로 실패하고 파일의 내용을 따른다
+    monkeypatch.setattr(fresh_manager, 'save_data', save_data)
+    edit_file(fresh_manager.data_file, lambda data: data[building][tenant].update(monthly_rent=456000))
+    payment = {'building': building, 'tenant': tenant, 'date': '2024-02-01', 'amount': 2000}
+    [result] = run_writes(fresh_manager, [(write_payment, payment)])
+    assert isinstance(result, HttpError) and result.status == 409
+    assert fresh_manager.buildings[building][tenant]['monthly_rent'] == 456000
+    assert len(fresh_manager.buildings[building][tenant]['payments']) == len(data[building][tenant]['payments'])
+
+    # 이후의 쓰기는 다시 저장된다
+    results = run_writes(fresh_manager, [
+        (write_payment, payment),
+        (write_payment, {'building': other_building, 'tenant': other, 'date': '2024-02-01', 'amount': 3000}),
+    ])
+    assert results == [{'imported': 1}, {'imported': 1}]
+    with open(fresh_manager.data_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved == fresh_manager.to_json_data()
+    assert saved[building][tenant]['monthly_rent'] == 456000
+    assert len(saved[building][tenant]['payments']) == len(data[building][tenant]['payments']) + 1
+
+
+def test_snapshot_is_unchanged_by_later_writes(fresh_manager):
+    # 스냅샷 뒤의 쓰기는 임대인을 복사한 뒤 바꾸므로 스냅샷은 그대로이고, 바뀌지 않은 임대인은 공유한다
+    building, tenant = all_tenants(fresh_manager)[0]
+    other_building, other = all_tenants(fresh_manager)[-1]
+    snapshot = fresh_manager.snapshot()
+    assert fresh_manager.snapshot() is snapshot
+    data = snapshot.to_json_data()
+
+    fresh_manager.add_payment(building, tenant, '2024-01-01', 1000)
+    fresh_manager.add_monthly_rent_override(building, tenant, date(2024, 1, 1), 1)
+    fresh_manager.rename_building(other_building, '새 건물')
+    assert snapshot.to_json_data() == data
+    assert snapshot.version != fresh_manager.version
+    assert snapshot.buildings[building][tenant] is not fresh_manager.buildings[building][tenant]
+    assert snapshot.buildings[other_building][other] is fresh_manager.buildings['새 건물'][other]
+
+    latest = fresh_manager.snapshot()
+    assert latest is not snapshot
+    assert latest.to_json_data() == fresh_manager.to_json_data()
+
+
+def edit_file(data_file, edit):
+    """다른 프로그램이 데이터 파일을 고친 것처럼 JSON 을 직접 수정"""
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def test_save_merges_file_changes_and_reports_conflicts(fresh_manager):
+    # 다른 임대인을 바꾼 파일 내용은 합쳐 저장하고, 같은 임대인을 양쪽에서 바꿨으면 저장하지 않는다
+    building, tenant = all_tenants(fresh_manager)[0]
+    other_building, other = all_tenants(fresh_manager)[-1]
+    fresh_manager.add_payment(building, tenant, '2024-01-01', 1000)
+    edit_file(fresh_manager.data_file, lambda data: data[other_building][other].update(monthly_rent=123000))
+    fresh_manager.save_data()
+    assert fresh_manager.buildings[other_building][other]['monthly_rent'] == 123000
+    with open(fresh_manager.data_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == fresh_manager.to_json_data()
+
+    fresh_manager.add_payment(building, tenant, '2024-02-01', 2000)
+    edit_file(fresh_manager.data_file, lambda data: data[building][tenant].update(monthly_rent=456000))
+    with open(fresh_manager.data_file, 'rb') as f:
+        theirs = f.read()
+    with pytest.raises(SaveConflictError) as error:
+        fresh_manager.save_data()
+    assert error.value.conflicts == [(building, tenant)]
+    with open(fresh_manager.data_file, 'rb') as f:
+        assert f.read() == theirs
+    with pytest.raises(SaveConflictError):
+        fresh_manager.save_data()
+
+    # 현재 데이터를 택하면 다음 저장에서 파일을 덮어쓴다
+    fresh_manager.sync_from_file(prefer='memory')
+    fresh_manager.save_data()
+    with open(fresh_manager.data_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved == fresh_manager.to_json_data()
+    assert saved[building][tenant]['monthly_rent'] != 456000
+
+
+def test_csv_import_reports_short_rows_and_records_one_event(fresh_manager, tmp_path, capsys):
+    # 열이 모자란 행과 잘못된 행은 줄 번호와 함께 보고하고, 나머지는 변경 이력 이벤트 하나로 가져온다
+    data_file = fresh_manager.data_file
+    (building, tenant), (other_building, other) = all_tenants(fresh_manager)[:2]
+    csv_file = tmp_path / 'payments.csv'
+    csv_file.write_text('\n'.join([
+        '건물,임대인,납부일,납부액',
+        f'{building},{tenant},2024-01-05,"1,000"',
+        f'{building},{tenant}',
+        f'{other_building},{other},2024-13-01,500',
+        f'{other_building},{other},2024-02-05,2000,',
+        '',
+    ]), encoding='utf-8')
+    count = len(fresh_manager.buildings[building][tenant]['payments'])
+
+    assert rental_cli.main(['--data', data_file, 'import-payments', str(csv_file)]) == rental_cli.EXIT_ERROR
+    errors = [line for line in capsys.readouterr().err.splitlines() if line.startswith(str(csv_file))]
+    assert [line.split(':')[1] for line in errors] == ['3', '4']
+
+    rental_manager = load_quietly(RentalManagement(data_file))
+    assert len(rental_manager.buildings[building][tenant]['payments']) == count + 1
+    events = AuditLog(rental_audit.audit_dir_for(data_file)).history()
+    assert [event['op'] for event in events if event['op'] != 'attach'] == ['add_payments']
+
+
+def test_backup_round_trip_and_prune(fresh_manager, tmp_path):
+    # 백업은 저장 형식 그대로 되살리고, 바뀐 임대인의 조각만 새로 쓰며, 정리하면 참조가 없는 조각을 지운다
+    store = BackupStore(str(tmp_path / 'backups'))
+    building, tenant = all_tenants(fresh_manager)[0]
+    data = fresh_manager.to_json_data()
+    start = datetime(2024, 1, 1, 9)
+    first, written = store.create(data, now=start)
+    assert written == len(all_tenants(fresh_manager))
+    assert store.load(first) == data
+    assert store.load(first, building, tenant) == {building: {tenant: data[building][tenant]}}
+
+    snapshot_ids = [first]
+    for day in range(1, 5):
+        fresh_manager.add_payment(building, tenant, f'2024-01-{day + 1:02d}', 1000)
+        snapshot_id, written = store.create(fresh_manager.to_json_data(), now=start + timedelta(days=day))
+        assert written == 1
+        snapshot_ids.append(snapshot_id)
+    assert [snapshot[0] for snapshot in store.list_snapshots()] == snapshot_ids[::-1]
+
+    # 최근 2일치만 남기면 오래된 백업 3개와 그 백업에만 있던 임대인 조각 3개가 지워진다
+    assert store.prune({'daily': 2}) == (3, 3)
+    assert [snapshot[0] for snapshot in store.list_snapshots()] == snapshot_ids[:2:-1]
+    assert store.load(snapshot_ids[-1]) == fresh_manager.to_json_data()
+    with pytest.raises(ValueError):
+        store.load(first)
+
+
+def test_audit_state_at_matches_replay(fresh_manager, tmp_path, monkeypatch):
+    # 각 변경 직후 시점의 state_at 은 그때의 데이터와 같고 (체크포인트를 건너도), 실패한 변경은 기록하지 않는다
+    monkeypatch.setattr(rental_audit, 'CHECKPOINT_INTERVAL', 3)
+    audit = AuditLog(str(tmp_path / 'audit'), user='test')
+    before = datetime.now()
+    audit.attach(fresh_manager)
+    building, tenant = all_tenants(fresh_manager)[0]
+    other_building, other = all_tenants(fresh_manager)[-1]
+    info = fresh_manager.buildings[building][tenant]
+
+    changes = [
+        lambda: fresh_manager.add_payment(building, tenant, '2024-01-01', 1000),
+        lambda: fresh_manager.add_monthly_rent_override(building, tenant, date(2024, 2, 1), 5000),
+        lambda: fresh_manager.delete_payments(building, tenant, fresh_manager.payment_ledger(building, tenant).ids[:2]),
+        lambda: fresh_manager.update_tenant(building, tenant, building, '새 상호', info['start_date'], 77000,
+                                            info.get('payment_type', 'full')),
+        lambda: fresh_manager.rename_building(other_building, '새 건물'),
+        lambda: fresh_manager.delete_tenant('새 건물', other),
+        lambda: fresh_manager.add_payment(building, '새 상호', '2024-03-01', 3000),
+    ]
+    # to_json_data 는 임대료 수정 dict 를 공유하므로 이후 변경에도 그대로인 스냅샷에서 변환한다
+    states = [(datetime.now(), fresh_manager.snapshot().to_json_data())]
+    for change in changes:
+        change()
+        states.append((datetime.now(), fresh_manager.snapshot().to_json_data()))
+
+    events = len(audit.history())
+    version = fresh_manager.version
+    with pytest.raises(ValueError):
+        fresh_manager.add_payment(building, '새 상호', '2024-13-01', 1000)
+    with pytest.raises(ValueError):
+        fresh_manager.delete_payments(building, '새 상호', ['없는 납부 ID'])
+    assert len(audit.history()) == events == len(changes) + 1
+    assert fresh_manager.version == version
+    assert len(audit.read_index()) > 2
+
+    for when, data in states:
+        assert audit.state_at(when) == data
+        assert audit.state_at(when, building) == {building: data[building]}
+        tenants = data.get(building, {})
+        for name in (tenant, '새 상호'):
+            expected = {building: {name: tenants[name]}} if name in tenants else {}
+            assert audit.state_at(when, building, name) == expected
+    with pytest.raises(ValueError):
+        audit.state_at(before)
+
+
+def run_in_thread(func, *args):
+    thread = threading.Thread(target=func, args=args)
+    thread.start()
+    thread.join()
+
+
+def run_section(name):
+    with rental_profiling.timer(name):
+        pass
+
+
+def test_profile_capture_is_bound_to_section_or_thread(fresh_manager, tmp_path, monkeypatch):
+    # 이름을 준 캡처는 그 구간만 (다른 구간 안에서도), 이름이 없으면 예약한 스레드의 최상위 구간만 기록한다
+    captured = []
+    monkeypatch.setattr(rental_profiling, '_capture', None)
+    monkeypatch.setattr(rental_profiling, '_capture_listeners', [])
+    monkeypatch.setattr(rental_profiling, 'profile_dir', lambda: str(tmp_path / 'profiles'))
+    rental_profiling.add_capture_listener(lambda name, path: captured.append((name, path)))
+    building, tenant = all_tenants(fresh_manager)[0]
+
+    rental_profiling.arm_capture('calculate_balance')
+    run_in_thread(run_section, 'notifications')
+    with rental_profiling.timer('show_report'):
+        fresh_manager.calculate_balance(building, tenant)
+    assert [name for name, _ in captured] == ['calculate_balance']
+
+    rental_profiling.arm_capture()
+    run_in_thread(run_section, 'notifications')
+    assert len(captured) == 1
+    with rental_profiling.timer('show_report'):
+        fresh_manager.calculate_balance(building, tenant)
+    assert [name for name, _ in captured] == ['calculate_balance', 'show_report']
+    with open(captured[-1][1], 'r', encoding='utf-8') as f:
+        assert f.readline().startswith('show_report')
+    assert rental_profiling._capture is None
+
+
+def test_export_replaces_file_only_when_complete(fresh_manager, tmp_path):
+    # 취소하거나 실패한 내보내기는 기존 파일을 그대로 두고 임시 파일을 남기지 않는다
+    pytest.importorskip('xlsxwriter')
+    from rental_export import export_all_reports, export_tenant_report
+    directory = tmp_path / 'exports'
+    directory.mkdir()
+    path = directory / 'report.xlsx'
+    path.write_bytes(b'previous')
+    building, tenant = all_tenants(fresh_manager)[0]
+
+    cancel_event = threading.Event()
+    assert not export_all_reports(fresh_manager, str(path), lambda done, total: cancel_event.set(), cancel_event)
+    assert path.read_bytes() == b'previous'
+    with pytest.raises(ValueError):
+        export_tenant_report(fresh_manager, building, '없는 임대인', str(path))
+    assert path.read_bytes() == b'previous'
+    assert list(directory.iterdir()) == [path]
+
+    assert export_all_reports(fresh_manager, str(path))
+    assert path.read_bytes()[:2] == b'PK'
+    export_tenant_report(fresh_manager, building, tenant, str(path))
+    assert list(directory.iterdir()) == [path]
+
+
+def test_statements_replace_file_only_when_complete(fresh_manager, tmp_path):
+    # 납부현황 HTML 도 취소하거나 실패하면 기존 파일을 그대로 두고 임시 파일을 남기지 않는다
+    from rental_print import building_targets, write_statements
+    directory = tmp_path / 'prints'
+    directory.mkdir()
+    path = directory / 'statements.html'
+    path.write_text('previous', encoding='utf-8')
+    targets = building_targets(fresh_manager)
+
+    cancel_event = threading.Event()
+    assert not write_statements(fresh_manager, targets, str(path), progress=lambda done, total: cancel_event.set(),
+                                cancel_event=cancel_event)
+    assert path.read_text(encoding='utf-8') == 'previous'
+    with pytest.raises(ValueError):
+        write_statements(fresh_manager, targets + [('없는 건물', '없는 임대인')], str(path))
+    assert path.read_text(encoding='utf-8') == 'previous'
+    assert list(directory.iterdir()) == [path]
+
+    assert write_statements(fresh_manager, targets, str(path))
+    assert path.read_text(encoding='utf-8').rstrip().endswith('</html>')
+    assert list(directory.iterdir()) == [path]
+
+
+def test_vacancy_starts_at_each_buildings_first_lease(tmp_path):
+    # 나중에 생긴 건물은 첫 임대월 전의 달을 공실(공실 손실)로 세지 않는다
+    from rental_occupancy import occupancy_timeline
+
+    def lease(start, end=None):
+        return {'start_date': start, 'contract_end_date': end, 'monthly_rent': 100_000, 'payments': [],
+                'payment_type': 'full'}
+
+    rental_manager = RentalManagement(str(tmp_path / 'rental_data.json'))
+    rental_manager.load_json_data({
+        '구관': {'A': lease('2020-01-01')},
+        '신관': {'B': lease('2023-01-01'), 'C': lease('2023-01-01', '2023-12-31')},
+        '빈 건물': {},
+    })
+    timeline = occupancy_timeline(rental_manager, today=date(2024, 12, 15))
+    summary = {row[0]: row for row in timeline.summary()}
+    assert summary['구관'][-1] == 0
+    # 2023-01 ~ 2024-12 의 24개월 중 2024년 12개월 동안 한 호실이 비었다 (평균 임대료 100,000원)
+    assert summary['신관'][1:] == (1, 2, 50.0, 36, 3_600_000, 1_200_000)
+    assert summary['빈 건물'][-1] == 0
+    series = timeline.series('신관')
+    assert series[0][0] == date(2023, 1, 1) and len(series) == 24
+    assert len(timeline.series('구관')) == 60
+
+
+def risk_manager(tmp_path, tenants):
+    rental_manager = RentalManagement(str(tmp_path / 'rental_data.json'))
+    rental_manager.load_json_data({'본관': tenants})
+    return rental_manager
+
+
+def test_risk_trend_ignores_months_still_unpaid(tmp_path):
+    # 계속 내지 않는 임대인은 최근 달의 미납 기간이 짧다고 해서 나아지는 것으로 보지 않는다
+    pytest.importorskip('numpy')
+    from rental_risk import profile
+    today = datetime.now().date()
+    start = date(today.year - 2, today.month, 1)
+
+    def tenant(payments):
+        return {'start_date': start.isoformat(), 'monthly_rent': 100_000, 'payment_type': 'full',
+                'payments': [{'date': day.isoformat(), 'amount': 100_000} for day in payments]}
+
+    months = [date(start.year + (start.month - 1 + offset) // 12, (start.month - 1 + offset) % 12 + 1, 1)
+              for offset in range(24)]
+    rental_manager = risk_manager(tmp_path, {
+        '미납': tenant([]),
+        '정상': tenant(months),
+        # 처음 12개월은 제때 내다가 이후 달마다 5일씩 더 늦게 낸다
+        '악화': tenant([month + timedelta(days=max(offset - 11, 0) * 5) for offset, month in enumerate(months)]),
+    })
+    keys = [('본관', name) for name in ('미납', '정상', '악화')]
+    features = profile(rental_manager, keys, today)
+    never, on_time, worse = features['trend'].tolist()
+    assert never >= 0
+    assert on_time == 0
+    assert worse > 0
+    assert features['missed'][0] >= 24
+
+
+def test_risk_and_unpaid_view_use_the_same_balance(fresh_manager):
+    # 대시보드 한 행의 미납액과 위험 점수의 미납액 비율은 같은 잔액(calculate_balance)에서 나온다
+    pytest.importorskip('numpy')
+    from rental_risk import risk_book
+    from rental_unpaid import unpaid_model
+    today = datetime.now().date()
+    book = risk_book(fresh_manager, today)
+    model = unpaid_model(fresh_manager, today)
+    for row, (building, tenant) in enumerate(book.keys):
+        balance = fresh_manager.calculate_balance(building, tenant)
+        rent = fresh_manager.buildings[building][tenant]['monthly_rent']
+        assert model.balance[row] == balance
+        assert book.details(building, tenant)['balance'] == pytest.approx(max(balance, 0) / rent)
+
+
+def test_forecast_drops_superseded_contracts(tmp_path):
+    # 만료 뒤 다른 임대인이 들어온 계약은 전망에서 빼고, 대신한 임대인이 없으면 전망 시작월에 갱신한 것으로 본다
+    pytest.importorskip('numpy')
+    from rental_forecast import Assumptions, forecast_inputs, project
+
+    def lease(start, end, rent):
+        return {'start_date': start, 'contract_end_date': end, 'monthly_rent': rent, 'payments': [],
+                'payment_type': 'full'}
+
+    rental_manager = RentalManagement(str(tmp_path / 'rental_data.json'))
+    rental_manager.load_json_data({
+        '본관': {'이전': lease('2018-04-15', '2020-04-14', 1_500_000), '다음': lease('2020-05-05', None, 2_200_000)},
+        '별관': {'만료': lease('2022-01-01', '2023-12-31', 1_000_000)},
+    })
+    inputs = forecast_inputs(rental_manager, today=date(2025, 6, 10))
+    assert inputs.superseded.tolist() == [True, False, False]
+    projection = project(inputs, Assumptions(years=3, renewal_rate=50, renewal_term=12))
+    main, annex = projection.expected.tolist()
+    assert main == [2_200_000] * 36
+    assert annex == [500_000] * 12 + [250_000] * 12 + [125_000] * 12
+
+
+def test_read_only_load_writes_no_snapshot(fresh_manager):
+    # 읽기만 하는 명령은 데이터 폴더에 스냅샷을 남기지 않고, 저장하거나 요청한 경우에만 만든다
+    pytest.importorskip('numpy')
+    data_file = fresh_manager.data_file
+    remove_snapshots(data_file)
+    assert rental_cli.main(['--data', data_file, 'balances']) in (rental_cli.EXIT_OK, rental_cli.EXIT_ALERTS)
+    wait_for_snapshot()
+    assert not os.path.exists(data_file + '.snapshot0')
+
+    load_quietly(RentalManagement(data_file), compile_snapshot=True)
+    wait_for_snapshot()
+    assert os.path.exists(data_file + '.snapshot0')
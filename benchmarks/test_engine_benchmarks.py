@@ -0,0 +1,230 @@
+"""엔진 주요 경로 벤치마크 (pytest-benchmark)
+
+    python -m pytest benchmarks --benchmark-only
+    # 기준값 저장 / 비교
+    python -m pytest benchmarks --benchmark-only --benchmark-storage=benchmarks/baselines --benchmark-save=baseline
+    python -m pytest benchmarks --benchmark-only --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+
+pytest-benchmark 가 없으면 건너뛴다.
+"""
+import contextlib
+import io
+from datetime import date
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from conftest import load_quietly, remove_snapshots, wait_for_snapshot  # noqa: E402
+from rental_engine import RentalManagement  # noqa: E402
+
+
+def all_tenants(rental_manager):
+    return [(building, tenant) for building, tenants in rental_manager.buildings.items() for tenant in tenants]
+
+
+def test_load_data(benchmark, portfolio_file):
+    def setup():
+        wait_for_snapshot()
+        remove_snapshots(portfolio_file)
+        return (RentalManagement(portfolio_file),), {}
+
+    rental_manager = benchmark.pedantic(load_quietly, setup=setup, rounds=5)
+    assert rental_manager.buildings and rental_manager.compiled is None
+
+
+def test_load_compiled(benchmark, portfolio_file):
+    pytest.importorskip('numpy')
+    load_quietly(RentalManagement(portfolio_file), compile_snapshot=True)
+    wait_for_snapshot()
+    rental_manager = benchmark(lambda: load_quietly(RentalManagement(portfolio_file)))
+    assert rental_manager.compiled is not None
+
+
+def test_calculate_balance_all_compiled(benchmark, portfolio_file):
+    pytest.importorskip('numpy')
+    load_quietly(RentalManagement(portfolio_file), compile_snapshot=True)
+    wait_for_snapshot()
+    rental_manager = load_quietly(RentalManagement(portfolio_file))
+    targets = all_tenants(rental_manager)
+    balances = benchmark(lambda: [rental_manager.calculate_balance(building, tenant) for building, tenant in targets])
+    assert len(balances) == len(targets)
+
+
+def test_save_data(benchmark, fresh_manager):
+    benchmark(fresh_manager.save_data, force=True)
+
+
+def test_calculate_balance_all(benchmark, loaded_manager):
+    targets = all_tenants(loaded_manager)
+    balances = benchmark(lambda: [loaded_manager.calculate_balance(building, tenant) for building, tenant in targets])
+    assert len(balances) == len(targets)
+
+
+def test_get_monthly_rent_all(benchmark, loaded_manager):
+    targets = all_tenants(loaded_manager)
+    months = [date(2022, month, 1) for month in range(1, 13)]
+    rents = benchmark(lambda: [loaded_manager.get_monthly_rent(building, tenant, month)
+                               for building, tenant in targets for month in months])
+    assert len(rents) == len(targets) * len(months)
+
+
+def test_portfolio_totals(benchmark, loaded_manager):
+    assert benchmark(loaded_manager.portfolio_monthly_totals)
+
+
+def test_forecast(benchmark, loaded_manager):
+    pytest.importorskip('numpy')
+    from rental_forecast import Assumptions, forecast_inputs, project
+
+    inputs = forecast_inputs(loaded_manager)
+    assumptions = Assumptions(years=10, escalation_percent=5, escalation_interval=24, renewal_rate=80)
+    projection = benchmark(project, inputs, assumptions)
+    assert projection.expected.shape == (len(loaded_manager.buildings), 120)
+
+    # 가정이 모두 기본값이고 미래 임대료 수정이 없으면 첫 달은 그 달까지 시작한 임대인의 현재 임대료 합계
+    # (만료 뒤 다른 임대인이 들어온 계약은 제외)
+    flat = project(inputs, Assumptions(years=1))
+    first = inputs.current_month + 1
+    if not len(inputs.ovr_month):
+        rows = zip(inputs.rent.tolist(), inputs.start.tolist(), inputs.superseded.tolist())
+        assert int(flat.totals()[0]) == sum(rent for rent, start, superseded in rows
+                                            if start <= first and not superseded)
+
+
+def test_occupancy_timeline(benchmark, loaded_manager):
+    from rental_occupancy import _timeline_cache, occupancy_timeline
+
+    def run():
+        _timeline_cache.pop(loaded_manager, None)
+        return occupancy_timeline(loaded_manager)
+
+    timeline = benchmark(run)
+    assert set(timeline.buildings) == set(loaded_manager.buildings)
+    assert occupancy_timeline(loaded_manager) is timeline
+
+
+def test_risk_book(benchmark, loaded_manager):
+    pytest.importorskip('numpy')
+    from rental_risk import RiskBook
+
+    book = benchmark(RiskBook, loaded_manager, date.today())
+    assert len(book.keys) == len(all_tenants(loaded_manager))
+
+
+def test_risk_book_incremental(fresh_manager):
+    pytest.importorskip('numpy')
+    from rental_risk import RiskBook, risk_book
+
+    # 납부를 추가하면 그 임대인만 다시 계산하며 결과는 전체 계산과 같다
+    cached = risk_book(fresh_manager)
+    building, tenant = all_tenants(fresh_manager)[0]
+    fresh_manager.add_payment(building, tenant, date.today().isoformat(), 1_000_000)
+    assert risk_book(fresh_manager) is cached
+    assert cached.details(building, tenant) == RiskBook(fresh_manager, date.today()).details(building, tenant)
+
+
+def test_unpaid_view(benchmark, loaded_manager):
+    pytest.importorskip('numpy')
+    from rental_unpaid import unpaid_model
+
+    # 정렬과 필터는 모델 배열에서 계산하며 결과는 미납액 순서를 지킨다
+    model = unpaid_model(loaded_manager)
+    rows = benchmark(model.view, 'amount', True, None, 0)
+    balances = [balance for _, _, balance, _, _ in model.rows(rows, page_size=len(rows))]
+    assert balances == sorted(balances, reverse=True) and all(balance > 0 for balance in balances)
+    assert model.total(rows) == model.total() == sum(balances)
+
+
+def test_payment_ledger_page(benchmark, loaded_manager):
+    building, tenant = max(all_tenants(loaded_manager),
+                           key=lambda key: len(loaded_manager.buildings[key[0]][key[1]]['payments']))
+    ledger = loaded_manager.payment_ledger(building, tenant)
+
+    def run():
+        start, stop = ledger.locate(date(2021, 1, 1), date(2022, 12, 31))
+        return ledger.page(start, stop, 0), ledger.total(start, stop)
+
+    entries, total = benchmark(run)
+    assert all(date(2021, 1, 1) <= payment['date'] <= date(2022, 12, 31) for _, payment in entries)
+    assert total == sum(payment['amount'] for payment in ledger.payments
+                        if date(2021, 1, 1) <= payment['date'] <= date(2022, 12, 31))
+
+
+def test_delete_payments(fresh_manager):
+    # 납부 ID 로 여러 건을 한 번에 지우고, 남은 기록의 ID 는 바뀌지 않는다
+    building, tenant = max(all_tenants(fresh_manager),
+                           key=lambda key: len(fresh_manager.buildings[key[0]][key[1]]['payments']))
+    ledger = fresh_manager.payment_ledger(building, tenant)
+    doomed = ledger.ids[::2]
+    version = fresh_manager.version
+    assert fresh_manager.delete_payments(building, tenant, doomed) == len(doomed)
+    assert fresh_manager.version == version + 1
+    assert fresh_manager.payment_ledger(building, tenant).ids == ledger.ids[1::2]
+    with pytest.raises(ValueError):
+        fresh_manager.delete_payments(building, tenant, doomed[:1])
+
+
+def test_rename_keeps_tenant_ids(fresh_manager):
+    # 이름을 바꾸거나 옮겨도 임대인 ID 와 임대인별 캐시는 그대로 (이름에 ' - ' 가 있어도 된다)
+    building, tenant = all_tenants(fresh_manager)[0]
+    tenant_id = fresh_manager.tenant_id(building, tenant)
+    _, rents = fresh_manager.rent_vector(building, tenant)
+    fresh_manager.rename_building(building, '본관 - 신관')
+    assert fresh_manager.tenant_key(tenant_id) == ('본관 - 신관', tenant)
+    assert fresh_manager.rent_vector('본관 - 신관', tenant)[1] is rents
+    
+    info = fresh_manager.buildings['본관 - 신관'][tenant]
+    fresh_manager.update_tenant('본관 - 신관', tenant, '별관', '상호 - 변경', info['start_date'], info['monthly_rent'],
+                                info.get('payment_type', 'full'))
+    assert fresh_manager.tenant_key(tenant_id) == ('별관', '상호 - 변경')
+    fresh_manager.delete_tenant('별관', '상호 - 변경')
+    with pytest.raises(ValueError):
+        fresh_manager.tenant_key(tenant_id)
+
+
+def test_generate_report(benchmark, loaded_manager):
+    pytest.importorskip('pandas')
+    building, tenant = all_tenants(loaded_manager)[0]
+    loaded_manager.generate_report(building, tenant)  # pandas 가져오기 시간 제외
+    assert benchmark(loaded_manager.generate_report, building, tenant) is not None
+
+
+def test_bulk_rent_increase(benchmark, portfolio_file, tmp_path):
+    def setup():
+        rental_manager = load_quietly(RentalManagement(portfolio_file))
+        building, tenant = all_tenants(rental_manager)[0]
+        return (rental_manager, building, tenant), {}
+
+    def run(rental_manager, building, tenant):
+        rental_manager.bulk_rent_increase(building, tenant, date(2020, 1, 1), 5)
+
+    benchmark.pedantic(run, setup=setup, rounds=10)
+
+
+def test_adjust_rent_overrides_building(benchmark, portfolio_file):
+    def setup():
+        rental_manager = load_quietly(RentalManagement(portfolio_file))
+        building = next(iter(rental_manager.buildings))
+        return (rental_manager, [(building, tenant) for tenant in rental_manager.buildings[building]]), {}
+
+    def run(rental_manager, targets):
+        version = rental_manager.version
+        rental_manager.adjust_rent_overrides(targets, date(2020, 4, 1), date(2021, 3, 1), -50, is_percentage=True)
+        assert rental_manager.version == version + 1
+
+    benchmark.pedantic(run, setup=setup, rounds=10)
+
+
+def test_export_all_reports(benchmark, loaded_manager, tmp_path):
+    pytest.importorskip('xlsxwriter')
+    from rental_export import export_all_reports
+    assert benchmark(export_all_reports, loaded_manager, str(tmp_path / 'report.xlsx'))
+
+
+def test_write_statements(benchmark, loaded_manager, tmp_path):
+    from rental_print import building_targets, write_statements
+    targets = building_targets(loaded_manager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert benchmark(write_statements, loaded_manager, targets, str(tmp_path / 'statements.html'))
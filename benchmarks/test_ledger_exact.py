@@ -0,0 +1,185 @@
+"""원 단위 정수 금액 검사: 반올림 규칙과 포트폴리오 합계의 정확성
+
+    python -m pytest benchmarks/test_ledger_exact.py
+"""
+import contextlib
+import io
+import json
+import random
+from datetime import date
+
+import pytest
+
+import rental_cli
+from conftest import load_quietly, wait_for_snapshot
+from rental_engine import RentalManagement
+from rental_money import apply_percentage, exact_amount, prorate, to_won
+from synthetic import generate_portfolio
+
+
+def fractional_portfolio(seed=7):
+    """이전 버전처럼 원 미만 금액이 섞인 실수로 저장된 포트폴리오"""
+    rng = random.Random(seed)
+    data = generate_portfolio(4, 15, 3, override_density=0.1, irregularity=0.4, seed=seed)
+    for tenants in data.values():
+        for info in tenants.values():
+            info['monthly_rent'] = info['monthly_rent'] + rng.choice((0.1, 0.33, 0.5, 0.75))
+            for payment in info['payments']:
+                payment['amount'] = payment['amount'] / 3 * 3 + rng.choice((0.0, 0.2, 0.49, 0.51))
+    return data
+
+
+@pytest.fixture
+def fractional_file(tmp_path):
+    path = tmp_path / 'rental_data.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fractional_portfolio(), f, ensure_ascii=False)
+    return str(path)
+
+
+def all_tenants(rental_manager):
+    return [(building, tenant) for building, tenants in rental_manager.buildings.items() for tenant in tenants]
+
+
+def test_to_won_rounding():
+    assert to_won(1_500_000.0) == 1_500_000
+    assert to_won('1,234.5') == 1235
+    assert to_won('2,200,000원') == 2_200_000
+    assert to_won(0.1 + 0.2) == 0
+    assert to_won(-2.5) == -3
+    assert to_won(1234.49) == 1234
+    for invalid in ('', 'abc', float('nan'), float('inf'), True, None):
+        with pytest.raises(ValueError):
+            to_won(invalid)
+        with pytest.raises(ValueError):
+            exact_amount(invalid)
+
+
+def test_prorate_truncates():
+    assert prorate(1_000_000, 10, 31) == 322_580
+    assert prorate(1_000_000, 31, 31) == 1_000_000
+    assert prorate(-1_000_000, 10, 31) == -322_580
+    # 나눈 일할 금액의 합은 한 달 금액을 넘지 않는다
+    for rent in (999_999, 1_234_567, 3_000_001):
+        for split in range(1, 31):
+            assert prorate(rent, split, 31) + prorate(rent, 31 - split, 31) <= rent
+
+
+def test_apply_percentage_rounds_half_up():
+    assert apply_percentage(1_000_000, 3.3) == 1_033_000
+    assert apply_percentage(333_333, 10) == 366_666
+    assert apply_percentage(1_000_005, -10) == 900_005  # 900004.5 -> 900005
+    assert apply_percentage(1_000_000, '2.5') == 1_025_000
+
+
+def test_loaded_amounts_are_integers(fractional_file):
+    rental_manager = load_quietly(RentalManagement(fractional_file))
+    for building, tenant_name in all_tenants(rental_manager):
+        tenant = rental_manager.buildings[building][tenant_name]
+        assert type(tenant['monthly_rent']) is int
+        assert all(type(payment['amount']) is int for payment in tenant['payments'])
+        assert type(rental_manager.calculate_balance(building, tenant_name)) is int
+        for _, rent, _, paid, balance, _ in rental_manager.iter_report_rows(building, tenant_name):
+            assert type(rent) is int and type(paid) is int and type(balance) is int
+
+
+def test_report_balance_is_exact(fractional_file):
+    rental_manager = load_quietly(RentalManagement(fractional_file))
+    for building, tenant_name in all_tenants(rental_manager):
+        rows = list(rental_manager.iter_report_rows(building, tenant_name))
+        if not rows:
+            continue
+        tenant = rental_manager.buildings[building][tenant_name]
+        due = sum(rent for _, rent, _, _, _, _ in rows)
+        paid = sum(payment['amount'] for payment in tenant['payments'])
+        assert rows[-1][4] == due - paid
+
+
+def test_portfolio_totals_are_order_independent(fractional_file):
+    rental_manager = load_quietly(RentalManagement(fractional_file))
+    balances = [rental_manager.calculate_balance(building, tenant) for building, tenant in all_tenants(rental_manager)]
+    assert sum(balances) == sum(reversed(balances)) == sum(sorted(balances))
+
+    totals = rental_manager.portfolio_monthly_totals()
+    per_building = [rental_manager.portfolio_monthly_totals(building) for building in rental_manager.buildings]
+    assert sum(due for _, due, _ in totals) == sum(due for rows in per_building for _, due, _ in rows)
+    assert sum(paid for _, _, paid in totals) == sum(paid for rows in per_building for _, _, paid in rows)
+
+
+def test_bulk_increase_is_exact(fractional_file):
+    rental_manager = load_quietly(RentalManagement(fractional_file))
+    building, tenant_name = all_tenants(rental_manager)[0]
+    rental_manager.bulk_rent_increase(building, tenant_name, date(2024, 1, 1), 3.3)
+    overrides = rental_manager.buildings[building][tenant_name]['monthly_rent_overrides']
+    assert all(type(value['amount']) is int for value in overrides.values())
+
+
+def test_balance_matches_allocation(fractional_file):
+    # 잔액, 보고서 마지막 잔액, 미납 경과 합계는 모두 같은 일할 계산 청구액에서 나온다
+    rental_manager = load_quietly(RentalManagement(fractional_file))
+    for building, tenant in all_tenants(rental_manager):
+        balance = rental_manager.calculate_balance(building, tenant)
+        allocation = rental_manager.allocate_payments(building, tenant)
+        assert balance == allocation.balance
+        rows = list(rental_manager.iter_report_rows(building, tenant))
+        assert rows[-1][4] == balance if rows else balance <= 0
+        if not allocation.credit:
+            assert sum(rental_manager.aging(building, tenant).values()) == balance
+
+
+def test_compiled_balances_match(fractional_file):
+    pytest.importorskip('numpy')
+    from_json = load_quietly(RentalManagement(fractional_file))
+    from_json.save_data()
+    wait_for_snapshot()
+    compiled = load_quietly(RentalManagement(fractional_file))
+    assert compiled.compiled is not None
+
+    targets = all_tenants(from_json)
+    expected = [from_json.calculate_balance(building, tenant) for building, tenant in targets]
+    actual = [compiled.calculate_balance(building, tenant) for building, tenant in targets]
+    assert actual == expected
+    assert all(type(balance) is int for balance in actual)
+    assert int(compiled.compiled.balances(date.today()).sum()) == sum(expected)
+    assert compiled.total_monthly_rent() == from_json.total_monthly_rent()
+
+
+def test_mid_month_override_is_ignored_everywhere(tmp_path):
+    # 1일이 아닌 이전 형식의 임대료 수정 키는 JSON 으로 불러와도, 컴파일된 스냅샷으로 불러와도 적용하지 않는다
+    pytest.importorskip('numpy')
+    path = str(tmp_path / 'rental_data.json')
+    data = {'B': {'T': {'start_date': '2024-01-01', 'monthly_rent': 1_000_000, 'payments': [],
+                        'payment_type': 'full', 'monthly_rent_overrides': {'2024-03-15': 0}}}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    from_json = load_quietly(RentalManagement(path))
+    from_json.save_data(force=True)
+    wait_for_snapshot()
+    compiled = load_quietly(RentalManagement(path))
+    assert compiled.compiled is not None
+
+    expected = from_json.calculate_balance('B', 'T')
+    assert compiled.calculate_balance('B', 'T') == expected
+    assert from_json.get_monthly_rent('B', 'T', date(2024, 3, 1)) == 1_000_000
+    assert expected == 1_000_000 * len(from_json.rent_vector('B', 'T')[1])
+    compiled.add_building('other')  # 다른 변경 뒤에도 같은 결과
+    assert compiled.calculate_balance('B', 'T') == expected
+
+
+def test_migrate_amounts_counts_only_rounded_values(tmp_path):
+    # 정수와 값이 같은 실수/문자열은 형식만 바뀌고, 원 미만이 있는 금액만 반올림으로 센다
+    path = str(tmp_path / 'rental_data.json')
+    data = {'B': {'T': {'start_date': '2024-01-01', 'monthly_rent': 1_000_000.0, 'payment_type': 'full',
+                        'payments': [{'date': '2024-01-05', 'amount': '1,000,000원'},
+                                     {'date': '2024-02-05', 'amount': 999_999.5},
+                                     {'date': '2024-03-05', 'amount': '1000000.00'},
+                                     {'date': '2024-04-05', 'amount': 1_000_000}],
+                        'monthly_rent_overrides': {'2024-05-01': {'amount': '1,234.4', 'note': ''}}}}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    err = io.StringIO()
+    with contextlib.redirect_stderr(err):
+        assert rental_cli.main(['--data', path, 'migrate-amounts', '--dry-run']) == rental_cli.EXIT_OK
+    assert '정수로 바꿀 금액 5개, 그중 원 미만 반올림 2개' in err.getvalue()
+    assert '반올림: 999999.5 -> 1000000' in err.getvalue()
+    assert '반올림: 1,234.4 -> 1234' in err.getvalue()
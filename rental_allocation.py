@@ -0,0 +1,108 @@
+"""납부액의 월별 배분 (가장 오래된 미납월부터 채우는 FIFO)
+
+납부한 달이 아니라 밀린 달부터 납부액을 채운다. 월별 청구 목록과 날짜순 납부 기록을
+한 번씩만 훑으며 배분하므로 임대인 한 명의 계산은 O(월 수 + 납부 수)다.
+
+    allocation = allocate(rental_manager.iter_monthly_dues(building, tenant), tenant['payments'])
+    allocation.months[0].outstanding
+    allocation.aging(today)
+
+마지막 납부보다 늦은 날짜의 납부는 apply 로 이어서 배분할 수 있다 (처음부터 다시 계산하지 않음).
+"""
+AGING_BUCKETS = (30, 60, 90)  # 경과 일수 구간 경계 (이 값 이하)
+AGING_LABELS = ('0-30일', '31-60일', '61-90일', '90일 초과')
+
+
+class MonthAllocation:
+    """한 달의 청구액과 배분된 납부액"""
+
+    __slots__ = ('month', 'due', 'paid', 'paid_date', 'settled_date', 'note')
+
+    def __init__(self, month, due, note=''):
+        self.month = month
+        self.due = due
+        self.paid = 0
+        self.paid_date = None     # 이 달에 배분된 마지막 납부의 날짜
+        self.settled_date = None  # 이 달이 완납된 날짜
+        self.note = note
+
+    @property
+    def outstanding(self):
+        return self.due - self.paid
+
+    def __repr__(self):
+        return f"MonthAllocation({self.month}, due={self.due}, paid={self.paid}, settled={self.settled_date})"
+
+
+class TenantAllocation:
+    """임대인 한 명의 월별 배분 결과
+
+    next_index 는 아직 완납되지 않은 가장 오래된 달이며, 모든 달을 채우고 남은 금액은 credit(선납)이다.
+    """
+
+    def __init__(self, months):
+        self.months = months
+        self.next_index = 0
+        self.credit = 0
+        self.last_payment_date = None
+        self._skip_settled()
+
+    def _skip_settled(self):
+        # 청구액이 0 이하인 달은 납부 없이 완납으로 본다
+        while self.next_index < len(self.months) and self.months[self.next_index].outstanding <= 0:
+            self.next_index += 1
+
+    def apply(self, payment_date, amount):
+        """납부 하나를 가장 오래된 미납월부터 배분 (마지막 납부 이후 날짜여야 한다)"""
+        if self.last_payment_date is not None and payment_date < self.last_payment_date:
+            raise ValueError("이전 납부보다 앞선 날짜의 납부는 이어서 배분할 수 없습니다.")
+        self.last_payment_date = payment_date
+        remaining = amount
+        months = self.months
+        while remaining > 0 and self.next_index < len(months):
+            month = months[self.next_index]
+            portion = min(remaining, month.outstanding)
+            month.paid += portion
+            month.paid_date = payment_date
+            remaining -= portion
+            if month.outstanding <= 0:
+                month.settled_date = payment_date
+                self.next_index += 1
+                self._skip_settled()
+        self.credit += remaining
+
+    @property
+    def outstanding(self):
+        """미납 합계 (선납은 빼지 않는다)"""
+        return sum(month.outstanding for month in self.months[self.next_index:])
+
+    @property
+    def balance(self):
+        """미납 합계 - 선납"""
+        return self.outstanding - self.credit
+
+    def unpaid_months(self):
+        return [month for month in self.months[self.next_index:] if month.outstanding > 0]
+
+    def aging(self, today):
+        """미납액을 청구월 1일부터 경과한 일수 구간별로 합산 ({구간 이름: 금액})"""
+        buckets = dict.fromkeys(AGING_LABELS, 0)
+        for month in self.unpaid_months():
+            buckets[AGING_LABELS[aging_bucket((today - month.month).days)]] += month.outstanding
+        return buckets
+
+
+def aging_bucket(days):
+    """경과 일수의 AGING_LABELS 구간 번호"""
+    for index, limit in enumerate(AGING_BUCKETS):
+        if days <= limit:
+            return index
+    return len(AGING_BUCKETS)
+
+
+def allocate(dues, payments):
+    """월별 청구 목록 [(월, 청구액, 비고 목록)] 과 날짜순 납부 기록으로 배분 결과 생성"""
+    allocation = TenantAllocation([MonthAllocation(month, due, ", ".join(notes)) for month, due, notes in dues])
+    for payment in payments:
+        allocation.apply(payment['date'], payment['amount'])
+    return allocation
@@ -0,0 +1,411 @@
+"""임대료 관리 로컬 HTTP/JSON API 서비스
+
+asyncio 로 동작하는 작은 HTTP/1.1 서버로 임대인, 납부 기록, 잔액, 보고서를 JSON 으로 제공한다.
+
+- 변경 요청은 큐 하나에 모아 작성자 작업 하나가 순서대로 적용하고, 묶음마다 한 번 저장한다.
+  저장에 실패하면 그 묶음의 변경을 되돌리고 파일의 내용을 다시 읽은 뒤 게시한다 (같은 임대인을 다른 곳에서 고쳤으면 409).
+- 조회 요청은 마지막으로 게시된 읽기 전용 스냅샷에서 스레드 풀로 동시에 처리한다.
+- 조회 응답은 (데이터 버전, 경로) 로 캐시하며 데이터가 바뀌면 버전이 올라가 자동으로 무효화된다.
+
+사용 예:
+    python rental_api.py --data rental_data.json --port 8765
+    curl http://127.0.0.1:8765/balances?unpaid_only=1
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+from datetime import date
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from rental_engine import DATA_FILE, RentalManagement, SaveConflictError
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY_SIZE = 10 * 1024 * 1024
+CACHE_SIZE = 1024
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 409: 'Conflict',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def get_tenant(snapshot, building_name, tenant_name):
+    if building_name not in snapshot.buildings or tenant_name not in snapshot.buildings[building_name]:
+        raise HttpError(404, "존재하지 않는 건물 또는 임대인입니다.")
+    return snapshot.buildings[building_name][tenant_name]
+
+
+def tenant_summary(snapshot, building_name, tenant_name):
+    tenant = snapshot.buildings[building_name][tenant_name]
+    contract_end_date = tenant.get('contract_end_date')
+    return {
+        'building': building_name,
+        'tenant': tenant_name,
+        'start_date': tenant['start_date'].isoformat(),
+        'contract_end_date': contract_end_date.isoformat() if contract_end_date else None,
+        'monthly_rent': tenant['monthly_rent'],
+        'payment_type': tenant.get('payment_type', 'full'),
+        'payment_count': len(tenant['payments']),
+    }
+
+
+# ---- 조회 처리 (스냅샷에서 실행) ----
+
+def read_buildings(snapshot, params):
+    return [{'building': building, 'tenant_count': len(tenants)}
+            for building, tenants in snapshot.buildings.items()]
+
+
+def read_tenants(snapshot, params, building_name=None):
+    building_name = building_name or params.get('building')
+    if building_name and building_name not in snapshot.buildings:
+        raise HttpError(404, "존재하지 않는 건물입니다.")
+    return [tenant_summary(snapshot, building, tenant)
+            for building, tenants in snapshot.buildings.items()
+            if not building_name or building == building_name
+            for tenant in tenants]
+
+
+def read_tenant(snapshot, params, building_name, tenant_name):
+    get_tenant(snapshot, building_name, tenant_name)
+    summary = tenant_summary(snapshot, building_name, tenant_name)
+    summary['balance'] = snapshot.calculate_balance(building_name, tenant_name)
+    return summary
+
+
+def read_payments(snapshot, params, building_name, tenant_name):
+    """날짜순 납부 기록 (from/to=YYYY-MM-DD 로 기간 제한, id 는 삭제에 쓰는 납부 ID)"""
+    get_tenant(snapshot, building_name, tenant_name)
+    try:
+        first, last = (date.fromisoformat(params[name]) if params.get(name) else None for name in ('from', 'to'))
+    except ValueError:
+        raise HttpError(400, "날짜 형식(YYYY-MM-DD)이 올바르지 않습니다.")
+    ledger = snapshot.payment_ledger(building_name, tenant_name)
+    return [{'id': identifier, 'date': p['date'].isoformat(), 'amount': p['amount']}
+            for identifier, p in ledger.entries(*ledger.locate(first, last))]
+
+
+def read_balances(snapshot, params):
+    building_name = params.get('building')
+    unpaid_only = params.get('unpaid_only') in ('1', 'true')
+    if building_name and building_name not in snapshot.buildings:
+        raise HttpError(404, "존재하지 않는 건물입니다.")
+    result = []
+    for building, tenants in snapshot.buildings.items():
+        if building_name and building != building_name:
+            continue
+        for tenant in tenants:
+            balance = snapshot.calculate_balance(building, tenant)
+            if unpaid_only and balance <= 0:
+                continue
+            result.append({'building': building, 'tenant': tenant, 'balance': balance})
+    return result
+
+
+def read_report(snapshot, params, building_name, tenant_name):
+    get_tenant(snapshot, building_name, tenant_name)
+    return [{
+        'month': month.strftime('%Y-%m'),
+        'rent': rent,
+        'paid_date': paid_date.isoformat() if paid_date else None,
+        'paid': paid,
+        'balance': balance,
+        'note': note,
+    } for month, rent, paid_date, paid, balance, note in snapshot.iter_report_rows(building_name, tenant_name)]
+
+
+READ_ROUTES = {
+    ('buildings',): read_buildings,
+    ('tenants',): read_tenants,
+    ('tenants', None): read_tenants,
+    ('tenants', None, None): read_tenant,
+    ('payments', None, None): read_payments,
+    ('balances',): read_balances,
+    ('reports', None, None): read_report,
+}
+
+
+def match_route(routes, parts):
+    """경로 조각을 라우트와 비교해 처리 함수와 경로 인자를 찾는다 (None 은 인자 자리)"""
+    for pattern, handler in routes.items():
+        if len(pattern) != len(parts):
+            continue
+        if all(p is None or p == part for p, part in zip(pattern, parts)):
+            return handler, [part for p, part in zip(pattern, parts) if p is None]
+    return None, None
+
+
+# ---- 변경 처리 (작성자 작업에서만 실행) ----
+
+def write_payment(rental_manager, body):
+    rental_manager.add_payment(body['building'], body['tenant'], body['date'], body['amount'])
+    return {'imported': 1}
+
+
+PAYMENT_FIELDS = ('building', 'tenant', 'date', 'amount')
+
+
+def write_bulk_payments(rental_manager, body):
+    """납부 여러 건 추가 (형식이 잘못된 항목은 건너뛰고 errors 에 기록)"""
+    payments = body.get('payments', [])
+    if not isinstance(payments, list):
+        raise TypeError("payments 는 목록이어야 합니다.")
+    imported = 0
+    errors = []
+    for index, payment in enumerate(payments):
+        # 엔진을 바꾸기 전에 항목 형식부터 확인
+        if not isinstance(payment, dict):
+            errors.append({'index': index, 'error': "납부 항목은 객체여야 합니다."})
+            continue
+        missing = [field for field in PAYMENT_FIELDS if field not in payment]
+        if missing:
+            errors.append({'index': index, 'error': f"필드가 없습니다: {', '.join(missing)}"})
+            continue
+        try:
+            rental_manager.add_payment(payment['building'], payment['tenant'], payment['date'], payment['amount'])
+            imported += 1
+        except (TypeError, ValueError) as e:
+            errors.append({'index': index, 'error': str(e)})
+    return {'imported': imported, 'errors': errors}
+
+
+def write_delete_payments(rental_manager, body):
+    deleted = rental_manager.delete_payments(body['building'], body['tenant'], body['ids'])
+    return {'deleted': deleted}
+
+
+WRITE_ROUTES = {
+    ('payments',): write_payment,
+    ('payments', 'bulk'): write_bulk_payments,
+    ('payments', 'delete'): write_delete_payments,
+}
+
+
+class RentalService:
+    """단일 작성자 큐와 버전 스냅샷을 가진 API 서비스"""
+
+    def __init__(self, rental_manager, autosave=True):
+        self.rental_manager = rental_manager
+        self.autosave = autosave
+        self.publish()
+        self.cache = {}
+        self.writes = None
+        self.writer_task = None
+
+    def publish(self):
+        """엔진의 현재 스냅샷을 조회용으로 게시"""
+        self.snapshot = self.rental_manager.snapshot()
+        self.version = self.snapshot.version
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.writes = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.run_writer())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self):
+        if self.writer_task:
+            self.writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.writer_task
+
+    async def run_writer(self):
+        """변경 요청을 순서대로 적용하고, 대기 중인 요청은 한 묶음으로 저장"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.writes.get()]
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+
+            results = []
+            for handler, body, _ in batch:
+                try:
+                    results.append(handler(self.rental_manager, body))
+                except (KeyError, TypeError) as e:
+                    results.append(HttpError(400, f"요청 형식이 올바르지 않습니다: {e}"))
+                except ValueError as e:
+                    results.append(HttpError(400, str(e)))
+                except Exception as e:
+                    # 예상하지 못한 오류도 이 요청만 실패시키고 작성자 작업은 계속한다
+                    results.append(HttpError(500, f"처리 중 오류가 발생했습니다: {e}"))
+
+            # 요청의 성공 여부가 아니라 엔진 버전으로 판단 (실패한 요청이 일부를 바꿨어도 저장/게시)
+            if self.rental_manager.version != self.version:
+                if self.autosave:
+                    error = await self.save(loop)
+                    if error is not None:
+                        # 저장하지 못한 변경은 되돌렸으므로 성공한 요청도 실패로 알린다
+                        results = [result if isinstance(result, Exception) else error for result in results]
+                self.publish()
+                self.cache.clear()
+
+            for (_, _, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def save(self, loop):
+        """엔진 저장. 실패하면 저장하지 못한 변경을 버리고 파일의 내용으로 되돌린 뒤 요청에 돌려줄 HttpError
+
+        되돌리지 않으면 실패한 변경이 게시되지 않은 채 다음 묶음과 함께 저장되고,
+        충돌이 남아 이후의 모든 저장이 실패한다.
+        """
+        try:
+            await loop.run_in_executor(None, self.rental_manager.save_data)
+            return None
+        except SaveConflictError as e:
+            error = HttpError(409, f"{e} 변경을 취소하고 파일의 내용을 다시 읽었습니다.")
+        except Exception as e:
+            error = HttpError(500, f"저장 중 오류가 발생해 변경을 취소했습니다: {e}")
+        try:
+            await loop.run_in_executor(None, self.rental_manager.discard_unsaved)
+        except Exception as e:
+            print(f"저장하지 못한 변경을 되돌리는 중 오류 발생: {str(e)}")
+        return error
+
+    async def submit_write(self, handler, body):
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((handler, body, future))
+        return await future
+
+    async def read(self, handler, args, params, cache_key):
+        """스냅샷에서 조회를 실행하고 결과 본문을 버전별로 캐시"""
+        version, snapshot = self.version, self.snapshot
+        key = (version,) + cache_key
+        body = self.cache.get(key)
+        if body is None:
+            result = await asyncio.get_running_loop().run_in_executor(None, handler, snapshot, params, *args)
+            body = encode_json({'version': version, 'data': result})
+            if version == self.version:
+                if len(self.cache) >= CACHE_SIZE:
+                    self.cache.clear()
+                self.cache[key] = body
+        return body
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = tuple(unquote(part) for part in url.path.strip('/').split('/') if part)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts == ('health',):
+            return encode_json({'status': 'ok', 'version': self.version})
+
+        if method == 'GET':
+            handler, args = match_route(READ_ROUTES, parts)
+            if handler is None:
+                raise HttpError(404, "존재하지 않는 경로입니다.")
+            return await self.read(handler, args, params, (url.path, url.query))
+
+        if method == 'POST':
+            handler, _ = match_route(WRITE_ROUTES, parts)
+            if handler is None:
+                raise HttpError(404, "존재하지 않는 경로입니다.")
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                raise HttpError(400, "JSON 본문이 올바르지 않습니다.")
+            if not isinstance(payload, dict):
+                raise HttpError(400, "JSON 본문은 객체여야 합니다.")
+            result = await self.submit_write(handler, payload)
+            return encode_json({'version': self.version, 'data': result})
+
+        raise HttpError(405, "지원하지 않는 메서드입니다.")
+
+    async def handle_connection(self, reader, writer):
+        """keep-alive 연결에서 요청을 차례로 처리"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0) or 0)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                try:
+                    if length > MAX_BODY_SIZE:
+                        keep_alive = False
+                        raise HttpError(413, "요청 본문이 너무 큽니다.")
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = 200, await self.dispatch(method.upper(), target, body)
+                except HttpError as e:
+                    status, payload = e.status, encode_json({'error': str(e)})
+                except Exception as e:
+                    status, payload = 500, encode_json({'error': str(e)})
+
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+def encode_json(value):
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+async def serve(data_file=DATA_FILE, host=DEFAULT_HOST, port=DEFAULT_PORT, autosave=True):
+    rental_manager = RentalManagement(data_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        rental_manager.load_data(compile_snapshot=True)
+    if autosave:
+        from rental_audit import AuditLog, audit_dir_for
+        AuditLog(audit_dir_for(data_file)).attach(rental_manager)
+
+    service = RentalService(rental_manager, autosave)
+    server = await service.start(host, port)
+    print(f"임대료 관리 API 서비스 시작: http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="임대료 관리 로컬 HTTP/JSON API 서비스")
+    parser.add_argument('--data', default=DATA_FILE, help=f"데이터 파일 경로 (기본값: {DATA_FILE})")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--no-save', action='store_true', help="변경 내용을 파일에 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.data, args.host, args.port, not args.no_save))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
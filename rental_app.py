@@ -1,20 +1,33 @@
-import json
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 import os
-import shutil
 import threading
+import queue
 import time
-import tempfile
 import webbrowser
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
 import traceback  # 추가
 from tkcalendar import DateEntry  # 파일 상단에 추가
 import locale
-import win32api  # 추가
+try:
+    import win32api  # 추가 (Windows 전용)
+except ImportError:
+    win32api = None
+from rental_engine import RentalManagement, SaveConflictError
+from rental_storage import read_json
+from rental_money import to_won
+from rental_backup import BackupStore, backup_dir_for
+from rental_audit import AuditLog, audit_dir_for
+import rental_profiling
+from rental_profiling import timed
+from rental_export import export_tenant_report, export_all_reports
+from rental_print import building_targets, write_statements, new_print_path, cleanup_print_dir
+from rental_graph import ReportGraphWindow, report_series, portfolio_series
+from rental_forecast import Assumptions, forecast_inputs, project
+from rental_occupancy import occupancy_timeline
+from rental_risk import RISK_LEVELS, risk_book, risk_level
+from rental_unpaid import page_count, unpaid_model
 
 # locale 설정 부분을 다음과 같이 수정
 try:
@@ -25,286 +38,17 @@ except locale.Error:
     except locale.Error:
         locale.setlocale(locale.LC_ALL, '')         # 시스템 기본값 사용
 
-class RentalManagement:
-    def __init__(self):
-        self.buildings = {}
-
-    def add_building(self, building_name):
-        if building_name not in self.buildings:
-            self.buildings[building_name] = {}
-
-    def add_tenant(self, building_name, tenant_name, start_date, monthly_rent, payment_type="full"):
-        if building_name not in self.buildings:
-            raise ValueError("존재하지 않는 건물입니다.")
-        
-        self.buildings[building_name][tenant_name] = {
-            'start_date': datetime.strptime(start_date, '%Y-%m-%d').date(),
-            'monthly_rent': float(monthly_rent),
-            'payments': [],
-            'payment_type': payment_type  # 결제 방식 추가
-        }
-
-    def add_payment(self, building_name, tenant_name, payment_date, amount):
-        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
-            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
-        
-        try:
-            payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
-            amount = float(amount)
-        except ValueError:
-            raise ValueError("날짜 형식(YYYY-MM-DD) 또는 금액이 올바르지 않습니다.")
-        
-        self.buildings[building_name][tenant_name]['payments'].append({'date': payment_date, 'amount': amount})
-        self.buildings[building_name][tenant_name]['payments'].sort(key=lambda x: x['date'])
-
-    def calculate_balance(self, building_name, tenant_name):
-        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
-            raise ValueError("존재하지 않 건물 또는 임대입니다.")
-        
-        tenant = self.buildings[building_name][tenant_name]
-        today = datetime.now().date()
-        start_date = tenant['start_date']
-        
-        current_date = start_date.replace(day=1)
-        end_date = today.replace(day=1)
-        
-        total_rent = 0
-        while current_date <= end_date:
-            total_rent += self.get_monthly_rent(building_name, tenant_name, current_date)
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        total_paid = sum(payment['amount'] for payment in tenant['payments'])
-        return total_rent - total_paid
-
-    def generate_report(self, building_name, tenant_name):
-        try:
-            if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
-                raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
-            
-            tenant = self.buildings[building_name][tenant_name]
-            start_date = tenant['start_date']
-            today = datetime.now().date()
-            contract_end_date = tenant.get('contract_end_date')
-            
-            # 시작 월의 막 날짜 계산
-            start_month_last_day = (start_date.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            start_month_days = start_month_last_day.day
-            remaining_days = start_month_days - start_date.day + 1
-            
-            # 데이터프레임 생성
-            date_range = pd.date_range(start=start_date.replace(day=1), end=today, freq='MS')
-            df = pd.DataFrame(index=date_range, columns=('임대료', '납부일자', '납부액', '잔액', '비고'))
-            
-            # 임대료 계산
-            for idx in date_range:
-                date = idx.date()
-                monthly_rent = self.get_monthly_rent(building_name, tenant_name, date)
-                
-                # 첫 달 일할 계산
-                if date.year == start_date.year and date.month == start_date.month:
-                    if tenant.get('payment_type') == 'prorated':
-                        daily_rent = monthly_rent / start_month_days
-                        monthly_rent = daily_rent * remaining_days
-                        df.at[idx, '비고'] = f"일할계산({remaining_days}일)"
-                
-                # 마지막 달 일할 계산
-                if contract_end_date and date.year == contract_end_date.year and date.month == contract_end_date.month:
-                    month_last_day = (date.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-                    month_days = month_last_day.day
-                    used_days = contract_end_date.day
-                    
-                    daily_rent = monthly_rent / month_days
-                    monthly_rent = daily_rent * used_days
-                    
-                    current_note = df.at[idx, '비고'] if pd.notna(df.at[idx, '비고']) else ""
-                    separator = ", " if current_note else ""
-                    df.at[idx, '비고'] = f"{current_note}{separator}만료일할계산({used_days}일)"
-                
-                df.at[idx, '임대료'] = monthly_rent
-            
-            # 납부액 초기화
-            df['납부액'] = 0
-            
-            # 납부 기록 처리
-            date_index = df.index.map(lambda x: x.date())
-            for payment in tenant['payments']:
-                payment_month = payment['date'].replace(day=1)
-                try:
-                    idx_pos = date_index.get_loc(payment_month)
-                    df.iloc[idx_pos, df.columns.get_loc('납부액')] += payment['amount']
-                    df.at[df.index[idx_pos], '납부일자'] = payment['date'].strftime('%Y-%m-%d')
-                except KeyError:
-                    pass
-            
-            # 잔액 계산
-            df['잔액'] = (df['임대료'].cumsum() - df['납부액'].cumsum())
-            
-            # 데이터 형식 정리
-            df['임대료'] = df['임대료'].apply(lambda x: f"{int(x):,}원")
-            df['납부액'] = df['납부액'].apply(lambda x: '-' if x == 0 else f"{int(x):,}원")
-            df['잔액'] = df['잔액'].apply(lambda x: f"{int(x):,}원")
-            
-            # 비고 컬럼 처리 (기존 비고 정보 유지)
-            if 'monthly_rent_overrides' in tenant:
-                for month, override in tenant['monthly_rent_overrides'].items():
-                    month_date = datetime.fromisoformat(month).date()
-                    if month_date in date_index:
-                        if isinstance(override, dict):
-                            note = override.get('note', '')
-                            if note:
-                                current_note = df.at[month_date, '비고']
-                                df.at[month_date, '비고'] = f"{current_note}, {note}" if current_note else note
-            
-            # 인덱스를 월 열로 변환
-            df = df.reset_index()
-            df['index'] = df['index'].dt.strftime('%Y-%m')
-            df = df.rename(columns={'index': '월'})
-            
-            # NaN 값을 빈 문로 변환
-            df = df.fillna('')
-            
-            return df
-            
-        except Exception as e:
-            print(f"보고서 생성 중 오류 발생: {str(e)}")
-            return None
-
-    def save_data(self):
-        data = {building: {tenant: {**info, 
-                                    'start_date': info['start_date'].isoformat(), 
-                                    'contract_end_date': info.get('contract_end_date').isoformat() if 'contract_end_date' in info else None,
-                                    'payments': [{**p, 'date': p['date'].isoformat()} for p in info['payments']]}
-                           for tenant, info in tenants.items()}
-                for building, tenants in self.buildings.items()}
-        
-        with open('rental_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    def load_data(self):
-        try:
-            with open('rental_data.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.buildings = {}  # 기존 데이터 초기화
-                
-                for building, tenants in data.items():
-                    self.buildings[building] = {}
-                    if isinstance(tenants, dict):  # tenants가 딕셔너리인 경우에만 처리
-                        for tenant, info in tenants.items():
-                            tenant_data = {
-                                'start_date': datetime.fromisoformat(info['start_date']).date(),
-                                'monthly_rent': float(info['monthly_rent']),
-                                'payments': [],
-                                'payment_type': info.get('payment_type', 'full')  # 결제 방식 로드 추가
-                            }
-                            
-                            # 납부 기록 처리
-                            if 'payments' in info:
-                                for payment in info['payments']:
-                                    tenant_data['payments'].append({
-                                        'date': datetime.fromisoformat(payment['date']).date(),
-                                        'amount': float(payment['amount'])
-                                    })
-                            
-                            # 계약 만료일 처리
-                            if 'contract_end_date' in info and info['contract_end_date']:
-                                tenant_data['contract_end_date'] = datetime.fromisoformat(info['contract_end_date']).date()
-                            
-                            # 임대료 수정 기록 처리
-                            if 'monthly_rent_overrides' in info:
-                                tenant_data['monthly_rent_overrides'] = {
-                                    datetime.fromisoformat(date).date().isoformat(): amount
-                                    for date, amount in info['monthly_rent_overrides'].items()
-                                }
-                            
-                            self.buildings[building][tenant] = tenant_data
-                
-                print(f"데이터 로드 완료: {len(self.buildings)} 개의 건물, {sum(len(tenants) for tenants in self.buildings.values())} 명의 임대인 정보를 불러왔습니다.")
-                # 디버깅을 위한 상세 정보 출력
-                for building, tenants in self.buildings.items():
-                    print(f"\n건물: {building}")
-                    for tenant, info in tenants.items():
-                        print(f"  임대인: {tenant}")
-                        print(f"    시작일: {info['start_date']}")
-                        print(f"    월 임대료: {info['monthly_rent']}")
-                        print(f"    결제 방식: {info.get('payment_type', 'full')}")  # 결제 방식 출력 추가
-                        print(f"    납부 기록 수: {len(info['payments'])}")
-                
-        except FileNotFoundError:
-            print("rental_data.json 파일을 찾을 수 없습니다. 새로운 데이터를 시작합니다.")
-            self.buildings = {}
-        except json.JSONDecodeError as e:
-            print(f"JSON 일 형식이 올바르지 않음: {str(e)}")
-            self.buildings = {}
-        except Exception as e:
-            print(f"데이터 로드 중 오류 발생: {str(e)}")
-            print(f"상세 오류 보고: {traceback.format_exc()}")
-            self.buildings = {}
-
-    def add_monthly_rent_override(self, building_name, tenant_name, date, amount, note=''):
-        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
-            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
-        
-        if 'monthly_rent_overrides' not in self.buildings[building_name][tenant_name]:
-            self.buildings[building_name][tenant_name]['monthly_rent_overrides'] = {}
-        
-        month_key = date.replace(day=1).isoformat()
-        self.buildings[building_name][tenant_name]['monthly_rent_overrides'][month_key] = {
-            'amount': float(amount),
-            'note': note
-        }
-
-    def get_monthly_rent(self, building_name, tenant_name, date):
-        tenant = self.buildings[building_name][tenant_name]
-        month_key = date.replace(day=1).isoformat()
-        
-        if 'monthly_rent_overrides' in tenant and month_key in tenant['monthly_rent_overrides']:
-            override_value = tenant['monthly_rent_overrides'][month_key]
-            # 새로 형식(dict)인 경우
-            if isinstance(override_value, dict):
-                return override_value['amount']
-            # 이전 형식(float)인 경우
-            else:
-                return override_value
-        return tenant['monthly_rent']
-
-    def bulk_rent_increase(self, building_name, tenant_name, start_date, increase_amount, is_percentage=True):
-        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
-            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
-        
-        tenant = self.buildings[building_name][tenant_name]
-        start_date = start_date.replace(day=1)
-        
-        base_rent = tenant['monthly_rent']
-        if is_percentage:
-            increase = base_rent * (increase_amount / 100)
-        else:
-            increase = increase_amount
-        
-        current_date = start_date
-        end_date = datetime.now().date().replace(day=1)
-        
-        while current_date <= end_date:
-            month_key = current_date.isoformat()
-            
-            if 'monthly_rent_overrides' in tenant and month_key in tenant['monthly_rent_overrides']:
-                current_rent = tenant['monthly_rent_overrides'][month_key]['amount']
-            else:
-                current_rent = base_rent
-                
-            if is_percentage:
-                new_rent = current_rent * (1 + increase_amount / 100)
-            else:
-                new_rent = current_rent + increase_amount
-                
-            self.add_monthly_rent_override(building_name, tenant_name, current_date, new_rent)
-            
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
+DATA_WATCH_INTERVAL_MS = 2000  # 다른 곳에서 데이터 파일을 바꿨는지 확인하는 주기
+AUTO_BACKUP_INTERVAL_MS = 3600 * 1000  # 자동 백업 주기 (1시간)
+RISK_NOTIFY_LIMIT = 5  # 연체 위험 알림에 이름을 보여줄 최대 임대인 수
+# 디버그 메뉴에서 프로파일링할 수 있는 측정 구간 (메뉴 이름, 구간 이름)
+PROFILE_SECTIONS = (
+    ("보고서 조회", 'show_report'),
+    ("대시보드 갱신", 'update_dashboard'),
+    ("데이터 저장", 'save_data'),
+    ("전체 보고서 내보내기", 'export_all_reports'),
+    ("임대료 청구서 만들기", 'write_statements'),
+)
 
 class RentalApp(tk.Tk):
     def __init__(self):
@@ -390,16 +134,62 @@ class RentalApp(tk.Tk):
                       relief=[('pressed', 'flat')])
         
         self.rental_manager = RentalManagement()
-        self.rental_manager.load_data()
+        self.rental_manager.load_data(compile_snapshot=True)
+        self.audit_log = AuditLog(audit_dir_for(self.rental_manager.data_file))
+        try:
+            # 컴파일된 스냅샷은 이 프로그램이 마지막으로 저장한 파일과 일치할 때만 쓰이므로
+            # 그 내용은 이미 변경 이력에 있다. 체크포인트를 만들면 모든 임대인을 변환해야 한다
+            self.audit_log.attach(self.rental_manager, checkpoint=self.rental_manager.compiled is None)
+        except OSError as e:
+            print(f"변경 이력 시작 중 오류 발생: {str(e)}")
+        cleanup_print_dir()  # 지난 프린트 임시 파일 정리
+        rental_profiling.add_capture_listener(self.on_profile_captured)
+        self.backup_store = BackupStore(backup_dir_for(self.rental_manager.data_file))
+        self.last_backup_version = self.rental_manager.version
         self.notification_enabled = tk.BooleanVar(value=True)
+        self.graph_window = None
+        self.portfolio_graph_window = None
         
         self.create_menu()
         self.create_widgets()
         self.start_notification_thread()
         self.update_dashboard()
+        self.after(DATA_WATCH_INTERVAL_MS, self.watch_data_file)
+        self.after(AUTO_BACKUP_INTERVAL_MS, self.auto_backup)
         
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def save_data(self):
+        """데이터 저장 (다른 곳에서 같은 임대인을 수정했으면 어느 쪽을 남길지 확인)"""
+        try:
+            self.rental_manager.save_data()
+        except SaveConflictError as e:
+            keep_file = messagebox.askyesno(
+                "저장 충돌",
+                f"{str(e)}\n\n다른 곳에서 저장한 내용을 불러올까요?\n"
+                "(아니요를 누르면 현재 내용으로 덮어씁니다)"
+            )
+            try:
+                self.rental_manager.sync_from_file(prefer='file' if keep_file else 'memory')
+                self.rental_manager.save_data()
+            except (OSError, ValueError) as e:
+                messagebox.showerror("오류", f"데이터 저장 중 오류가 발생했습니다: {str(e)}")
+            self.update_dashboard()
+        except OSError as e:
+            messagebox.showerror("오류", f"데이터 저장 중 오류가 발생했습니다: {str(e)}")
+
+    def watch_data_file(self):
+        """다른 프로그램이 데이터 파일을 바꿨으면 바뀐 임대인만 다시 불러오기"""
+        try:
+            if self.rental_manager.file_changed():
+                changed, conflicts = self.rental_manager.sync_from_file()
+                if changed:
+                    self.update_dashboard()
+        except (OSError, ValueError) as e:
+            # 이전 버전이 저장하는 도중이면 다음 확인 때 다시 읽는다
+            print(f"데이터 파일 확인 중 오류 발생: {str(e)}")
+        self.after(DATA_WATCH_INTERVAL_MS, self.watch_data_file)
+
     def start_notification_thread(self):
         """알림 스레드 시작"""
         self.notification_thread = threading.Thread(target=self.check_notifications, daemon=True)
@@ -410,22 +200,23 @@ class RentalApp(tk.Tk):
         while True:
             if self.notification_enabled.get():
                 try:
-                    today = datetime.now().date()
+                    # UI 스레드가 데이터를 바꾸는 중에도 안전하도록 스냅샷에서 확인
+                    snapshot = self.rental_manager.snapshot()
+                    for building, tenant_name, days_to_expiry, balance in snapshot.find_expiring_unpaid():
+                        self.show_notification(
+                            "계약 만료 예정",
+                            f"{building} - {tenant_name}의 계약이 {days_to_expiry}일 후 만료됩니다."
+                        )
                     
-                    # 모든 임대인에 대해 체크
-                    for building in self.rental_manager.buildings:
-                        for tenant_name, tenant in self.rental_manager.buildings[building].items():
-                            # 미납금 확인
-                            balance = self.rental_manager.calculate_balance(building, tenant_name)
-                            if balance > 0:
-                                # 계약 만료 확인
-                                if 'contract_end_date' in tenant:
-                                    days_to_expiry = (tenant['contract_end_date'] - today).days
-                                    if 0 < days_to_expiry <= 30:
-                                        self.show_notification(
-                                            f"계약 만료 예정",
-                                            f"{building} - {tenant_name}의 계약이 {days_to_expiry}일 후 만료됩니다."
-                                        )
+                    # 연체 위험이 높은 미납 임대인
+                    high_risk = [(score, building, tenant_name)
+                                 for score, building, tenant_name in risk_book(snapshot).ranked(RISK_LEVELS[0][0])
+                                 if snapshot.calculate_balance(building, tenant_name) > 0]
+                    if high_risk:
+                        names = ', '.join(f"{building} - {tenant_name}({score:.0f}점)"
+                                          for score, building, tenant_name in high_risk[:RISK_NOTIFY_LIMIT])
+                        more = f" 외 {len(high_risk) - RISK_NOTIFY_LIMIT}명" if len(high_risk) > RISK_NOTIFY_LIMIT else ""
+                        self.show_notification("연체 위험", f"연체 위험이 높은 임대인: {names}{more}")
                 
                 except Exception as e:
                     print(f"알림 확인 중 오류 발생: {str(e)}")
@@ -434,8 +225,8 @@ class RentalApp(tk.Tk):
             time.sleep(86400)  # 24시간 = 86400초
 
     def show_notification(self, title, message):
-        """알림 표시"""
-        messagebox.showinfo(title, message)
+        """알림 표시 (tkinter 는 UI 스레드에서만 호출해야 하므로 after 로 넘긴다)"""
+        self.after(0, lambda: messagebox.showinfo(title, message))
 
     def create_menu(self):
         """메뉴 생성"""
@@ -443,13 +234,16 @@ class RentalApp(tk.Tk):
 
         # 파일 메뉴
         file_menu = tk.Menu(menu_bar, tearoff=0)
-        file_menu.add_command(label="데이터 저장", command=self.rental_manager.save_data)
+        file_menu.add_command(label="데이터 저장", command=self.save_data)
+        file_menu.add_command(label="전체 보고서 엑셀 내보내기", command=self.export_all_to_excel)
+        file_menu.add_command(label="전체 납부현황 HTML 보관", command=self.archive_reports)
         
         # 백업 서브메뉴 추가
         backup_menu = tk.Menu(file_menu, tearoff=0)
         backup_menu.add_command(label="백업 생성", command=self.create_backup)
         backup_menu.add_command(label="백업 복원", command=self.restore_backup)
         file_menu.add_cascade(label="백업", menu=backup_menu)
+        file_menu.add_command(label="변경 이력", command=self.show_history)
         
         # 데이터 초기화 메뉴 추가
         file_menu.add_separator()
@@ -459,6 +253,28 @@ class RentalApp(tk.Tk):
         file_menu.add_command(label="종료", command=self.on_closing)
         menu_bar.add_cascade(label="파일", menu=file_menu)
 
+        # 보고서 메뉴
+        report_menu = tk.Menu(menu_bar, tearoff=0)
+        report_menu.add_command(label="전체 수납 추이", command=self.show_portfolio_graph)
+        report_menu.add_command(label="선택 건물 수납 추이", 
+                                command=lambda: self.show_portfolio_graph(self.report_building_name.get() or None))
+        report_menu.add_separator()
+        report_menu.add_command(label="임대료 전망", command=self.show_forecast)
+        menu_bar.add_cascade(label="보고서", menu=report_menu)
+
+        # 디버그 메뉴
+        debug_menu = tk.Menu(menu_bar, tearoff=0)
+        debug_menu.add_command(label="성능 통계", command=self.show_profiling_stats)
+        debug_menu.add_command(label="성능 통계 JSON 저장", command=self.save_profiling_stats)
+        capture_menu = tk.Menu(debug_menu, tearoff=0)
+        capture_menu.add_command(label="화면에서 실행하는 다음 작업", command=self.arm_profiling_capture)
+        capture_menu.add_separator()
+        for label, section in PROFILE_SECTIONS:
+            capture_menu.add_command(label=label,
+                                     command=lambda section=section, label=label: self.arm_profiling_capture(section, label))
+        debug_menu.add_cascade(label="다음 작업 프로파일링", menu=capture_menu)
+        menu_bar.add_cascade(label="디버그", menu=debug_menu)
+
         # 도움말 메뉴
         help_menu = tk.Menu(menu_bar, tearoff=0)
         help_menu.add_command(label="사용법", command=self.show_help)
@@ -474,94 +290,273 @@ class RentalApp(tk.Tk):
                               "계속하시겠습니까?"):
             try:
                 # 현재 데이터 백업
-                backup_dir = "backups"
-                if not os.path.exists(backup_dir):
-                    os.makedirs(backup_dir)
-                
-                current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = os.path.join(backup_dir, f"rental_data_before_initialize_{current_time}.json")
-                
-                if os.path.exists('rental_data.json'):
-                    shutil.copy2('rental_data.json', backup_file)
+                snapshot_id = self.backup_now("초기화 전")
                 
                 # 데이터 초기화
-                self.rental_manager.buildings = {}
-                self.rental_manager.save_data()
+                self.rental_manager.clear_data()
+                self.rental_manager.save_data(force=True)
                 
                 # UI 업데이트
                 self.update_dashboard()
                 
                 messagebox.showinfo("성공", 
                                   f"데이터가 초기화되었습니다.\n"
-                                  f"이전 데이터는 {backup_file}에 백업되었습니다.")
+                                  f"이전 데이터는 백업 {snapshot_id}에 저장되었습니다.")
                 
             except Exception as e:
                 messagebox.showerror("오류", f"데이터 초기화 중 오류가 발생했습니다: {str(e)}")
 
+    def backup_now(self, label):
+        """현재 데이터를 백업 저장소에 저장하고 보관 정책에 따라 오래된 백업 정리"""
+        snapshot_id, _ = self.backup_store.create(self.rental_manager.snapshot().to_json_data(), label)
+        self.backup_store.prune()
+        self.last_backup_version = self.rental_manager.version
+        return snapshot_id
+
+    def auto_backup(self):
+        """주기적인 자동 백업 (마지막 백업 이후 바뀐 내용이 있을 때만)"""
+        try:
+            if self.rental_manager.version != self.last_backup_version:
+                self.backup_now("자동 백업")
+        except Exception as e:
+            print(f"자동 백업 중 오류 발생: {str(e)}")
+        self.after(AUTO_BACKUP_INTERVAL_MS, self.auto_backup)
+
     def create_backup(self):
         """데이터 백업 생성"""
         try:
-            # 백업 폴더 생성
-            backup_dir = "backups"
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            
-            # 현재 시간을 포함한 백업 파일명 생성
-            current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = os.path.join(backup_dir, f"rental_data_backup_{current_time}.json")
-            
-            # 현재 데이터 파일을 백업 폴더로 복사
-            shutil.copy2('rental_data.json', backup_file)
-            
-            messagebox.showinfo("성공", f"백업이 생성되었습니다.\n저장 치: {backup_file}")
+            snapshot_id = self.backup_now("수동 백업")
+            messagebox.showinfo("성공", f"백업이 생성되었습니다.\n백업: {snapshot_id}")
         except Exception as e:
             messagebox.showerror("오류", f"백업 생성 중 오류가 발생했습니다: {str(e)}")
 
     def restore_backup(self):
-        """백업 데이터 복원"""
+        """백업 목록에서 골라 전체 또는 건물/임대인 하나만 복원"""
         try:
-            backup_dir = "backups"
-            if not os.path.exists(backup_dir):
-                messagebox.showerror("오류", "백업 폴더가 존재하지 않습니다.")
+            snapshots = self.backup_store.list_snapshots()
+        except Exception as e:
+            messagebox.showerror("오류", f"백업 목록을 읽는 중 오류가 발생했습니다: {str(e)}")
+            return
+        
+        dialog = tk.Toplevel(self)
+        dialog.title("백업 복원")
+        dialog.geometry("520x420")
+        dialog.transient(self)
+        
+        tree = ttk.Treeview(dialog, columns=('생성 시각', '설명', '임대인 수'), show='headings', height=10)
+        for column, width in (('생성 시각', 160), ('설명', 180), ('임대인 수', 100)):
+            tree.heading(column, text=column)
+            tree.column(column, width=width)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        for snapshot_id, created, label, building_count, tenant_count in snapshots:
+            tree.insert('', tk.END, iid=snapshot_id,
+                        values=(created.strftime('%Y-%m-%d %H:%M:%S'), label, f"{tenant_count:,}"))
+        
+        scope_frame = ttk.Frame(dialog)
+        scope_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(scope_frame, text="건물:").grid(row=0, column=0, padx=5, pady=2)
+        building_combo = ttk.Combobox(scope_frame, state='readonly', values=["전체"])
+        building_combo.set("전체")
+        building_combo.grid(row=0, column=1, padx=5, pady=2)
+        ttk.Label(scope_frame, text="임대인:").grid(row=1, column=0, padx=5, pady=2)
+        tenant_combo = ttk.Combobox(scope_frame, state='readonly', values=["전체"])
+        tenant_combo.set("전체")
+        tenant_combo.grid(row=1, column=1, padx=5, pady=2)
+        
+        def selected_manifest():
+            selection = tree.selection()
+            return self.backup_store.read_manifest(selection[0])['buildings'] if selection else {}
+        
+        def on_snapshot_selected(event):
+            building_combo['values'] = ["전체"] + sorted(selected_manifest())
+            building_combo.set("전체")
+            tenant_combo['values'] = ["전체"]
+            tenant_combo.set("전체")
+        
+        def on_building_selected(event):
+            tenants = selected_manifest().get(building_combo.get(), {})
+            tenant_combo['values'] = ["전체"] + sorted(tenants)
+            tenant_combo.set("전체")
+        
+        tree.bind('<<TreeviewSelect>>', on_snapshot_selected)
+        building_combo.bind('<<ComboboxSelected>>', on_building_selected)
+        
+        def restore():
+            selection = tree.selection()
+            if not selection:
+                messagebox.showerror("오류", "복원할 백업을 선택해주세요.", parent=dialog)
                 return
-            
-            # 백업 파일 선택 대화상자 표시
+            building_name = None if building_combo.get() == "전체" else building_combo.get()
+            tenant_name = None if building_name is None or tenant_combo.get() == "전체" else tenant_combo.get()
+            target = " - ".join(name for name in (building_name, tenant_name) if name) or "전체 데이터"
+            if not messagebox.askyesno("확인", f"{target}을(를) 백업 {selection[0]}의 내용으로 되돌립니다.\n"
+                                              "계속하시겠습니까?", parent=dialog):
+                return
+            self.restore_from(lambda: self.backup_store.load(selection[0], building_name, tenant_name),
+                              building_name, tenant_name)
+            dialog.destroy()
+        
+        def restore_file():
+            # 이전 버전이 만든 전체 JSON 백업 파일 복원
             backup_file = filedialog.askopenfilename(
-                initialdir=backup_dir,
+                parent=dialog,
+                initialdir=self.backup_store.root,
                 title="복원할 백업 파일 선택",
                 filetypes=[("JSON files", "*.json")]
             )
-            
             if backup_file:
-                # 현재 데이터 파일 백업
-                current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-                temp_backup = os.path.join(backup_dir, f"rental_data_before_restore_{current_time}.json")
-                shutil.copy2('rental_data.json', temp_backup)
-                
-                # 선한 백업 파일을 현재 데이터 파일로 복사
-                shutil.copy2(backup_file, 'rental_data.json')
-                
-                # 데이터 다시 로드
-                self.rental_manager.load_data()
-                self.update_dashboard()
-                
-                messagebox.showinfo("성공", 
-                                    f"백업이 복원되었습니다.\n"
-                                    f"이전 데이터는 {temp_backup}에 백업되었습니다.")
+                self.restore_from(lambda: read_json(backup_file))
+                dialog.destroy()
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(5, 10))
+        ttk.Button(button_frame, text="복원", command=restore).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="JSON 파일에서 복원...", command=restore_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="닫기", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+
+    def restore_from(self, load, building_name=None, tenant_name=None):
+        """현재 데이터를 백업한 뒤 load() 가 돌려준 내용으로 복원"""
+        try:
+            data = load()
+            snapshot_id = self.backup_now("복원 전")
+            self.rental_manager.restore_json_data(data, building_name, tenant_name)
+            if building_name is None:
+                # 전체 복원은 다른 곳의 변경 내용과 합치지 않고 덮어쓴다
+                self.rental_manager.save_data(force=True)
+            else:
+                self.save_data()
+            self.update_dashboard()
+            
+            messagebox.showinfo("성공", 
+                                f"백업이 복원되었습니다.\n"
+                                f"이전 데이터는 백업 {snapshot_id}에 저장되었습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"백업 복원 중 오류가 발생했습니다: {str(e)}")
 
+    def show_history(self):
+        """선택한 임대인(선택이 없으면 전체)의 변경 이력 표시, 선택한 시점으로 임대인 되돌리기"""
+        building_name, tenant_name = self.selected_tenant() or (None, None)
+        
+        try:
+            events = self.audit_log.history(building_name, tenant_name)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("오류", f"변경 이력을 읽는 중 오류가 발생했습니다: {str(e)}")
+            return
+        
+        dialog = tk.Toplevel(self)
+        dialog.title(f"변경 이력 - {building_name} - {tenant_name}" if tenant_name else "변경 이력 - 전체")
+        dialog.geometry("760x420")
+        dialog.transient(self)
+        
+        columns = ('시각', '사용자', '작업', '내용')
+        tree = ttk.Treeview(dialog, columns=columns, show='headings')
+        for column, width in zip(columns, (150, 90, 160, 340)):
+            tree.heading(column, text=column)
+            tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(dialog, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        for index, event in enumerate(reversed(events)):
+            when = datetime.fromisoformat(event['time'])
+            detail = ', '.join(str(arg) for arg in event['args'])
+            tree.insert('', tk.END, iid=str(index),
+                        values=(when.strftime('%Y-%m-%d %H:%M:%S'), event['user'], event['op'], detail),
+                        tags=(event['time'],))
+        
+        def restore_selected():
+            selection = tree.selection()
+            if not selection:
+                messagebox.showerror("오류", "되돌릴 시점을 선택해주세요.", parent=dialog)
+                return
+            when = datetime.fromisoformat(tree.item(selection[0], 'tags')[0])
+            if not messagebox.askyesno("확인", f"{building_name} - {tenant_name}을(를) "
+                                              f"{when.strftime('%Y-%m-%d %H:%M:%S')} 변경 직후의 상태로 되돌립니다.\n"
+                                              "계속하시겠습니까?", parent=dialog):
+                return
+            try:
+                data = self.audit_log.state_at(when, building_name, tenant_name)
+                if tenant_name in data.get(building_name, {}):
+                    self.rental_manager.restore_json_data(data, building_name, tenant_name)
+                elif building_name in self.rental_manager.buildings \
+                        and tenant_name in self.rental_manager.buildings[building_name]:
+                    self.rental_manager.delete_tenant(building_name, tenant_name)
+                self.save_data()
+                self.update_dashboard()
+                dialog.destroy()
+                messagebox.showinfo("성공", "선택한 시점의 상태로 되돌렸습니다.")
+            except (OSError, ValueError) as e:
+                messagebox.showerror("오류", f"되돌리는 중 오류가 발생했습니다: {str(e)}", parent=dialog)
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(5, 10))
+        if tenant_name:
+            ttk.Button(button_frame, text="이 시점으로 되돌리기", command=restore_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="닫기", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=(10, 0))
+        tree.pack(fill=tk.BOTH, expand=True, padx=(10, 0), pady=(10, 0))
+
+    def show_profiling_stats(self):
+        """측정 구간별 실행 시간 통계 표시"""
+        stats = rental_profiling.stats()
+        
+        window = tk.Toplevel(self)
+        window.title("성능 통계")
+        window.geometry("760x360")
+        window.transient(self)
+        
+        columns = ('구간', '호출 수', '평균(ms)', 'p50(ms)', 'p90(ms)', 'p99(ms)', '최대(ms)', '합계(ms)')
+        tree = ttk.Treeview(window, columns=columns, show='headings')
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=170 if column == '구간' else 80, anchor='w' if column == '구간' else 'e')
+        for name, timer_stats in stats['timers'].items():
+            tree.insert('', tk.END, values=(
+                name, f"{timer_stats['count']:,}",
+                *(f"{timer_stats[key]:,.2f}" for key in ('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms', 'total_ms'))
+            ))
+        for name, error in stats['errors'].items():
+            tree.insert('', tk.END, values=(f"{name} 오류", f"{error['count']:,}", error['last']))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Button(window, text="닫기", command=window.destroy).pack(pady=(0, 10))
+
+    def save_profiling_stats(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")],
+            initialfile=f"rental_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        if not file_path:
+            return
+        try:
+            rental_profiling.dump_json(file_path)
+            messagebox.showinfo("성공", f"성능 통계가 저장되었습니다.\n저장 위치: {file_path}")
+        except OSError as e:
+            messagebox.showerror("오류", f"성능 통계 저장 중 오류가 발생했습니다: {str(e)}")
+
+    def arm_profiling_capture(self, section=None, label=None):
+        # 구간을 고르지 않으면 UI 스레드의 다음 작업만 기록한다 (알림 스레드 등은 제외)
+        rental_profiling.arm_capture(section)
+        target = f"다음 {label} 작업" if label else "화면에서 다음에 실행하는 작업(보고서 조회, 화면 갱신, 저장 등)"
+        messagebox.showinfo("프로파일링", f"{target}의\nCPU/메모리 사용을 기록합니다.")
+
+    def on_profile_captured(self, name, path):
+        # 작업 스레드에서 호출될 수 있으므로 UI 스레드로 넘긴다
+        self.after(0, lambda: messagebox.showinfo("프로파일링 완료", f"{name} 프로파일 보고서:\n{path}"))
+
     def on_closing(self):
         """프로그램 종료 시 호출되는 메서드"""
         try:
             # 데이터 저장
-            self.rental_manager.save_data()
+            self.save_data()
             # 알림 스레드 종료
             self.notification_enabled.set(False)
             time.sleep(0.5)  # 스레드가 종될 시간을 줌
             
-            # Matplotlib 창들 닫
-            plt.close('all')
+            # 그래프 창 닫기
+            for window in (self.graph_window, self.portfolio_graph_window):
+                if window is not None:
+                    window.close()
             
             # 메인 윈도우 종료
             self.quit()  # Tkinter 이벤트 루프 종료
@@ -629,16 +624,14 @@ class RentalApp(tk.Tk):
                     messagebox.showerror("오류", "이미 재하는 임대인입니다.")
                     return
                 
-                # 임대인 추가
-                self.rental_manager.add_tenant(building_name, tenant_name, start_date, monthly_rent, payment_type)
-                
-                # 계약 만료일이 입력된 경우 추가
-                if contract_enddate:
-                    self.rental_manager.buildings[building_name][tenant_name]['contract_end_date'] = \
-                        datetime.strptime(contract_enddate, '%Y-%m-%d').date()  # contract_enddate -> contract_end_date
+                # 임대인 추가 (계약 만료일은 입력된 경우에만)
+                if contract_end_date:
+                    contract_end_date = datetime.strptime(contract_end_date, '%Y-%m-%d').date()
+                self.rental_manager.add_tenant(building_name, tenant_name, start_date, monthly_rent, payment_type,
+                                               contract_end_date or None)
                 
                 # 데이터 저장 및 화면 갱신
-                self.rental_manager.save_data()
+                self.save_data()
                 self.update_dashboard()
                 
                 # 입력 필드 초기화
@@ -673,6 +666,18 @@ class RentalApp(tk.Tk):
         self.total_unpaid_label = ttk.Label(stats_frame, text="0원")
         self.total_unpaid_label.grid(row=2, column=1, padx=5, pady=5)
         
+        # 건물별 입주 현황 (임대인이 없는 건물도 표시)
+        occupancy_frame = ttk.LabelFrame(parent, text="건물별 입주 현황")
+        occupancy_frame.pack(fill='x', padx=5, pady=5)
+        
+        columns = ('building', 'occupied', 'capacity', 'rate', 'lost_rent')
+        self.occupancy_tree = ttk.Treeview(occupancy_frame, columns=columns, show='headings', height=5)
+        for column, text in zip(columns, ('건물', '입주', '최대 입주', '입주율', '공실 손실 추정(누적)')):
+            self.occupancy_tree.heading(column, text=text)
+            self.occupancy_tree.column(column, width=160 if column in ('building', 'lost_rent') else 80,
+                                       anchor='w' if column == 'building' else 'e')
+        self.occupancy_tree.pack(fill='x', padx=5, pady=5)
+        
         # 중간 프레임 - 임대인 목록
         tenant_frame = ttk.LabelFrame(parent, text="임대인 목록")
         tenant_frame.pack(fill='both', expand=True, padx=5, pady=5)
@@ -685,10 +690,39 @@ class RentalApp(tk.Tk):
         unpaid_frame = ttk.LabelFrame(parent, text="이번 달 미납")
         unpaid_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
-        self.unpaid_tree = ttk.Treeview(unpaid_frame, columns=('name', 'amount'), show='headings')
-        self.unpaid_tree.heading('name', text='임대인')
-        self.unpaid_tree.heading('amount', text='미납액')
+        # 필터 (건물, 최소 미납액)
+        filter_frame = ttk.Frame(unpaid_frame)
+        filter_frame.pack(fill='x', padx=5, pady=(5, 0))
+        ttk.Label(filter_frame, text="건물:").pack(side=tk.LEFT)
+        self.unpaid_building = ttk.Combobox(filter_frame, state='readonly', values=["전체"], width=15)
+        self.unpaid_building.set("전체")
+        self.unpaid_building.pack(side=tk.LEFT, padx=5)
+        self.unpaid_building.bind('<<ComboboxSelected>>', lambda event: self.show_unpaid_page(0))
+        ttk.Label(filter_frame, text="최소 미납액:").pack(side=tk.LEFT)
+        self.unpaid_minimum = ttk.Entry(filter_frame, width=12)
+        self.unpaid_minimum.pack(side=tk.LEFT, padx=5)
+        self.unpaid_minimum.bind('<Return>', lambda event: self.show_unpaid_page(0))
+        ttk.Button(filter_frame, text="적용", command=lambda: self.show_unpaid_page(0)).pack(side=tk.LEFT)
+        
+        columns = ('name', 'amount', 'age', 'risk')
+        self.unpaid_tree = ttk.Treeview(unpaid_frame, columns=columns, show='headings')
+        for column, text in zip(columns, ('임대인', '미납액', '경과 일수', '연체 위험')):
+            self.unpaid_tree.heading(column, text=text, command=lambda column=column: self.sort_unpaid_tree(column))
+            self.unpaid_tree.column(column, anchor='w' if column == 'name' else 'e')
         self.unpaid_tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # 페이지 이동
+        page_frame = ttk.Frame(unpaid_frame)
+        page_frame.pack(fill='x', padx=5, pady=(0, 5))
+        ttk.Button(page_frame, text="◀ 이전",
+                   command=lambda: self.show_unpaid_page(self.unpaid_page - 1)).pack(side=tk.LEFT)
+        self.unpaid_page_label = ttk.Label(page_frame, text="")
+        self.unpaid_page_label.pack(side=tk.LEFT, expand=True)
+        ttk.Button(page_frame, text="다음 ▶",
+                   command=lambda: self.show_unpaid_page(self.unpaid_page + 1)).pack(side=tk.RIGHT)
+        self.unpaid_sort = ('risk', True)  # (정렬 열, 내림차순)
+        self.unpaid_page = 0
+        self.unpaid_rows = None  # 필터와 정렬을 적용한 모델 행 번호
 
         # 대시보드 업데이트
         self.update_dashboard()
@@ -746,7 +780,7 @@ class RentalApp(tk.Tk):
                 messagebox.showerror("오류", "이미 존재하는 건물 이름입니다.")
             else:
                 self.rental_manager.add_building(building_name)
-                self.rental_manager.save_data()
+                self.save_data()
                 self.update_all_building_lists()
                 self.new_building_name.delete(0, tk.END)
                 messagebox.showinfo("성공", f"건물 '{building_name}'이(가) 추가되었습니다.")
@@ -771,8 +805,8 @@ class RentalApp(tk.Tk):
             return
         
         # 건물 름 변경
-        self.rental_manager.buildings[new_name] = self.rental_manager.buildings.pop(old_name)
-        self.rental_manager.save_data()
+        self.rental_manager.rename_building(old_name, new_name)
+        self.save_data()
         self.update_all_building_lists()
         self.new_building_name.delete(0, tk.END)
         messagebox.showinfo("성공", f"건물 이름이 '{old_name}'에서 '{new_name}'으로 변경되었습니다.")
@@ -785,8 +819,8 @@ class RentalApp(tk.Tk):
         
         building_name = self.building_listbox.get(selected)
         if messagebox.askyesno("확인", f"'{building_name}'과(와) 관련된 모든 임대인 정보가 삭제됩니다.\n계속하시겠습니까?"):
-            del self.rental_manager.buildings[building_name]
-            self.rental_manager.save_data()
+            self.rental_manager.delete_building(building_name)
+            self.save_data()
             self.update_all_building_lists()
             self.new_building_name.delete(0, tk.END)
             messagebox.showinfo("성공", f"건물 '{building_name}'이(가) 삭제되었습니다.")
@@ -927,17 +961,14 @@ class RentalApp(tk.Tk):
                     raise ValueError(f"임대인 '{tenant_name}'이(가) 존재하지 않습니다.")
                 
                 self.rental_manager.add_payment(building_name, tenant_name, payment_date, amount)
-                self.rental_manager.save_data()
+                self.save_data()
                 messagebox.showinfo("성공", f"{tenant_name}의 납부 기록이 추가되었습니다.")
                 
                 # 필드 초기화
                 self.clear_payment_fields()
                 
-                # UI 업데이트
-                self.update_tenant_listbox()
-                self.update_building_listbox()
-                self.update_unpaid_tree()
-                self.update_stats()
+                # UI 업데이트 (납부 기록만 바뀌었으므로 이 임대인의 미납 행과 통계만)
+                self.refresh_tenants([(building_name, tenant_name)])
                 
                 # 현재 보고서에 표시된 임대인의 납부 기록이 추가된 경우 보고서 갱신
                 current_report_building = self.report_building_name.get()
@@ -1008,6 +1039,7 @@ class RentalApp(tk.Tk):
         ttk.Button(parent, text="엑셀 저장", command=self.save_to_excel).grid(row=4, column=0, pady=10)
         ttk.Button(parent, text="그래프 보기", command=self.show_graph).grid(row=4, column=1, pady=10)
         ttk.Button(parent, text="프린트 출력", command=lambda: self.print_report()).grid(row=4, column=2, pady=10)
+        ttk.Button(parent, text="건물 전체 출력", command=self.print_building_report).grid(row=5, column=2, pady=(0, 10))
 
     def create_manage_tenant_widgets(self, parent):
         main_frame = ttk.Frame(parent)
@@ -1025,6 +1057,7 @@ class RentalApp(tk.Tk):
         center_frame.pack(side='left', fill='both', expand=True, padx=5, pady=5)
 
         self.tenant_info_text = tk.Text(center_frame, height=5, width=35)
+        self.info_tenant_id = None  # 임대인 정보에 표시 중인 임대인 ID
         self.tenant_info_text.pack(fill='x', padx=5, pady=5)
 
         edit_frame = ttk.LabelFrame(center_frame, text="정보 수정")
@@ -1109,9 +1142,12 @@ class RentalApp(tk.Tk):
         ttk.Label(right_frame, text="수정된 목록:").pack(padx=2, pady=2)
         self.override_listbox = tk.Listbox(right_frame, width=25, height=6)
         self.override_listbox.pack(fill='x', padx=5, pady=2)
+        self.override_listbox_months = []  # 행마다 임대료 수정 월 키
 
         ttk.Button(right_frame, text="선택 항목 삭제", style='Danger.TButton', 
                    command=self.delete_rent_override).pack(pady=2)
+        ttk.Button(right_frame, text="기간 일괄 수정...", 
+                   command=self.edit_rent_range).pack(pady=2)
 
         increase_frame = ttk.LabelFrame(right_frame, text="임대료 일괄 인상")
         increase_frame.pack(fill='x', padx=5, pady=5)
@@ -1177,13 +1213,12 @@ class RentalApp(tk.Tk):
 
     def extend_contract(self):
         """계약 연장 처리"""
-        selected_index = self.tenant_listbox.curselection()
-        if not selected_index:
+        selected = self.selected_tenant()
+        if not selected:
             messagebox.showerror("오류", "임대인을 선택해주세요.")
             return
         
-        selected_tenant = self.tenant_listbox.get(selected_index)
-        building_name, tenant_name = selected_tenant.split(" - ")
+        building_name, tenant_name = selected
         tenant = self.rental_manager.buildings[building_name][tenant_name]
         
         if 'contract_end_date' not in tenant:
@@ -1201,10 +1236,10 @@ class RentalApp(tk.Tk):
             new_end_date = current_end_date.replace(year=current_end_date.year + extension_years)
             
             # 계약 만료일 업데이트
-            tenant['contract_end_date'] = new_end_date
+            self.rental_manager.set_contract_end_date(building_name, tenant_name, new_end_date)
             
             # 데이터 저장 및 화면 갱신
-            self.rental_manager.save_data()
+            self.save_data()
             self.show_tenant_info(None)  # 임대인 정보 표시 갱신
             
             messagebox.showinfo("성공", 
@@ -1229,23 +1264,49 @@ class RentalApp(tk.Tk):
         self.payment_tenant_name.pack(side='left', padx=5)
         self.payment_tenant_name.bind("<<ComboboxSelected>>", self.update_payment_listbox)
 
-        # 납부 기록 목록
-        self.payment_listbox = tk.Listbox(parent, width=50, height=15)
-        self.payment_listbox.grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky='nsew')
-
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.payment_listbox.yview)
-        scrollbar.grid(row=1, column=2, sticky='ns')
-        self.payment_listbox.configure(yscrollcommand=scrollbar.set)
+        # 기간 필터 (비워두면 제한 없음)
+        range_frame = ttk.Frame(parent)
+        range_frame.grid(row=1, column=0, columnspan=3, sticky='ew', padx=5)
+        ttk.Label(range_frame, text="기간 (YYYY-MM-DD):").pack(side='left', padx=5)
+        self.payment_first_date = ttk.Entry(range_frame, width=12)
+        self.payment_first_date.pack(side='left')
+        ttk.Label(range_frame, text="~").pack(side='left', padx=2)
+        self.payment_last_date = ttk.Entry(range_frame, width=12)
+        self.payment_last_date.pack(side='left')
+        ttk.Button(range_frame, text="조회", command=lambda: self.show_payment_page(0)).pack(side='left', padx=5)
+        
+        # 납부 기록 목록 (행 ID 는 납부 ID, 여러 개 선택 가능)
+        self.payment_tree = ttk.Treeview(parent, columns=('date', 'amount'), show='headings', height=15,
+                                         selectmode='extended')
+        self.payment_tree.heading('date', text='납부일')
+        self.payment_tree.heading('amount', text='금액')
+        self.payment_tree.column('amount', anchor='e')
+        self.payment_tree.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='nsew')
+
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.payment_tree.yview)
+        scrollbar.grid(row=2, column=2, sticky='ns')
+        self.payment_tree.configure(yscrollcommand=scrollbar.set)
+        
+        # 페이지 이동
+        page_frame = ttk.Frame(parent)
+        page_frame.grid(row=3, column=0, columnspan=3, sticky='ew', padx=5)
+        ttk.Button(page_frame, text="◀ 이전",
+                   command=lambda: self.show_payment_page(self.payment_page - 1)).pack(side=tk.LEFT)
+        self.payment_page_label = ttk.Label(page_frame, text="")
+        self.payment_page_label.pack(side=tk.LEFT, expand=True)
+        ttk.Button(page_frame, text="다음 ▶",
+                   command=lambda: self.show_payment_page(self.payment_page + 1)).pack(side=tk.RIGHT)
+        self.payment_page = 0
 
         # 버튼 프레임
         button_frame = ttk.Frame(parent)
-        button_frame.grid(row=2, column=0, columnspan=3, pady=10)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=10)
 
         ttk.Button(button_frame, text="선택한 납부 기록 삭제", style='Danger.TButton', command=self.delete_payment).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="전체 납부 기록 삭제", style='Danger.TButton', command=self.delete_all_payments).pack(side=tk.LEFT, padx=5)
 
         parent.grid_columnconfigure(1, weight=1)
-        parent.grid_rowconfigure(1, weight=1)
+        parent.grid_rowconfigure(2, weight=1)
 
     def update_payment_tenant_list(self, event=None):
         """건물 선택 시 해당 건물의 임대인 목록 업데이트"""
@@ -1266,47 +1327,59 @@ class RentalApp(tk.Tk):
             self.payment_tenant_name['values'] = []
 
     def update_payment_listbox(self, event=None):
-        """임대인 선택 시 해당 임인의 납부 기록 업데이트"""
+        """임대인 선택 시 해당 임대인의 납부 기록 업데이트 (첫 페이지부터)"""
         building_name = self.payment_building_name.get()
         tenant_name = self.payment_tenant_name.get()
         
-        self.payment_listbox.delete(0, tk.END)
-        
         if building_name in self.rental_manager.buildings and tenant_name in self.rental_manager.buildings[building_name]:
-            tenant = self.rental_manager.buildings[building_name][tenant_name]
-            payments = sorted(tenant['payments'], key=lambda x: x['date'])
-            
-            for payment in payments:
-                # 천단위 구분기호 추가하고 정수로 표시
-                self.payment_listbox.insert(tk.END, f"{payment['date']}: {int(payment['amount']):,}원")
+            self.show_payment_page(0)
         else:
+            self.payment_tree.delete(*self.payment_tree.get_children())
             messagebox.showerror("오류", "존재하지 않는 건물 또는 임대인입니다.")
 
+    def show_payment_page(self, page):
+        """날짜순 납부 기록 장부에서 기간에 해당하는 구간을 찾아 page 번째 페이지만 표시"""
+        building_name = self.payment_building_name.get()
+        tenant_name = self.payment_tenant_name.get()
+        if building_name not in self.rental_manager.buildings or tenant_name not in self.rental_manager.buildings[building_name]:
+            return
+        try:
+            first, last = (datetime.strptime(entry.get(), '%Y-%m-%d').date() if entry.get() else None
+                           for entry in (self.payment_first_date, self.payment_last_date))
+        except ValueError:
+            messagebox.showerror("오류", "날짜 형식(YYYY-MM-DD)이 올바르지 않습니다.")
+            return
+        
+        ledger = self.rental_manager.payment_ledger(building_name, tenant_name)
+        start, stop = ledger.locate(first, last)
+        pages = ledger.page_count(start, stop)
+        self.payment_page = min(max(page, 0), pages - 1)
+        
+        self.payment_tree.delete(*self.payment_tree.get_children())
+        for identifier, payment in ledger.page(start, stop, self.payment_page):
+            # 천단위 구분기호 추가하고 정수로 표시
+            self.payment_tree.insert("", "end", iid=identifier, values=(payment['date'], f"{payment['amount']:,}원"))
+        self.payment_page_label.config(
+            text=f"{self.payment_page + 1}/{pages} 페이지 ({stop - start:,}건, {ledger.total(start, stop):,}원)")
+
     def delete_payment(self):
-        """선택한 납부 기록 삭제"""
-        selected_index = self.payment_listbox.curselection()
-        if selected_index:
-            building_name = self.payment_building_name.get()
-            tenant_name = self.payment_tenant_name.get()
-            
-            if building_name in self.rental_manager.buildings and tenant_name in self.rental_manager.buildings[building_name]:
-                tenant = self.rental_manager.buildings[building_name][tenant_name]
-                payments = sorted(tenant['payments'], key=lambda x: x['date'])
-                
-                
-                if 0 <= selected_index[0] < len(payments):
-                    payment_to_delete = payments[selected_index[0]]
-                    tenant['payments'].remove(payment_to_delete)
-                    self.rental_manager.save_data()
-                    self.update_payment_listbox()
-                    self.update_dashboard()
-                    messagebox.showinfo("", "납부 기록이 삭제되었습니다.")
-                else:
-                    messagebox.showerror("오류", "선택한 납부 기록이 없습니다.")
-            else:
-                messagebox.showerror("류", "존재하지 않는 건물 또는 임대인입니다.")
-        else:
+        """선택한 납부 기록 삭제 (여러 개를 선택하면 한 번에 삭제하고 한 번만 저장)"""
+        selected = self.payment_tree.selection()
+        if not selected:
             messagebox.showerror("오류", "납부 기록을 선택해주세요.")
+            return
+        building_name = self.payment_building_name.get()
+        tenant_name = self.payment_tenant_name.get()
+        
+        try:
+            deleted = self.rental_manager.delete_payments(building_name, tenant_name, list(selected))
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            self.show_payment_page(self.payment_page)
+            return
+        self.save_data()
+        self.refresh_tenants([(building_name, tenant_name)])  # 납부 기록 목록도 지금 페이지로 다시 표시
+        messagebox.showinfo("성공", f"납부 기록 {deleted}건이 삭제되었습니다.")
 
     def delete_all_payments(self):
         """전체 납부 기록 제"""
@@ -1314,32 +1387,53 @@ class RentalApp(tk.Tk):
         tenant_name = self.payment_tenant_name.get()
         
         if building_name in self.rental_manager.buildings and tenant_name in self.rental_manager.buildings[building_name]:
-            tenant = self.rental_manager.buildings[building_name][tenant_name]
-            tenant['payments'] = []
-            self.rental_manager.save_data()
+            self.rental_manager.delete_all_payments(building_name, tenant_name)
+            self.save_data()
             self.update_payment_listbox()
             self.update_dashboard()
             messagebox.showinfo("성공", "모든 납부 기록이 삭제되었습니다.")
         else:
             messagebox.showerror("오류", "존재하지 않는 건 또는 임대인입니.")
 
+    @timed('update_dashboard')
     def update_dashboard(self):
         self.update_tenant_listbox()
         self.update_building_listbox()
         self.update_unpaid_tree()
         self.update_stats()
+        self.update_occupancy_tree()
+
+    def update_occupancy_tree(self):
+        """건물별 입주 현황 (계약이 바뀌지 않았으면 캐시된 결과를 그대로 쓴다)"""
+        self.occupancy_tree.delete(*self.occupancy_tree.get_children())
+        for building, occupied, capacity, rate, _, _, lost_rent in occupancy_timeline(self.rental_manager).summary():
+            rate_text = "임대인 없음" if rate is None else f"{rate}%"
+            self.occupancy_tree.insert('', tk.END, values=(building, occupied, capacity, rate_text, f"{lost_rent:,}원"))
 
     def update_tenant_listbox(self):
+        # 행마다 임대인 ID 를 기억해 두고 선택한 임대인은 ID 로 찾는다 (표시 문자열을 나누지 않는다)
         self.tenant_listbox.delete(0, tk.END)
+        self.tenant_listbox_ids = []
         for building, tenants in self.rental_manager.buildings.items():
             for tenant in tenants:
                 self.tenant_listbox.insert(tk.END, f"{building} - {tenant}")
+                self.tenant_listbox_ids.append(self.rental_manager.tenant_id(building, tenant))
 
-    def show_tenant_info(self, event):
+    def selected_tenant(self):
+        """임대인 목록에서 선택한 (건물, 임대인) (선택이 없거나 이미 없는 임대인이면 None)"""
         selected_index = self.tenant_listbox.curselection()
-        if selected_index:
-            selected_tenant = self.tenant_listbox.get(selected_index)
-            building_name, tenant_name = selected_tenant.split(" - ")
+        if not selected_index:
+            return None
+        try:
+            return self.rental_manager.tenant_key(self.tenant_listbox_ids[selected_index[0]])
+        except (IndexError, ValueError):
+            return None
+
+    def show_tenant_info(self, event):
+        selected = self.selected_tenant()
+        if selected:
+            building_name, tenant_name = selected
+            self.info_tenant_id = self.rental_manager.tenant_id(building_name, tenant_name)
             
             tenant_info = self.rental_manager.buildings[building_name][tenant_name]
             info_text = (f"건물: {building_name}\n"
@@ -1369,10 +1463,9 @@ class RentalApp(tk.Tk):
             self.update_override_listbox(building_name, tenant_name)
 
     def edit_tenant(self):
-        selected_index = self.tenant_listbox.curselection()
-        if selected_index:
-            selected_tenant = self.tenant_listbox.get(selected_index)
-            building_name, tenant_name = selected_tenant.split(" - ")
+        selected = self.selected_tenant()
+        if selected:
+            building_name, tenant_name = selected
             
             new_building_name = self.edit_building_name.get()
             new_tenant_name = self.edit_tenant_name.get()
@@ -1384,76 +1477,59 @@ class RentalApp(tk.Tk):
             if new_building_name and new_tenant_name and new_start_date and new_monthly_rent:
                 try:
                     new_start_date = datetime.strptime(new_start_date, '%Y-%m-%d').date()
-                    new_monthly_rent = float(new_monthly_rent)
+                    new_monthly_rent = to_won(new_monthly_rent)
                     if new_contract_end_date:  # contract_enddate -> contract_end_date
                         new_contract_end_date = datetime.strptime(new_contract_end_date, '%Y-%m-%d').date()
                     
-                    if new_building_name != building_name or new_tenant_name != tenant_name:
-                        if new_building_name not in self.rental_manager.buildings:
-                            self.rental_manager.add_building(new_building_name)
-                        
-                        if new_tenant_name in self.rental_manager.buildings[new_building_name]:
-                            messagebox.showerror("오류", "이미 존재하는 임대인 이름입니다.")
-                            return
-                        
-                        tenant_data = self.rental_manager.buildings[building_name].pop(tenant_name)
-                        tenant_data['start_date'] = new_start_date
-                        tenant_data['monthly_rent'] = new_monthly_rent
-                        tenant_data['payment_type'] = new_payment_type
-                        self.rental_manager.buildings[new_building_name][new_tenant_name] = tenant_data
-                        
-                        if not self.rental_manager.buildings[building_name]:
-                            del self.rental_manager.buildings[building_name]
-                    else:
-                        self.rental_manager.buildings[building_name][tenant_name]['start_date'] = new_start_date
-                        self.rental_manager.buildings[building_name][tenant_name]['monthly_rent'] = new_monthly_rent
-                        self.rental_manager.buildings[building_name][tenant_name]['payment_type'] = new_payment_type
-                        
-                    if new_contract_end_date:
-                        self.rental_manager.buildings[new_building_name][new_tenant_name]['contract_end_date'] = new_contract_end_date
-                    elif 'contract_end_date' in self.rental_manager.buildings[new_building_name][new_tenant_name]:
-                        del self.rental_manager.buildings[new_building_name][new_tenant_name]['contract_end_date']
-                    
-                    self.rental_manager.save_data()
-                    self.update_dashboard()
-                    messagebox.showinfo("성공", "임대인 정보가 수정되었습니다.")
                 except ValueError:
                     messagebox.showerror("오류", "날짜 형식(YYYY-MM-DD) 또는 금액이 올바르지 않습니다.")
+                    return
+                
+                try:
+                    self.rental_manager.update_tenant(
+                        building_name, tenant_name, new_building_name, new_tenant_name,
+                        new_start_date, new_monthly_rent, new_payment_type, new_contract_end_date or None
+                    )
+                except ValueError as e:
+                    messagebox.showerror("오류", str(e))
+                    return
+                
+                self.save_data()
+                self.update_dashboard()
+                messagebox.showinfo("성공", "임대인 정보가 수정되었습니다.")
             else:
                 messagebox.showerror("오류", "모든 필드를 입력해주세요.")
 
     def delete_tenant(self):
-        selected_index = self.tenant_listbox.curselection()
-        if selected_index:
-            selected_tenant = self.tenant_listbox.get(selected_index)
-            building_name, tenant_name = selected_tenant.split(" - ")
+        selected = self.selected_tenant()
+        if selected:
+            building_name, tenant_name = selected
             
             if building_name in self.rental_manager.buildings and tenant_name in self.rental_manager.buildings[building_name]:
-                del self.rental_manager.buildings[building_name][tenant_name]
-                if not self.rental_manager.buildings[building_name]:
-                    del self.rental_manager.buildings[building_name]
-                self.rental_manager.save_data()
+                self.rental_manager.delete_tenant(building_name, tenant_name)
+                self.save_data()
                 self.update_dashboard()
                 messagebox.showinfo("성공", "임대인이 삭제되었습니다.")
             else:
                 messagebox.showerror("오류", "존재하지 않는 건물 또는 임대인입니다.")
 
     def update_override_listbox(self, building_name, tenant_name):
+        # 행마다 임대료 수정 월 키를 기억해 두고 삭제할 항목은 키로 찾는다 (표시 문자열을 나누지 않는다)
         self.override_listbox.delete(0, tk.END)
+        self.override_listbox_months = []
         if 'monthly_rent_overrides' in self.rental_manager.buildings[building_name][tenant_name]:
             for date, info in self.rental_manager.buildings[building_name][tenant_name]['monthly_rent_overrides'].items():
-                amount = info['amount'] if isinstance(info, dict) else info
-                note = info.get('note', '') if isinstance(info, dict) else ''
-                display_text = f"{date}: {int(amount):,}원"
+                note = info.get('note', '')
+                display_text = f"{date}: {info['amount']:,}원"
                 if note:
                     display_text += f" ({note})"
                 self.override_listbox.insert(tk.END, display_text)
+                self.override_listbox_months.append(date)
 
     def add_rent_override(self):
-        selected_index = self.tenant_listbox.curselection()
-        if selected_index:
-            selected_tenant = self.tenant_listbox.get(selected_index)
-            building_name, tenant_name = selected_tenant.split(" - ")
+        selected = self.selected_tenant()
+        if selected:
+            building_name, tenant_name = selected
             
             override_date = self.override_date.get()
             override_amount = self.override_amount.get()
@@ -1464,13 +1540,13 @@ class RentalApp(tk.Tk):
                     # YYYY-MM 형식으로 입력받아 날짜 객체로 변환
                     year, month = map(int, override_date.split('-'))
                     override_date = date(year, month, 1)  # 항상 1일로 설정
-                    override_amount = float(override_amount)
+                    override_amount = to_won(override_amount)
                     
                     # 비고와 함께 임대료 수정 정보 저장
                     self.rental_manager.add_monthly_rent_override(
                         building_name, tenant_name, override_date, override_amount, override_note)
                     
-                    self.rental_manager.save_data()
+                    self.save_data()
                     self.update_override_listbox(building_name, tenant_name)
                     self.update_dashboard()
                     messagebox.showinfo("성공", "임대료가 수정되었습니다.")
@@ -1488,25 +1564,20 @@ class RentalApp(tk.Tk):
             return
         
         try:
-            selected_override = self.override_listbox.get(override_selected)
-            
-            # 날짜 추출 (비고가 있는 경우도 처리)
-            date = selected_override.split(": ")[0]
+            date = self.override_listbox_months[override_selected[0]]
             
-            # 현재 선택된 임대인 정보 가져오기
-            tenant_info = self.tenant_info_text.get(1.0, tk.END).strip().split('\n')
-            building_name = tenant_info[0].split(': ')[1]
-            tenant_name = tenant_info[1].split(': ')[1]
+            # 임대인 정보에 표시 중인 임대인 (목록 선택이 풀려도 ID 로 찾는다)
+            building_name, tenant_name = self.rental_manager.tenant_key(self.info_tenant_id)
             
             # 조건문의 괄호 닫기 정
             if ('monthly_rent_overrides' in self.rental_manager.buildings[building_name][tenant_name] and 
                     date in self.rental_manager.buildings[building_name][tenant_name]['monthly_rent_overrides']):
                 
                 # 해당 임대료 수정 삭제
-                del self.rental_manager.buildings[building_name][tenant_name]['monthly_rent_overrides'][date]
+                self.rental_manager.delete_monthly_rent_override(building_name, tenant_name, date)
                 
                 # 데이터 저장 및 화면 갱신
-                self.rental_manager.save_data()
+                self.save_data()
                 self.update_override_listbox(building_name, tenant_name)
                 self.update_dashboard()
                 messagebox.showinfo("성공", "임대료 수정이 삭제되었습니다.")
@@ -1517,10 +1588,9 @@ class RentalApp(tk.Tk):
             messagebox.showerror("오류", f"임대료 수정 삭제 중 오류가 발생했습니다: {str(e)}")
 
     def bulk_increase_rent(self):
-        selected_index = self.tenant_listbox.curselection()
-        if selected_index:
-            selected_tenant = self.tenant_listbox.get(selected_index)
-            building_name, tenant_name = selected_tenant.split(" - ")
+        selected = self.selected_tenant()
+        if selected:
+            building_name, tenant_name = selected
             
             start_date = self.increase_start_date.get()
             increase_amount = self.increase_amount.get()
@@ -1531,7 +1601,7 @@ class RentalApp(tk.Tk):
                     start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
                     increase_amount = float(increase_amount)
                     self.rental_manager.bulk_rent_increase(building_name, tenant_name, start_date, increase_amount, is_percentage)
-                    self.rental_manager.save_data()
+                    self.save_data()
                     self.update_override_listbox(building_name, tenant_name)
                     self.update_dashboard()
                     messagebox.showinfo("성공", "임대료가 일괄 인상되었습니다.")
@@ -1540,35 +1610,151 @@ class RentalApp(tk.Tk):
             else:
                 messagebox.showerror("오류", "모든 필드를 입력해주세요.")
 
+    def edit_rent_range(self):
+        """여러 달, 여러 임대인의 임대료 수정을 한 번에 설정/조정/삭제 (예: 건물 전체 임대료 감면)"""
+        building_name, tenant_name = self.selected_tenant() or (None, None)
+        
+        dialog = tk.Toplevel(self)
+        dialog.title("기간 일괄 임대료 수정")
+        dialog.transient(self)
+        
+        grid = ttk.Frame(dialog)
+        grid.pack(fill='x', padx=10, pady=10)
+        
+        ttk.Label(grid, text="시작월 (YYYY-MM):").grid(row=0, column=0, sticky='w', padx=2, pady=2)
+        first_entry = ttk.Entry(grid, width=12)
+        first_entry.grid(row=0, column=1, sticky='w', padx=2, pady=2)
+        ttk.Label(grid, text="종료월 (YYYY-MM):").grid(row=1, column=0, sticky='w', padx=2, pady=2)
+        last_entry = ttk.Entry(grid, width=12)
+        last_entry.grid(row=1, column=1, sticky='w', padx=2, pady=2)
+        
+        scope = tk.StringVar(value='tenant' if tenant_name else 'all')
+        scope_frame = ttk.LabelFrame(grid, text="대상")
+        scope_frame.grid(row=2, column=0, columnspan=2, sticky='ew', pady=5)
+        if tenant_name:
+            ttk.Radiobutton(scope_frame, text=f"{building_name} - {tenant_name}", variable=scope,
+                            value='tenant').pack(anchor='w', padx=5)
+            ttk.Radiobutton(scope_frame, text=f"{building_name} 전체", variable=scope,
+                            value='building').pack(anchor='w', padx=5)
+        ttk.Radiobutton(scope_frame, text="전체 임대인", variable=scope, value='all').pack(anchor='w', padx=5)
+        
+        action = tk.StringVar(value='set')
+        action_frame = ttk.LabelFrame(grid, text="작업")
+        action_frame.grid(row=3, column=0, columnspan=2, sticky='ew', pady=5)
+        for text, value in (("금액으로 설정", 'set'), ("금액만큼 조정 (감면은 음수)", 'adjust'),
+                            ("비율로 조정 (%, 감면은 음수)", 'percent'), ("임대료 수정 삭제", 'clear')):
+            ttk.Radiobutton(action_frame, text=text, variable=action, value=value).pack(anchor='w', padx=5)
+        
+        ttk.Label(grid, text="금액/비율:").grid(row=4, column=0, sticky='w', padx=2, pady=2)
+        amount_entry = ttk.Entry(grid, width=15)
+        amount_entry.grid(row=4, column=1, sticky='w', padx=2, pady=2)
+        ttk.Label(grid, text="수정 사유:").grid(row=5, column=0, sticky='w', padx=2, pady=2)
+        note_entry = ttk.Entry(grid, width=20)
+        note_entry.grid(row=5, column=1, sticky='w', padx=2, pady=2)
+        
+        def apply():
+            try:
+                first_year, first_month = map(int, first_entry.get().split('-'))
+                last_year, last_month = map(int, last_entry.get().split('-'))
+                first, last = date(first_year, first_month, 1), date(last_year, last_month, 1)
+            except ValueError:
+                messagebox.showerror("오류", "날짜 형식(YYYY-MM)이 올바르지 않습니다.", parent=dialog)
+                return
+            
+            if scope.get() == 'tenant':
+                targets = [(building_name, tenant_name)]
+            elif scope.get() == 'building':
+                targets = [(building_name, tenant) for tenant in self.rental_manager.buildings[building_name]]
+            else:
+                targets = [(building, tenant) for building, tenants in self.rental_manager.buildings.items()
+                           for tenant in tenants]
+            
+            try:
+                if action.get() == 'clear':
+                    changed = self.rental_manager.clear_rent_overrides(targets, first, last)
+                elif action.get() == 'set':
+                    changed = self.rental_manager.set_rent_overrides(
+                        targets, first, last, to_won(amount_entry.get()), note_entry.get())
+                elif action.get() == 'adjust':
+                    changed = self.rental_manager.adjust_rent_overrides(
+                        targets, first, last, to_won(amount_entry.get()), note=note_entry.get())
+                else:
+                    changed = self.rental_manager.adjust_rent_overrides(
+                        targets, first, last, float(amount_entry.get()), is_percentage=True, note=note_entry.get())
+            except ValueError as e:
+                messagebox.showerror("오류", f"임대료 수정 중 오류가 발생했습니다: {str(e)}", parent=dialog)
+                return
+            
+            # 한 번만 저장하고 바뀐 임대인만 화면 갱신
+            self.save_data()
+            self.refresh_tenants(set(changed))
+            dialog.destroy()
+            messagebox.showinfo("성공", f"{len(changed)}명의 임대료 수정을 반영했습니다.")
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="적용", command=apply).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="닫기", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+
     def update_unpaid_tree(self):
+        """미납 목록 다시 그리기 (모델은 바뀐 임대인만 다시 계산하고, 지금 페이지를 유지한다)"""
+        model = unpaid_model(self.rental_manager)
+        self.unpaid_building['values'] = ["전체"] + model.buildings
+        if self.unpaid_building.get() not in model.buildings:
+            self.unpaid_building.set("전체")
+        self.show_unpaid_page(self.unpaid_page)
+
+    def show_unpaid_page(self, page):
+        """필터와 정렬을 모델 배열에 적용하고 page 번째 페이지의 행만 Treeview 에 넣는다"""
+        model = unpaid_model(self.rental_manager)
+        building = self.unpaid_building.get()
+        try:
+            minimum = int(self.unpaid_minimum.get().replace(',', '') or 0)
+        except ValueError:
+            messagebox.showerror("오류", "최소 미납액은 숫자로 입력해주세요.")
+            return
+        column, descending = self.unpaid_sort
+        rows = model.view(column, descending, None if building == "전체" else building, minimum)
+        pages = page_count(rows)
+        self.unpaid_page = min(max(page, 0), pages - 1)
+        self.unpaid_rows = rows
+        
         self.unpaid_tree.delete(*self.unpaid_tree.get_children())
-        today = datetime.now().date()
-        for building, tenants in self.rental_manager.buildings.items():
-            for tenant, info in tenants.items():
-                balance = self.rental_manager.calculate_balance(building, tenant)
-                if balance > 0:
-                    # 천단위 구분기호 추가하고 정수로 표시
-                    self.unpaid_tree.insert("", "end", values=(f"{building} - {tenant}", f"{int(balance):,}원"))
+        for building, tenant, balance, age, score in model.rows(rows, self.unpaid_page):
+            # 천단위 구분기호 추가하고 정수로 표시
+            self.unpaid_tree.insert("", "end", values=(f"{building} - {tenant}", f"{balance:,}원", f"{age:,}일",
+                                                       f"{score:.1f} ({risk_level(score)})"))
+        self.unpaid_page_label.config(
+            text=f"{self.unpaid_page + 1}/{pages} 페이지 ({len(rows):,}명, {model.total(rows):,}원)")
+
+    def sort_unpaid_tree(self, column):
+        """열 제목을 누르면 그 열로, 같은 열을 다시 누르면 반대 순서로 정렬 (첫 페이지부터)"""
+        current, descending = self.unpaid_sort
+        self.unpaid_sort = (column, not descending if column == current else column != 'name')
+        self.show_unpaid_page(0)
+
+    def refresh_tenants(self, targets):
+        """임대인 데이터만 바뀌었을 때 (목록 구성은 그대로) 바뀐 임대인 관련 화면만 갱신"""
+        self.update_unpaid_tree()
+        self.update_stats()
+        if (self.payment_building_name.get(), self.payment_tenant_name.get()) in targets:
+            self.show_payment_page(self.payment_page)
+        selected = self.selected_tenant()
+        if selected in targets:
+            self.update_override_listbox(*selected)
 
     def update_stats(self):
         total_tenants = sum(len(tenants) for tenants in self.rental_manager.buildings.values())  # 괄호 닫기 추가
         self.total_tenants_label.config(text=str(total_tenants))
         
-        monthly_total = 0
-        for building, tenants in self.rental_manager.buildings.items():
-            for tenant, info in tenants.items():
-                monthly_total += info['monthly_rent']
+        monthly_total = self.rental_manager.total_monthly_rent()
         # 천단위 구분기호 추가하고 정수로 표시
         self.monthly_total_label.config(text=f"{int(monthly_total):,}원")
         
-        total_unpaid = 0
-        for building, tenants in self.rental_manager.buildings.items():
-            for tenant, info in tenants.items():
-                balance = self.rental_manager.calculate_balance(building, tenant)
-                if balance > 0:
-                    total_unpaid += balance
+        # 미납 목록 모델의 미납액 합계
+        total_unpaid = unpaid_model(self.rental_manager).total()
         # 천단위 구분기호 추가하고 정수로 표시
-        self.total_unpaid_label.config(text=f"{int(total_unpaid):,}원")
+        self.total_unpaid_label.config(text=f"{total_unpaid:,}원")
 
     def update_report_tenant_list(self, event=None):
         """건물 선택 시 해당 건물의 임대인 목록 업데이트"""
@@ -1595,6 +1781,7 @@ class RentalApp(tk.Tk):
             except Exception as e:
                 messagebox.showerror("오류", f"보고서 생성 중 오류가 발생했습니다: {str(e)}")
 
+    @timed('show_report')
     def show_report(self, building_name, tenant_name):
         """보고서 생성 및 표시"""
         try:
@@ -1615,6 +1802,10 @@ class RentalApp(tk.Tk):
                         row['비고'] if pd.notna(row['비고']) else ''
                     )
                     self.report_tree.insert("", "end", values=values)
+
+            # 그래프 창이 열려 있으면 같은 창에서 선 데이터만 교체
+            if self.graph_window is not None:
+                self.plot_graph(building_name, tenant_name)
         except Exception as e:
             messagebox.showerror("오류", f"보고서 생성 중 오류가 발생했습니다: {str(e)}")
             print(f"보고서 생성 오류 상세: {str(e)}")  # 디버깅을 위한 출력 추가
@@ -1645,14 +1836,6 @@ class RentalApp(tk.Tk):
             return
         
         try:
-            # 현재 트리뷰의 데이터를 데이터프레임으로 변환
-            data = []
-            for item in self.report_tree.get_children():
-                values = self.report_tree.item(item)['values']
-                data.append(values)
-            
-            df = pd.DataFrame(data, columns=['월', '임대료', '납부일자', '납부액', '잔액', '비고'])
-            
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx")],
@@ -1660,36 +1843,103 @@ class RentalApp(tk.Tk):
             )
             
             if file_path:
-                df.to_excel(file_path, index=False)
+                # 트리뷰의 문자열 대신 보고서 모델의 숫자 값을 그대로 저장
+                export_tenant_report(self.rental_manager, building_name, tenant_name, file_path)
                 messagebox.showinfo("성공", "보고서가 엑셀 파일로 저장되었습니다.")
                 
         except Exception as e:
             messagebox.showerror("오류", f"엑셀 저장 중 오류가 발생했습니다: {str(e)}")
 
+    def export_all_to_excel(self):
+        """전체 임대인 보고서를 건물별 시트로 내보내기"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            initialfile=f"전체_임대료납부현황_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+        if not file_path:
+            return
+        
+        def on_done(completed):
+            if completed:
+                messagebox.showinfo("성공", f"전체 보고서가 저장되었습니다.\n저장 위치: {file_path}")
+            else:
+                messagebox.showinfo("안내", "내보내기가 취소되었습니다. 기존 파일은 바뀌지 않았습니다.")
+        
+        # 작업 스레드는 시작 시점의 스냅샷을 읽으므로 내보내는 중에도 편집할 수 있다
+        snapshot = self.rental_manager.snapshot()
+        self.run_in_background(
+            "전체 보고서 내보내기",
+            lambda progress, cancel_event: export_all_reports(snapshot, file_path, progress, cancel_event),
+            on_done
+        )
+
+    def run_in_background(self, title, job, on_done=None):
+        """작업을 별도 스레드에서 실행하고 진행률 창 표시
+
+        job(progress, cancel_event) 는 작업 스레드에서 실행되며,
+        progress(완료 수, 전체 수) 호출로 진행률을 알린다. 결과와 오류는 UI 스레드에서 처리한다.
+        """
+        progress_window = tk.Toplevel(self)
+        progress_window.title(title)
+        progress_window.geometry("360x120")
+        progress_window.resizable(False, False)
+        progress_window.transient(self)
+        
+        status_label = ttk.Label(progress_window, text="준비 중...")
+        status_label.pack(padx=10, pady=(15, 5))
+        progress_bar = ttk.Progressbar(progress_window, mode='determinate', length=320)
+        progress_bar.pack(padx=10, pady=5)
+        
+        cancel_event = threading.Event()
+        ttk.Button(progress_window, text="취소", command=cancel_event.set).pack(pady=5)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel_event.set)
+        
+        events = queue.Queue()
+        
+        def progress(done, total):
+            events.put(('progress', done, total))
+        
+        def worker():
+            try:
+                events.put(('done', job(progress, cancel_event), None))
+            except Exception as e:
+                events.put(('error', e, traceback.format_exc()))
+        
+        def poll():
+            try:
+                while True:
+                    kind, first, second = events.get_nowait()
+                    if kind == 'progress':
+                        progress_bar['maximum'] = max(second, 1)
+                        progress_bar['value'] = first
+                        status_label.config(text=f"{first:,} / {second:,}")
+                    else:
+                        progress_window.destroy()
+                        if kind == 'error':
+                            print(f"{title} 오류 상세: {second}")
+                            messagebox.showerror("오류", f"{title} 중 오류가 발생했습니다: {str(first)}")
+                        elif on_done:
+                            on_done(first)
+                        return
+            except queue.Empty:
+                pass
+            self.after(100, poll)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, poll)
+
     def show_graph(self):
         building_name = self.report_building_name.get()
         tenant_name = self.report_tenant_name.get()
         
         if not building_name or not tenant_name:
-            messagebox.showerror("오류", "건물과 대인을 선택해주세요.")
+            messagebox.showerror("오류", "건물과 임대인을 선택해주세요.")
             return
         
         try:
-            # 현재 트리뷰의 데이터를 데이터프레임으로 변환
-            data = []
-            for item in self.report_tree.get_children():
-                values = self.report_tree.item(item)['values']
-                data.append(values)
-            
-            df = pd.DataFrame(data, columns=['월', '임대료', '납부일자', '납부액', '잔액', '비고'])
-            
-            # 금액 데이터 전처리
-            df['임대료'] = df['임대료'].str.replace('원', '').str.replace(',', '').astype(float)
-            df['납부액'] = df['납부액'].apply(lambda x: 0 if x == '-' else float(x.replace('원', '').replace(',', '')))
-            df['잔액'] = df['잔액'].str.replace('원', '').str.replace(',', '').astype(float)
-            
-            self.plot_graph(df)
-            
+            self.plot_graph(building_name, tenant_name)
+            self.graph_window.lift()
         except Exception as e:
             messagebox.showerror("오류", f"그래프 생성 중 오류가 발생했습니다: {str(e)}")
 
@@ -1701,160 +1951,164 @@ class RentalApp(tk.Tk):
             messagebox.showerror("오류", "건물과 임대인을 선택해주세요.")
             return
         
-        try:
-            # 현재 트리뷰의 데이터를 데이터프레임으로 변환
-            data = []
-            for item in self.report_tree.get_children():
-                values = self.report_tree.item(item)['values']
-                data.append(values)
-            
-            df = pd.DataFrame(data, columns=['월', '임대료', '납부일자', '납부액', '잔액', '비고'])
-            
-            # HTML 스타일 정의
-            html_style = """
-            <style>
-                table { border-collapse: collapse; width: 100%; margin-top: 20px; }
-                th, td { border: 1px solid black; padding: 8px; text-align: right; }
-                th { background-color: #f2f2f2; }
-                .title { text-align: center; font-size: 20px; margin-bottom: 20px; }
-            </style>
-            """
-            
-            # 보고서 제목
-            title = f"<div class='title'>{building_name} - {tenant_name} 임대료 납부현황</div>"
-            
-            # 데이터프레임을 HTML로 변환
-            html_table = df.to_html(classes='table', index=False)
-            
-            # 전체 HTML 문서 생성
-            full_html = f"<html><head><meta charset='utf-8'>{html_style}</head><body>{title}{html_table}</body></html>"
-            
-            self.print_html(full_html)
-            
-        except Exception as e:
-            messagebox.showerror("오류", f"프린트 중 오류가 발생했습니다: {str(e)}")
+        self.print_statements([(building_name, tenant_name)], f"{building_name} - {tenant_name} 임대료 납부현황")
 
-    def plot_graph(self, df):
+    def print_building_report(self):
+        """선택한 건물의 전체 임대인 납부현황 출력"""
+        building_name = self.report_building_name.get()
+        
+        if not building_name:
+            messagebox.showerror("오류", "건물을 선택해주세요.")
+            return
+        
         try:
-            # 한글 폰트 설정
-            plt.rcParams['font.family'] = 'Malgun Gothic'
-            plt.rcParams['axes.unicode_minus'] = False
-            
-            # 새 창 생성
-            graph_window = tk.Toplevel(self)
-            graph_window.title(f"{self.report_building_name.get()} - {self.report_tenant_name.get()} 임대료 납부현황")  # 창 제목 수정
-            graph_window.geometry("1000x700")  # 창 크기 증가
+            targets = building_targets(self.rental_manager, building_name)
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            return
+        
+        if not targets:
+            messagebox.showerror("오류", "선택한 건물에 임대인이 없습니다.")
+            return
+        
+        self.print_statements(targets, f"{building_name} 임대료 납부현황")
 
-            # 그래프 생성
-            fig, ax = plt.subplots(figsize=(12, 7))  # 그래프 크기 증가
-            
-            # x축 데이터 준비
-            x = range(len(df['월']))
-            
-            # 데이터 플로팅
-            line_width = 2
-            marker_size = 8
-            
-            # 임대료 선 그래프
-            rent_line = ax.plot(x, df['임대료'], 
-                              marker='o', 
-                              label='임대료', 
-                              color='#3498db',  # 파란색
-                              linewidth=line_width,
-                              markersize=marker_size,
-                              linestyle='-')
-            
-            # 납부액 선 그래프
-            payment_line = ax.plot(x, df['납부액'], 
-                                 marker='s', 
-                                 label='납부액', 
-                                 color='#2ecc71',  # 초록색
-                                 linewidth=line_width,
-                                 markersize=marker_size,
-                                 linestyle='-')
-            
-            # 잔액 선 그래프
-            balance_line = ax.plot(x, df['잔액'], 
-                                 marker='^', 
-                                 label='잔액', 
-                                 color='#e74c3c',  # 빨간색
-                                 linewidth=line_width,
-                                 markersize=marker_size,
-                                 linestyle='-')
-            
-            # 그래프 스타일링
-            ax.set_title(f'{self.report_building_name.get()} - {self.report_tenant_name.get()}\n임대료 납부현황', 
-                        pad=20, 
-                        fontsize=14, 
-                        fontweight='bold')
-            
-            ax.set_xlabel('월', fontsize=12, labelpad=10)
-            ax.set_ylabel('금액(원)', fontsize=12, labelpad=10)
-            
-            # 그리드 스타일 설정
-            ax.grid(True, linestyle='--', alpha=0.7, color='#ecf0f1')
-            ax.set_axisbelow(True)  # 그리드를 데이터 선 아래로
-            
-            # 범례 설정
-            ax.legend(fontsize=12, 
-                     loc='upper left', 
-                     bbox_to_anchor=(1, 1),
-                     frameon=True,
-                     facecolor='white',
-                     edgecolor='#bdc3c7')
-            
-            # x축 레이블 설정
-            plt.xticks(x, df['월'], rotation=45, ha='right')
-            
-            # y축 눈금 포맷 (천단위 구분기호)
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: format(int(x), ',')))
-            
-            # 배경색 설정
-            ax.set_facecolor('white')
-            fig.patch.set_facecolor('white')
-            
-            # 여백 조정
-            plt.tight_layout()
-            
-            # 그프를 Tkinter 에 삽입
-            canvas = FigureCanvasTkAgg(fig, master=graph_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
-            
-            # 창 크기 조절 가능하도록 설정
-            graph_window.resizable(True, True)
+    def print_statements(self, targets, title):
+        """납부현황 HTML 을 백그라운드에서 생성한 뒤 브라우저로 열기"""
+        file_path = new_print_path(title)
+        
+        def on_done(completed):
+            if completed:
+                self.print_html(file_path)
+        
+        snapshot = self.rental_manager.snapshot()
+        self.run_in_background(
+            "프린트 준비",
+            lambda progress, cancel_event: write_statements(
+                snapshot, targets, file_path, title, progress, cancel_event),
+            on_done
+        )
+
+    def archive_reports(self):
+        """전체 납부현황을 브라우저 없이 HTML 파일로 보관"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".html",
+            filetypes=[("HTML files", "*.html")],
+            initialfile=f"전체_임대료납부현황_{datetime.now().strftime('%Y%m%d')}.html"
+        )
+        if not file_path:
+            return
+        
+        def on_done(completed):
+            if completed:
+                messagebox.showinfo("성공", f"납부현황이 보관되었습니다.\n저장 위치: {file_path}")
+        
+        snapshot = self.rental_manager.snapshot()
+        self.run_in_background(
+            "납부현황 보관",
+            lambda progress, cancel_event: write_statements(
+                snapshot, building_targets(snapshot), file_path,
+                "전체 임대료 납부현황", progress, cancel_event),
+            on_done
+        )
+
+    def plot_graph(self, building_name, tenant_name):
+        """그래프 창에 임대인 데이터 표시 (창이 열려 있으면 재사용)"""
+        if self.graph_window is None or not self.graph_window.is_open():
+            self.graph_window = ReportGraphWindow(self, on_close=self.on_graph_window_closed)
+        
+        labels, rents, paids, balances = report_series(self.rental_manager, building_name, tenant_name)
+        self.graph_window.update(f"{building_name} - {tenant_name}\n임대료 납부현황", labels, rents, paids, balances)
+
+    def on_graph_window_closed(self):
+        self.graph_window = None
+
+    def show_portfolio_graph(self, building_name=None):
+        """전체(또는 건물별) 월별 청구액/납부액/누적 미수금 추이 그래프"""
+        try:
+            labels, dues, paids, outstanding = portfolio_series(self.rental_manager, building_name)
+            if self.portfolio_graph_window is None or not self.portfolio_graph_window.is_open():
+                self.portfolio_graph_window = ReportGraphWindow(self, on_close=self.on_portfolio_graph_window_closed)
             
+            title = f"{building_name or '전체'} 수납 추이"
+            self.portfolio_graph_window.update(title, labels, dues, paids, outstanding)
+            self.portfolio_graph_window.lift()
         except Exception as e:
             messagebox.showerror("오류", f"그래프 생성 중 오류가 발생했습니다: {str(e)}")
-            print(f"그래프 오류 상세: {str(e)}")
 
-    def print_html(self, html):
-        """HTML 문자열을 프린트"""
-        try:
-            # HTML 문열을 임시 파일에 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode='w', encoding='utf-8') as temp:
-                temp.write(html)
-                temp_filename = temp.name
+    def on_portfolio_graph_window_closed(self):
+        self.portfolio_graph_window = None
+
+    def show_forecast(self):
+        """건물별 연간 예상 수입 전망 (가정을 바꾸면 바로 다시 계산)"""
+        dialog = tk.Toplevel(self)
+        dialog.title("임대료 전망")
+        dialog.geometry("820x460")
+        dialog.transient(self)
+        
+        assumption_frame = ttk.LabelFrame(dialog, text="가정")
+        assumption_frame.pack(fill='x', padx=10, pady=(10, 5))
+        fields = (('years', "기간(년)", 5), ('escalation_percent', "인상률(%)", 0),
+                  ('escalation_interval', "인상 주기(개월)", 12), ('renewal_rate', "갱신율(%)", 100),
+                  ('renewal_term', "갱신 기간(개월)", 24), ('collection_rate', "수납률(%)", 100))
+        entries = {}
+        for column, (name, label, default) in enumerate(fields):
+            ttk.Label(assumption_frame, text=label).grid(row=0, column=column, padx=4, pady=(4, 0))
+            entry = ttk.Entry(assumption_frame, width=10)
+            entry.insert(0, str(default))
+            entry.grid(row=1, column=column, padx=4, pady=(0, 4))
+            entries[name] = entry
+        
+        tree = ttk.Treeview(dialog, show='headings')
+        scrollbar = ttk.Scrollbar(dialog, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        def recalculate(event=None):
+            try:
+                values = {name: float(entry.get()) for name, entry in entries.items()}
+                assumptions = Assumptions(**values)
+                # 임대인별 입력은 데이터가 바뀌었을 때만 다시 모은다
+                projection = project(forecast_inputs(self.rental_manager), assumptions)
+            except ValueError as e:
+                messagebox.showerror("오류", f"가정이 올바르지 않습니다: {str(e)}", parent=dialog)
+                return
             
-            # 기본 웹 브라우저로 HTML 파일 열기
-            webbrowser.open('file://' + temp_filename)
+            periods = [month.strftime('%Y-%m~') for month in projection.months[::12]]
+            columns = ('건물', *periods)
+            tree.delete(*tree.get_children())
+            tree['columns'] = columns
+            for column in columns:
+                tree.heading(column, text=column)
+                tree.column(column, width=120 if column == '건물' else 100, anchor='w' if column == '건물' else 'e')
+            yearly = projection.yearly()
+            for building, row in zip(projection.buildings, yearly.tolist()):
+                tree.insert('', tk.END, values=(building, *(f"{value:,}" for value in row)))
+            tree.insert('', tk.END, values=('전체', *(f"{value:,}" for value in yearly.sum(axis=0).tolist())))
+        
+        for entry in entries.values():
+            entry.bind('<Return>', recalculate)
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(5, 10))
+        ttk.Button(button_frame, text="다시 계산", command=recalculate).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="닫기", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=(5, 0))
+        tree.pack(fill=tk.BOTH, expand=True, padx=(10, 0), pady=(5, 0))
+        recalculate()
+
+    def print_html(self, file_path):
+        """생성된 HTML 파일을 브라우저로 열어 프린트"""
+        try:
+            # 기본 웹 브라우저로 HTML 파일 열기 (파일은 cleanup_print_dir 에서 정리)
+            webbrowser.open('file://' + os.path.abspath(file_path))
             
             # 사용자에게 안내 메시지 표시
             messagebox.showinfo("안내", 
                 "브라우저에서 프린트 창이 열렸습니다.\n"
                 "브라우저의 프린트 기능을 사용하여 출력해주세요.\n"
-                "출력이 완료되면 브라우저 창을 닫시면 됩니다.")
+                "출력이 완료되면 브라우저 창을 닫으시면 됩니다.")
                 
         except Exception as e:
             messagebox.showerror("오류", f"프린트 중 오류가 발생했습니다: {str(e)}")
-        finally:
-            # 잠시 대기 후 임 파일 삭제
-            try:
-                time.sleep(1)  # 브라우저가 파일을 읽을 시간을 줌
-                if 'temp_filename' in locals():
-                    os.remove(temp_filename)
-            except:
-                pass  # 파일 삭제 실패 시 무시
 
 if __name__ == "__main__":
     app = RentalApp()
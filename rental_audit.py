@@ -0,0 +1,237 @@
+"""변경 이력(감사 기록)과 시점 조회
+
+RentalManagement 의 모든 변경을 누가/언제/무엇을 했는지와 함께 추가 전용 로그에 남긴다.
+
+    audit/events.jsonl   변경 한 건당 한 줄: 시각, 사용자, 메서드, 인자, 바뀐 임대인 조각 해시
+    audit/index.jsonl    체크포인트 목록: 시각, 전체 데이터 백업 id, 그 뒤 이벤트의 로그 위치
+    audit/store/         임대인 조각과 체크포인트 (rental_backup.BackupStore 형식, 중복 제거)
+
+바뀐 임대인의 변경 후 내용을 조각으로 저장하므로 같은 내용은 한 번만 저장된다.
+특정 시점의 상태는 그 시점 이전의 마지막 체크포인트에서 시작해 로그를 재생해 구하며,
+체크포인트를 CHECKPOINT_INTERVAL 건마다 만들어 재생 길이를 제한한다.
+
+사용 예:
+    audit = AuditLog(audit_dir_for(rental_manager.data_file))
+    audit.attach(rental_manager)
+    audit.state_at(datetime(2024, 3, 1), '영진프라자', '아지트')
+"""
+import getpass
+import json
+import os
+from datetime import date, datetime
+
+from rental_backup import BackupStore, encode_chunk
+from rental_engine import tenant_from_json, tenant_to_json
+
+AUDIT_DIR = 'audit'
+CHECKPOINT_INTERVAL = 1000  # 체크포인트 사이의 최대 이벤트 수
+
+# 인자로 받은 dict/list 가 이보다 크면 내용 대신 항목 수만 기록
+ARG_SUMMARY_LIMIT = 20
+
+
+def audit_dir_for(data_file):
+    """데이터 파일과 같은 폴더의 audit 폴더"""
+    return os.path.join(os.path.dirname(data_file), AUDIT_DIR)
+
+
+def current_user():
+    try:
+        return getpass.getuser()
+    except Exception:
+        return 'unknown'
+
+
+def json_safe(value, depth=0):
+    """메서드 인자를 기록용 JSON 값으로 변환 (큰 데이터는 요약)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        if depth >= 2 or len(value) > ARG_SUMMARY_LIMIT:
+            return f"<{len(value)}개 항목>"
+        if isinstance(value, dict):
+            return {str(key): json_safe(item, depth + 1) for key, item in value.items()}
+        return [json_safe(item, depth + 1) for item in value]
+    return repr(value)
+
+
+class AuditLog:
+    """추가 전용 변경 이력과 체크포인트 기반 시점 조회"""
+
+    def __init__(self, root=AUDIT_DIR, user=None):
+        self.root = root
+        self.events_path = os.path.join(root, 'events.jsonl')
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self.store = BackupStore(os.path.join(root, 'store'))
+        self.user = user or current_user()
+        self.events_since_checkpoint = 0
+
+    def attach(self, rental_manager, checkpoint=True):
+        """변경 기록 시작. checkpoint 이면 현재 상태를 체크포인트로 남긴다 (처음이면 항상)"""
+        os.makedirs(self.root, exist_ok=True)
+        rental_manager.audit = self
+        if checkpoint or not os.path.exists(self.index_path):
+            with rental_manager._lock:
+                self.append_event(rental_manager, 'attach', (), {}, set(), False, force_checkpoint=True)
+        else:
+            # 이전 실행(명령줄 도구 등)이 체크포인트 없이 남긴 이벤트도 간격에 포함한다
+            self.events_since_checkpoint = self.count_events_since_checkpoint()
+
+    def count_events_since_checkpoint(self):
+        """마지막 체크포인트 뒤에 기록된 이벤트 수 (index.jsonl 의 마지막 위치부터 events.jsonl 끝까지)"""
+        if not os.path.exists(self.events_path):
+            return 0
+        index = self.read_index()
+        with open(self.events_path, 'rb') as f:
+            f.seek(index[-1]['offset'] if index else 0)
+            return sum(1 for line in f if line.strip())
+
+    def tenant_digest(self, info):
+        digest, raw = encode_chunk(tenant_to_json(info))
+        self.store.write_object(digest, raw)
+        return digest
+
+    def record(self, rental_manager, operation, args, kwargs, touched, touched_all):
+        """mutation 데코레이터가 변경 직후(쓰기 잠금 안에서) 호출"""
+        try:
+            self.append_event(rental_manager, operation, args, kwargs, touched, touched_all)
+        except OSError as e:
+            # 기록 실패로 사용자의 작업을 되돌리지는 않는다
+            print(f"변경 이력 기록 중 오류 발생: {str(e)}")
+
+    def append_event(self, rental_manager, operation, args, kwargs, touched, touched_all, force_checkpoint=False):
+        now = datetime.now()
+        event = {'time': now.isoformat(), 'user': self.user, 'op': operation, 'args': json_safe(list(args))}
+        if kwargs:
+            event['kwargs'] = json_safe(kwargs)
+
+        buildings = rental_manager.buildings
+        checkpoint = touched_all or force_checkpoint or self.events_since_checkpoint + 1 >= CHECKPOINT_INTERVAL
+        if touched_all:
+            # 전체 교체(불러오기, 초기화, 전체 복원)는 변경 목록 대신 체크포인트로 기록
+            event['replaced'] = True
+            event['changes'] = []
+        else:
+            changes = []
+            for building_name, tenant_name in sorted(touched, key=lambda key: (key[0], key[1] or '')):
+                if tenant_name is None:
+                    tenants = buildings.get(building_name)
+                    changes.append(['building', building_name, None if tenants is None else
+                                    {tenant: self.tenant_digest(info) for tenant, info in tenants.items()}])
+                else:
+                    info = buildings.get(building_name, {}).get(tenant_name)
+                    changes.append(['tenant', building_name, tenant_name,
+                                    None if info is None else self.tenant_digest(info)])
+            event['changes'] = changes
+        if checkpoint:
+            snapshot_id, _ = self.store.create(rental_manager.to_json_data(), 'checkpoint', now)
+            event['checkpoint'] = snapshot_id
+
+        with open(self.events_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+            offset = f.tell()
+
+        if checkpoint:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'time': event['time'], 'snapshot': event['checkpoint'], 'offset': offset},
+                                   ensure_ascii=False) + '\n')
+            self.events_since_checkpoint = 0
+        else:
+            self.events_since_checkpoint += 1
+
+    def read_index(self):
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def iter_events(self, offset=0):
+        """(이벤트, 다음 줄 위치) 를 로그 순서대로"""
+        if not os.path.exists(self.events_path):
+            return
+        with open(self.events_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                if line.strip():
+                    yield json.loads(line), offset
+
+    def history(self, building_name=None, tenant_name=None, since=None, until=None):
+        """조건에 맞는 변경 이벤트 목록 (since/until 은 datetime)"""
+        events = []
+        for event, _ in self.iter_events():
+            when = datetime.fromisoformat(event['time'])
+            if (since and when < since) or (until and when > until):
+                continue
+            if building_name is None or event.get('replaced') \
+                    or any(self.change_matches(change, building_name, tenant_name) for change in event['changes']):
+                events.append(event)
+        return events
+
+    @staticmethod
+    def change_matches(change, building_name, tenant_name):
+        if change[1] != building_name:
+            return False
+        if change[0] == 'building':
+            return tenant_name is None or change[2] is None or tenant_name in change[2]
+        return tenant_name is None or change[2] == tenant_name
+
+    def state_at(self, when, building_name=None, tenant_name=None):
+        """when 시점의 데이터 (JSON 저장 형식). 건물/임대인을 지정하면 그 부분만 재생한다
+
+        when 이전의 마지막 체크포인트에서 시작하므로 재생하는 이벤트 수는 체크포인트 간격으로 제한된다.
+        기록이 시작되기 전 시점이면 ValueError.
+        """
+        checkpoints = [entry for entry in self.read_index() if datetime.fromisoformat(entry['time']) <= when]
+        if not checkpoints:
+            raise ValueError("해당 시점 이전의 변경 이력이 없습니다.")
+        start = checkpoints[-1]
+        data = self.load_checkpoint(start['snapshot'], building_name, tenant_name)
+
+        for event, _ in self.iter_events(start['offset']):
+            if datetime.fromisoformat(event['time']) > when:
+                break
+            if 'checkpoint' in event:
+                data = self.load_checkpoint(event['checkpoint'], building_name, tenant_name)
+                continue
+            for change in event['changes']:
+                if building_name is None or change[1] == building_name:
+                    self.apply_change(data, change, tenant_name)
+        return data
+
+    def load_checkpoint(self, snapshot_id, building_name, tenant_name):
+        try:
+            return self.store.load(snapshot_id, building_name, tenant_name)
+        except ValueError:
+            # 체크포인트 당시 존재하지 않던 건물/임대인
+            return {}
+
+    def apply_change(self, data, change, tenant_name=None):
+        if change[0] == 'building':
+            _, building, tenants = change
+            if tenants is None:
+                data.pop(building, None)
+                return
+            if tenant_name is not None:
+                tenants = {tenant_name: tenants[tenant_name]} if tenant_name in tenants else {}
+                if not tenants:
+                    data.pop(building, None)
+                    return
+            data[building] = {tenant: self.store.read_object(digest) for tenant, digest in tenants.items()}
+        else:
+            _, building, tenant, digest = change
+            if tenant_name is not None and tenant != tenant_name:
+                return
+            if digest is None:
+                data.get(building, {}).pop(tenant, None)
+                if tenant_name is not None and not data.get(building, True):
+                    del data[building]
+            else:
+                data.setdefault(building, {})[tenant] = self.store.read_object(digest)
+
+    def tenant_at(self, when, building_name, tenant_name):
+        """when 시점의 임대인 데이터 (엔진 형식). 없으면 None"""
+        info = self.state_at(when, building_name, tenant_name).get(building_name, {}).get(tenant_name)
+        return None if info is None else tenant_from_json(info)
@@ -0,0 +1,187 @@
+"""중복 제거 백업 저장소
+
+데이터 파일 전체를 복사하는 대신 임대인 한 명의 데이터를 하나의 조각으로 저장한다.
+조각은 내용의 해시(sha256)를 이름으로 zlib 압축해 저장하므로, 바뀌지 않은 임대인은
+여러 백업이 같은 조각을 공유하고 새 백업에는 바뀐 임대인만 추가된다.
+
+    backups/objects/ab/cdef...   임대인 조각 (zlib 압축 JSON)
+    backups/snapshots/<id>.json  백업 목록: 건물 -> 임대인 -> 조각 해시
+
+보관 정책(RETENTION)에 따라 시간/일/월 단위로 최신 백업만 남기고,
+어떤 백업에서도 참조하지 않는 조각은 정리한다.
+"""
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+
+from rental_storage import DataFileLock
+
+BACKUP_DIR = 'backups'
+
+# 단위별로 최근 몇 구간의 최신 백업을 남길지 (가장 최근 백업은 항상 남는다)
+RETENTION = {'hourly': 24, 'daily': 30, 'monthly': 12}
+BUCKET_FORMATS = {'hourly': '%Y%m%d%H', 'daily': '%Y%m%d', 'monthly': '%Y%m'}
+
+SNAPSHOT_ID_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def backup_dir_for(data_file):
+    """데이터 파일과 같은 폴더의 backups 폴더"""
+    return os.path.join(os.path.dirname(data_file), BACKUP_DIR)
+
+
+def encode_chunk(info):
+    """임대인 데이터 -> (해시, 직렬화한 바이트). 같은 내용이면 항상 같은 바이트가 나온다"""
+    raw = json.dumps(info, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest(), raw
+
+
+class BackupStore:
+    """임대인 단위로 중복을 제거하는 백업 저장소"""
+
+    def __init__(self, root=BACKUP_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+
+    def lock(self):
+        # 백업 생성과 정리가 동시에 실행되면 방금 공유한 조각이 지워질 수 있다
+        os.makedirs(self.root, exist_ok=True)
+        return DataFileLock(os.path.join(self.root, 'store'))
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def write_object(self, digest, raw):
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(zlib.compress(raw))
+        os.replace(temp_path, path)
+        return True
+
+    def read_object(self, digest):
+        with open(self.object_path(digest), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+    def create(self, data, label='backup', now=None):
+        """JSON 저장 형식의 데이터로 백업 생성. (백업 id, 새로 저장한 조각 수) 를 돌려준다"""
+        now = now or datetime.now()
+        with self.lock():
+            buildings = {}
+            written = 0
+            for building, tenants in data.items():
+                buildings[building] = {}
+                for tenant, info in tenants.items():
+                    digest, raw = encode_chunk(info)
+                    written += self.write_object(digest, raw)
+                    buildings[building][tenant] = digest
+
+            os.makedirs(self.snapshots_dir, exist_ok=True)
+            snapshot_id = now.strftime(SNAPSHOT_ID_FORMAT)
+            suffix = 2
+            while os.path.exists(self.manifest_path(snapshot_id)):
+                snapshot_id = f"{now.strftime(SNAPSHOT_ID_FORMAT)}_{suffix}"
+                suffix += 1
+            manifest = {'created': now.isoformat(timespec='seconds'), 'label': label, 'buildings': buildings}
+            temp_path = self.manifest_path(snapshot_id) + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(temp_path, self.manifest_path(snapshot_id))
+        return snapshot_id, written
+
+    def manifest_path(self, snapshot_id):
+        return os.path.join(self.snapshots_dir, snapshot_id + '.json')
+
+    def read_manifest(self, snapshot_id):
+        try:
+            with open(self.manifest_path(snapshot_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"존재하지 않는 백업입니다: {snapshot_id}")
+
+    def list_snapshots(self):
+        """[(백업 id, 생성 시각, 설명, 건물 수, 임대인 수)] 최신순"""
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        snapshots = []
+        for name in os.listdir(self.snapshots_dir):
+            if not name.endswith('.json'):
+                continue
+            snapshot_id = name[:-len('.json')]
+            manifest = self.read_manifest(snapshot_id)
+            snapshots.append((
+                snapshot_id,
+                datetime.fromisoformat(manifest['created']),
+                manifest.get('label', ''),
+                len(manifest['buildings']),
+                sum(len(tenants) for tenants in manifest['buildings'].values()),
+            ))
+        snapshots.sort(key=lambda snapshot: (snapshot[1], snapshot[0]), reverse=True)
+        return snapshots
+
+    def load(self, snapshot_id, building_name=None, tenant_name=None):
+        """백업 내용을 JSON 저장 형식으로 읽기
+
+        건물이나 임대인을 지정하면 그 부분의 조각만 읽는다.
+        """
+        buildings = self.read_manifest(snapshot_id)['buildings']
+        if building_name is not None:
+            if building_name not in buildings:
+                raise ValueError("백업에 존재하지 않는 건물입니다.")
+            buildings = {building_name: buildings[building_name]}
+            if tenant_name is not None:
+                if tenant_name not in buildings[building_name]:
+                    raise ValueError("백업에 존재하지 않는 임대인입니다.")
+                buildings = {building_name: {tenant_name: buildings[building_name][tenant_name]}}
+        return {building: {tenant: self.read_object(digest) for tenant, digest in tenants.items()}
+                for building, tenants in buildings.items()}
+
+    def prune(self, retention=None):
+        """보관 정책에 따라 오래된 백업과 참조되지 않는 조각 삭제. (삭제한 백업 수, 삭제한 조각 수)"""
+        retention = RETENTION if retention is None else retention
+        with self.lock():
+            snapshots = self.list_snapshots()
+            if not snapshots:
+                return 0, 0
+            keep = {snapshots[0][0]}
+            for unit, count in retention.items():
+                buckets = set()
+                for snapshot_id, created, *_ in snapshots:
+                    bucket = created.strftime(BUCKET_FORMATS[unit])
+                    if bucket in buckets:
+                        continue
+                    if len(buckets) >= count:
+                        break
+                    buckets.add(bucket)
+                    keep.add(snapshot_id)
+
+            removed = 0
+            for snapshot_id, *_ in snapshots:
+                if snapshot_id not in keep:
+                    os.remove(self.manifest_path(snapshot_id))
+                    removed += 1
+            return removed, self.collect_garbage(keep)
+
+    def collect_garbage(self, snapshot_ids):
+        """남은 백업 어디에서도 참조하지 않는 조각 삭제"""
+        referenced = set()
+        for snapshot_id in snapshot_ids:
+            for tenants in self.read_manifest(snapshot_id)['buildings'].values():
+                referenced.update(tenants.values())
+
+        removed = 0
+        if not os.path.isdir(self.objects_dir):
+            return removed
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if prefix + name not in referenced:
+                    os.remove(os.path.join(prefix_dir, name))
+                    removed += 1
+        return removed
@@ -0,0 +1,80 @@
+"""월 계산용 달력 표
+
+월을 정수 번호(연*12 + 월 - 1)로 다루고, 지원 범위(FIRST_YEAR~LAST_YEAR)의 월마다
+1일 날짜, 1일의 서수(date.toordinal), 일수, 'YYYY-MM-01' 키를 미리 만들어 둔다.
+임대료 누적, 일할 계산, 보고서는 반복문 안에서 date 객체를 만들지 않고 번호로 표를 조회한다.
+
+    index = month_index(tenant['start_date'])
+    for index in month_range(index, month_index(today)):
+        month_start(index), days_in_month(index), month_key(index)
+
+지원 범위 밖의 월은 표 대신 그때그때 계산한다.
+"""
+import calendar
+from datetime import date
+
+FIRST_YEAR = 1970
+LAST_YEAR = 2100
+FIRST_INDEX = FIRST_YEAR * 12
+
+MONTH_STARTS = []          # 월 1일 (date)
+MONTH_START_ORDINALS = []  # 월 1일의 서수
+MONTH_DAYS = []            # 월 일수
+MONTH_KEYS = []            # 'YYYY-MM-01' (임대료 수정 키)
+
+for _year in range(FIRST_YEAR, LAST_YEAR + 1):
+    for _month in range(1, 13):
+        _start = date(_year, _month, 1)
+        MONTH_STARTS.append(_start)
+        MONTH_START_ORDINALS.append(_start.toordinal())
+        MONTH_DAYS.append(calendar.monthrange(_year, _month)[1])
+        MONTH_KEYS.append(_start.isoformat())
+del _year, _month, _start
+
+LAST_INDEX = FIRST_INDEX + len(MONTH_STARTS) - 1
+
+
+def month_index(day):
+    """날짜가 속한 월의 번호 (연*12 + 월 - 1)"""
+    return day.year * 12 + day.month - 1
+
+
+def key_index(key):
+    """임대료 수정 키 ('YYYY-MM-01')의 월 번호
+
+    1일이 아닌 이전 형식의 키('YYYY-MM-15' 등)는 어느 달에도 적용되지 않으므로 None
+    (get_monthly_rent 와 컴파일된 스냅샷의 규칙과 같다).
+    """
+    if key[8:10] != '01':
+        return None
+    return int(key[:4]) * 12 + int(key[5:7]) - 1
+
+
+def month_range(first, last):
+    """first 부터 last 까지(포함)의 월 번호"""
+    return range(first, last + 1)
+
+
+def month_start(index):
+    if FIRST_INDEX <= index <= LAST_INDEX:
+        return MONTH_STARTS[index - FIRST_INDEX]
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start_ordinal(index):
+    if FIRST_INDEX <= index <= LAST_INDEX:
+        return MONTH_START_ORDINALS[index - FIRST_INDEX]
+    return month_start(index).toordinal()
+
+
+def days_in_month(index):
+    if FIRST_INDEX <= index <= LAST_INDEX:
+        return MONTH_DAYS[index - FIRST_INDEX]
+    return calendar.monthrange(index // 12, index % 12 + 1)[1]
+
+
+def month_key(index):
+    """임대료 수정 키 ('YYYY-MM-01')"""
+    if FIRST_INDEX <= index <= LAST_INDEX:
+        return MONTH_KEYS[index - FIRST_INDEX]
+    return month_start(index).isoformat()
@@ -0,0 +1,533 @@
+"""임대료 관리 명령줄 도구
+
+GUI 없이 납부 기록 가져오기, 잔액 계산, 보고서 내보내기, 알림 확인을 실행한다.
+tkinter/matplotlib 를 불러오지 않으므로 서버의 cron 배치 작업에서 사용할 수 있다.
+
+사용 예:
+    python rental_cli.py balances --unpaid-only --format csv
+    python rental_cli.py aging --building 영진프라자
+    python rental_cli.py forecast --years 5 --escalation 5 --escalation-interval 24 --renewal-rate 80
+    python rental_cli.py occupancy --monthly --building 영진프라자
+    python rental_cli.py risk --min-score 40
+    python rental_cli.py import-payments payments.csv
+    python rental_cli.py migrate-amounts --dry-run
+    python rental_cli.py export-report --format xlsx --output report.xlsx
+    python rental_cli.py notify --days 30 --exit-code
+    python rental_cli.py serve --port 8765
+    python rental_cli.py backup create
+    python rental_cli.py backup restore 20240101_090000 --building 영진프라자
+    python rental_cli.py history --building 영진프라자 --tenant 아지트
+    python rental_cli.py state-at 2024-03-01 --building 영진프라자 --tenant 아지트
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+
+from rental_allocation import AGING_LABELS
+from rental_engine import DATA_FILE, RentalManagement
+
+OUTPUT_FORMATS = ('table', 'json', 'csv')
+
+# CSV 헤더 별칭 (영문/한글 모두 허용)
+PAYMENT_COLUMNS = {
+    'building': ('building', '건물', '건물 이름'),
+    'tenant': ('tenant', '임대인', '임대인 이름'),
+    'date': ('date', '납부일', '납부일자'),
+    'amount': ('amount', '납부액'),
+}
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_ALERTS = 3
+
+
+def load_manager(args, audit=False):
+    """데이터 파일 로드 (로드 중 진행 메시지는 표준 오류로 보낸다)
+
+    audit 이면 이후 변경을 변경 이력에 기록한다.
+    """
+    rental_manager = RentalManagement(args.data)
+    with contextlib.redirect_stdout(sys.stderr if args.verbose else io.StringIO()):
+        rental_manager.load_data()
+    if audit:
+        audit_log(args).attach(rental_manager, checkpoint=False)
+    return rental_manager
+
+
+def audit_log(args):
+    from rental_audit import AuditLog, audit_dir_for
+    return AuditLog(audit_dir_for(args.data))
+
+
+def write_rows(rows, columns, fmt, output=None):
+    """행 목록을 table/json/csv 형식으로 출력"""
+    out = open(output, 'w', encoding='utf-8', newline='') if output else sys.stdout
+    try:
+        if fmt == 'json':
+            json.dump([dict(zip(columns, row)) for row in rows], out, ensure_ascii=False, indent=2)
+            out.write('\n')
+        elif fmt == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        else:
+            cells = [[str(value) for value in row] for row in rows]
+            widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+            out.write('  '.join(column.ljust(width) for column, width in zip(columns, widths)).rstrip() + '\n')
+            for row in cells:
+                out.write('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip() + '\n')
+    finally:
+        if output:
+            out.close()
+
+
+def resolve_columns(fieldnames):
+    """CSV 헤더에서 필요한 열 이름 찾기"""
+    found = {}
+    for key, aliases in PAYMENT_COLUMNS.items():
+        for name in fieldnames or []:
+            if name.strip().lower() in aliases:
+                found[key] = name
+                break
+        else:
+            raise ValueError(f"CSV 파일에 '{aliases[0]}' 열이 없습니다.")
+    return found
+
+
+def cmd_import_payments(args):
+    rental_manager = load_manager(args, audit=not args.dry_run)
+    payments = []
+    line_numbers = []
+    errors = []
+
+    with open(args.file, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = resolve_columns(reader.fieldnames)
+        for row in reader:
+            # 열이 모자란 행은 빈 열이 None 이고, 남는 행은 None 키에 나머지 값이 담긴다 (끝의 빈 열은 허용)
+            if None in row.values() or any(value.strip() for value in row.get(None, ())):
+                errors.append((reader.line_num, f"열 수가 헤더({len(reader.fieldnames)}개)와 다릅니다."))
+                continue
+            payments.append((
+                row[columns['building']].strip(),
+                row[columns['tenant']].strip(),
+                row[columns['date']].strip(),
+                row[columns['amount']].replace(',', '').strip()
+            ))
+            line_numbers.append(reader.line_num)
+
+    # 파일 하나를 한 번의 변경으로 가져와 변경 이력에 이벤트 하나만 남긴다
+    failed = rental_manager.add_payments(payments) if payments else []
+    errors.extend((line_numbers[index], message) for index, message in failed)
+    imported = len(payments) - len(failed)
+
+    for line_no, message in sorted(errors):
+        print(f"{args.file}:{line_no}: {message}", file=sys.stderr)
+
+    if args.dry_run:
+        print(f"{imported}건 확인 (저장하지 않음), 오류 {len(errors)}건", file=sys.stderr)
+    else:
+        if imported:
+            rental_manager.save_data()
+        print(f"{imported}건 가져옴, 오류 {len(errors)}건", file=sys.stderr)
+    return EXIT_ERROR if errors else EXIT_OK
+
+
+def stored_amounts(data):
+    """JSON 저장 형식 데이터의 모든 금액 (월 임대료, 납부액, 임대료 수정)"""
+    for tenants in data.values():
+        for info in (tenants.values() if isinstance(tenants, dict) else ()):
+            yield info['monthly_rent']
+            for payment in info.get('payments', []):
+                yield payment['amount']
+            for value in info.get('monthly_rent_overrides', {}).values():
+                yield value['amount'] if isinstance(value, dict) else value
+
+
+def cmd_migrate_amounts(args):
+    """실수로 저장된 금액을 원 단위 정수로 바꿔 저장 (원 미만은 rental_money.to_won 규칙으로 반올림)"""
+    from rental_money import exact_amount, to_won
+    from rental_storage import read_json
+    amounts = [amount for amount in stored_amounts(read_json(args.data)) if not isinstance(amount, int)]
+    # 1000.0 이나 '1,000' 처럼 값이 그대로인 금액은 형식만 바뀌므로 반올림으로 세지 않는다
+    rounded = [amount for amount in amounts if to_won(amount) != exact_amount(amount)]
+    for amount in rounded:
+        print(f"반올림: {amount} -> {to_won(amount)}", file=sys.stderr)
+
+    if args.dry_run:
+        print(f"정수로 바꿀 금액 {len(amounts)}개, 그중 원 미만 반올림 {len(rounded)}개 (저장하지 않음)", file=sys.stderr)
+    else:
+        rental_manager = load_manager(args, audit=True)
+        rental_manager.save_data()
+        print(f"금액 {len(amounts)}개를 정수로 저장, 그중 원 미만 반올림 {len(rounded)}개", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_balances(args):
+    rental_manager = load_manager(args)
+    if args.building and args.building not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+
+    rows = []
+    for building, tenants in rental_manager.buildings.items():
+        if args.building and building != args.building:
+            continue
+        for tenant_name, tenant in tenants.items():
+            balance = rental_manager.calculate_balance(building, tenant_name)
+            if args.unpaid_only and balance <= 0:
+                continue
+            rows.append((building, tenant_name, int(tenant['monthly_rent']), int(balance)))
+
+    write_rows(rows, ('building', 'tenant', 'monthly_rent', 'balance'), args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_aging(args):
+    """미납 임대인의 미납액을 경과 기간별로 출력 (납부는 가장 오래된 미납월부터 배분)"""
+    rental_manager = load_manager(args)
+    if args.building and args.building not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+
+    rows = []
+    for building, tenants in rental_manager.buildings.items():
+        if args.building and building != args.building:
+            continue
+        for tenant_name in tenants:
+            buckets = rental_manager.aging(building, tenant_name)
+            total = sum(buckets.values())
+            if total > 0:
+                rows.append((building, tenant_name, *(int(buckets[label]) for label in AGING_LABELS), int(total)))
+
+    write_rows(rows, ('building', 'tenant', *AGING_LABELS, 'total'), args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_forecast(args):
+    """건물별 예상 수입 전망 (연 단위, --monthly 이면 월 단위)"""
+    from rental_forecast import Assumptions, forecast_inputs, project
+    rental_manager = load_manager(args)
+    if args.building and args.building not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+
+    projection = project(forecast_inputs(rental_manager),
+                         Assumptions(args.years, args.escalation, args.escalation_interval, args.renewal_rate,
+                                     args.renewal_term, args.collection_rate))
+    months = projection.months
+    if args.monthly:
+        periods, values = [month.strftime('%Y-%m') for month in months], projection.expected
+    else:
+        periods, values = [month.strftime('%Y-%m') for month in months[::12]], projection.yearly()
+
+    rows = []
+    for building, building_values in zip(projection.buildings, values.tolist()):
+        if args.building and building != args.building:
+            continue
+        rows.extend((building, period, value) for period, value in zip(periods, building_values))
+    if not args.building:
+        rows.extend(('전체', period, value) for period, value in zip(periods, values.sum(axis=0).tolist()))
+
+    write_rows(rows, ('building', 'period', 'expected'), args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_occupancy(args):
+    """건물별 입주 현황 (--monthly 이면 월별 입주 수와 공실 손실 추정)"""
+    from rental_occupancy import occupancy_timeline
+    rental_manager = load_manager(args)
+    if args.building and args.building not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+
+    timeline = occupancy_timeline(rental_manager)
+    if args.monthly:
+        rows = [(building, month.strftime('%Y-%m'), occupied, rent, vacant, lost_rent)
+                for building in timeline.buildings if not args.building or building == args.building
+                for month, occupied, rent, vacant, lost_rent in timeline.series(building)]
+        columns = ('building', 'month', 'occupied', 'rent', 'vacant', 'lost_rent')
+    else:
+        rows = [row for row in timeline.summary() if not args.building or row[0] == args.building]
+        columns = ('building', 'occupied', 'capacity', 'occupancy_rate', 'tenant_months', 'rent_months', 'lost_rent')
+
+    write_rows(rows, columns, args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_risk(args):
+    """임대인별 연체 위험 점수와 납부 습관 (점수가 높은 순)"""
+    from rental_risk import risk_book, risk_level
+    rental_manager = load_manager(args)
+    if args.building and args.building not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+
+    book = risk_book(rental_manager)
+    rows = []
+    for score, building, tenant_name in book.ranked(args.min_score):
+        if args.building and building != args.building:
+            continue
+        details = book.details(building, tenant_name)
+        rows.append((building, tenant_name, score, risk_level(score), round(details['days_late'], 1),
+                     int(details['missed']), round(details['partial'], 2), round(details['trend'], 1)))
+
+    write_rows(rows, ('building', 'tenant', 'score', 'level', 'days_late', 'missed_months', 'partial_ratio', 'trend'),
+               args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_export_report(args):
+    rental_manager = load_manager(args)
+    from rental_print import building_targets
+
+    if args.tenant:
+        if not args.building:
+            raise ValueError("임대인을 지정하려면 건물도 지정해야 합니다.")
+        targets = [(args.building, args.tenant)]
+    else:
+        targets = building_targets(rental_manager, args.building)
+
+    if args.format == 'xlsx':
+        from rental_export import export_all_reports, export_tenant_report
+        if args.tenant:
+            export_tenant_report(rental_manager, args.building, args.tenant, args.output)
+        else:
+            export_all_reports(rental_manager, args.output, building_name=args.building)
+    elif args.format == 'html':
+        from rental_print import write_statements
+        write_statements(rental_manager, targets, args.output)
+    else:
+        rows = []
+        for building, tenant_name in targets:
+            for month, rent, paid_date, paid, balance, note in rental_manager.iter_report_rows(building, tenant_name):
+                rows.append((building, tenant_name, month.strftime('%Y-%m'), int(rent),
+                             paid_date.isoformat() if paid_date else '', int(paid), int(balance), note))
+        write_rows(rows, ('building', 'tenant', 'month', 'rent', 'paid_date', 'paid', 'balance', 'note'),
+                   args.format, args.output)
+
+    if args.output:
+        print(f"{len(targets)}명의 보고서를 {args.output}에 저장했습니다.", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_notify(args):
+    rental_manager = load_manager(args)
+    rows = [(building, tenant_name, days_to_expiry, int(balance))
+            for building, tenant_name, days_to_expiry, balance in rental_manager.find_expiring_unpaid(args.days)]
+    write_rows(rows, ('building', 'tenant', 'days_to_expiry', 'balance'), args.format, args.output)
+    return EXIT_ALERTS if rows and args.exit_code else EXIT_OK
+
+
+def backup_store(args):
+    from rental_backup import BackupStore, backup_dir_for
+    return BackupStore(args.backup_dir or backup_dir_for(args.data))
+
+
+def cmd_backup_create(args):
+    rental_manager = load_manager(args)
+    store = backup_store(args)
+    snapshot_id, written = store.create(rental_manager.to_json_data(), args.label)
+    print(f"백업 {snapshot_id} 생성 (새 조각 {written}개)", file=sys.stderr)
+    if not args.no_prune:
+        removed, objects = store.prune()
+        print(f"오래된 백업 {removed}개, 조각 {objects}개 정리", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_backup_list(args):
+    rows = [(snapshot_id, created.isoformat(sep=' '), label, buildings, tenants)
+            for snapshot_id, created, label, buildings, tenants in backup_store(args).list_snapshots()]
+    write_rows(rows, ('id', 'created', 'label', 'buildings', 'tenants'), args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_backup_restore(args):
+    if args.tenant and not args.building:
+        raise ValueError("임대인을 지정하려면 건물도 지정해야 합니다.")
+    rental_manager = load_manager(args, audit=True)
+    store = backup_store(args)
+    data = store.load(args.snapshot, args.building, args.tenant)
+    snapshot_id, _ = store.create(rental_manager.to_json_data(), "복원 전")
+    rental_manager.restore_json_data(data, args.building, args.tenant)
+    rental_manager.save_data(force=args.building is None)
+    print(f"백업 {args.snapshot} 복원 (이전 데이터는 백업 {snapshot_id})", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_backup_prune(args):
+    removed, objects = backup_store(args).prune()
+    print(f"오래된 백업 {removed}개, 조각 {objects}개 정리", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_history(args):
+    if args.tenant and not args.building:
+        raise ValueError("임대인을 지정하려면 건물도 지정해야 합니다.")
+    events = audit_log(args).history(args.building, args.tenant, args.since, args.until)
+    rows = [(event['time'], event['user'], event['op'],
+             ', '.join(str(arg) for arg in event['args'])) for event in events]
+    write_rows(rows, ('time', 'user', 'op', 'args'), args.format, args.output)
+    return EXIT_OK
+
+
+def cmd_state_at(args):
+    if args.tenant and not args.building:
+        raise ValueError("임대인을 지정하려면 건물도 지정해야 합니다.")
+    data = audit_log(args).state_at(args.when, args.building, args.tenant)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        json.dump(data, out, ensure_ascii=False, indent=2)
+        out.write('\n')
+    finally:
+        if args.output:
+            out.close()
+    return EXIT_OK
+
+
+def parse_time(value):
+    """YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM[:SS] (날짜만 쓰면 그날의 끝)"""
+    when = datetime.fromisoformat(value)
+    if len(value) == 10:
+        when = when.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return when
+
+
+def cmd_serve(args):
+    from rental_api import serve
+    import asyncio
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.data, args.host, args.port, not args.no_save))
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='rental_cli', description="임대료 관리 명령줄 도구")
+    parser.add_argument('--data', default=DATA_FILE, help=f"데이터 파일 경로 (기본값: {DATA_FILE})")
+    parser.add_argument('-v', '--verbose', action='store_true', help="데이터 로드 메시지를 표준 오류로 출력")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('import-payments', help="CSV 파일에서 납부 기록 가져오기")
+    p.add_argument('file', help="building,tenant,date,amount (또는 건물,임대인,납부일,납부액) 열을 가진 CSV")
+    p.add_argument('--dry-run', action='store_true', help="검사만 하고 저장하지 않음")
+    p.set_defaults(func=cmd_import_payments)
+
+    p = subparsers.add_parser('migrate-amounts', help="실수로 저장된 금액을 원 단위 정수로 변환")
+    p.add_argument('--dry-run', action='store_true', help="검사만 하고 저장하지 않음")
+    p.set_defaults(func=cmd_migrate_amounts)
+
+    p = subparsers.add_parser('balances', help="임대인별 잔액 계산")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--unpaid-only', action='store_true', help="미납 임대인만 출력")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_balances)
+
+    p = subparsers.add_parser('aging', help="미납액 경과 기간별 집계")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_aging)
+
+    p = subparsers.add_parser('forecast', help="건물별 예상 수입 전망 (numpy 필요)")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--years', type=int, default=5, help="전망 기간 (년, 기본값: 5)")
+    p.add_argument('--escalation', type=float, default=0, help="인상률 (%%, 기본값: 0)")
+    p.add_argument('--escalation-interval', type=int, default=12, help="인상 주기 (개월, 기본값: 12)")
+    p.add_argument('--renewal-rate', type=float, default=100, help="계약 만료 때 갱신율 (%%, 기본값: 100)")
+    p.add_argument('--renewal-term', type=int, default=24, help="갱신 계약 기간 (개월, 기본값: 24)")
+    p.add_argument('--collection-rate', type=float, default=100, help="수납률 (%%, 기본값: 100)")
+    p.add_argument('--monthly', action='store_true', help="연 단위 대신 월 단위로 출력")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_forecast)
+
+    p = subparsers.add_parser('occupancy', help="건물별 입주/공실 현황")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--monthly', action='store_true', help="월별 추이 출력")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_occupancy)
+
+    p = subparsers.add_parser('risk', help="임대인별 연체 위험 점수 (numpy 필요)")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--min-score', type=float, default=0, help="이 점수 이상만 출력 (기본값: 0)")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_risk)
+
+    p = subparsers.add_parser('export-report', help="납부현황 보고서 내보내기")
+    p.add_argument('--building', help="건물 이름 (기본값: 전체)")
+    p.add_argument('--tenant', help="임대인 이름")
+    p.add_argument('--format', choices=OUTPUT_FORMATS + ('xlsx', 'html'), default='csv')
+    p.add_argument('--output', help="출력 파일 (xlsx/html 은 필수)")
+    p.set_defaults(func=cmd_export_report)
+
+    p = subparsers.add_parser('notify', help="미납 상태로 계약 만료가 임박한 임대인 확인")
+    p.add_argument('--days', type=int, default=30, help="만료까지 남은 일수 기준 (기본값: 30)")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.add_argument('--exit-code', action='store_true', help=f"알림이 있으면 종료 코드 {EXIT_ALERTS} 반환")
+    p.set_defaults(func=cmd_notify)
+
+    p = subparsers.add_parser('history', help="변경 이력 조회")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--tenant', help="임대인 이름 (--building 필요)")
+    p.add_argument('--since', type=parse_time, help="이 시각 이후 (YYYY-MM-DD[THH:MM])")
+    p.add_argument('--until', type=parse_time, help="이 시각 이전 (YYYY-MM-DD[THH:MM])")
+    p.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_history)
+
+    p = subparsers.add_parser('state-at', help="특정 시점의 데이터를 JSON 으로 출력")
+    p.add_argument('when', type=parse_time, help="시점 (YYYY-MM-DD 는 그날의 끝)")
+    p.add_argument('--building', help="건물 이름")
+    p.add_argument('--tenant', help="임대인 이름 (--building 필요)")
+    p.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    p.set_defaults(func=cmd_state_at)
+
+    p = subparsers.add_parser('serve', help="로컬 HTTP/JSON API 서비스 실행")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--no-save', action='store_true', help="변경 내용을 파일에 저장하지 않음")
+    p.set_defaults(func=cmd_serve)
+
+    p = subparsers.add_parser('backup', help="중복 제거 백업 생성/목록/복원/정리")
+    p.add_argument('--backup-dir', help="백업 폴더 (기본값: 데이터 파일 옆의 backups)")
+    backup_commands = p.add_subparsers(dest='backup_command', required=True)
+
+    q = backup_commands.add_parser('create', help="현재 데이터 백업")
+    q.add_argument('--label', default="수동 백업", help="백업 설명")
+    q.add_argument('--no-prune', action='store_true', help="보관 정책에 따른 정리를 하지 않음")
+    q.set_defaults(func=cmd_backup_create)
+
+    q = backup_commands.add_parser('list', help="백업 목록")
+    q.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    q.add_argument('--output', help="출력 파일 (기본값: 표준 출력)")
+    q.set_defaults(func=cmd_backup_list)
+
+    q = backup_commands.add_parser('restore', help="백업 복원 (전체 또는 건물/임대인 하나)")
+    q.add_argument('snapshot', help="백업 id (backup list 로 확인)")
+    q.add_argument('--building', help="이 건물만 복원")
+    q.add_argument('--tenant', help="이 임대인만 복원 (--building 필요)")
+    q.set_defaults(func=cmd_backup_restore)
+
+    q = backup_commands.add_parser('prune', help="보관 정책에 따라 오래된 백업 정리")
+    q.set_defaults(func=cmd_backup_prune)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'export-report' and args.format in ('xlsx', 'html') and not args.output:
+        parser.error("xlsx/html 형식은 --output 이 필요합니다.")
+    try:
+        return args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1049 @@
+"""임대료 관리 엔진
+
+건물/임대인/납부 기록 데이터와 잔액, 보고서 계산을 담당한다.
+GUI(tkinter) 와 독립적이므로 명령줄 도구나 배치 작업에서도 그대로 사용할 수 있다.
+"""
+import functools
+import json
+import os
+import threading
+from datetime import datetime
+import traceback
+from types import MappingProxyType
+
+from rental_allocation import allocate
+from rental_calendar import days_in_month, key_index, month_index, month_key, month_range, month_start
+from rental_ids import NameIndex
+from rental_money import apply_percentage, prorate, to_won
+from rental_payments import PaymentLedger
+from rental_profiling import record_error, timed
+from rental_storage import DataFileLock, file_signature, read_json, write_json_atomic
+
+# pandas 는 generate_report 에서만 필요하므로 호출 시점에 불러온다 (선택 의존성)
+# numpy 가 필요한 컴파일된 스냅샷(rental_snapshot)도 데이터를 불러오거나 저장할 때 불러온다
+
+DATA_FILE = 'rental_data.json'
+
+
+def mutation(method):
+    """데이터를 바꾸는 메서드 표시
+
+    쓰기 잠금 아래에서 실행해 쓰기를 한 번에 하나씩 직렬화하고, 정상적으로 끝나면 데이터 버전을 올린다.
+    payments_only 로 표시한 메서드가 아니면 계약 버전(contract_version)도 올린다.
+    감사 기록(audit)이 연결되어 있으면 가장 바깥 호출이 끝날 때 바뀐 내용을 기록한다.
+    예외로 끝나면 버전을 올리지 않고 감사 기록도 남기지 않으므로, 메서드는 데이터를 바꾸기 전에 검사를 마친다.
+    """
+    contracts = not getattr(method, 'payments_only', False)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.read_only:
+            raise ValueError("읽기 전용 스냅샷은 수정할 수 없습니다.")
+        with self._lock:
+            self._mutation_depth += 1
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                self._mutation_depth -= 1
+                if self._mutation_depth == 0:
+                    self._touched, self._touched_all = set(), False
+                raise
+            self._mutation_depth -= 1
+            self.version += 1
+            if contracts:
+                self.contract_version += 1
+            if self._mutation_depth == 0 and (self._touched or self._touched_all):
+                touched, touched_all = self._touched, self._touched_all
+                self._touched, self._touched_all = set(), False
+                if self.audit is not None:
+                    self.audit.record(self, method.__name__, args, kwargs, touched, touched_all)
+            return result
+    return wrapper
+
+
+def payments_only(method):
+    """납부 기록만 바꾸는 mutation 표시 (계약 버전을 올리지 않는다, @mutation 아래에 둔다)"""
+    method.payments_only = True
+    return method
+
+
+class SaveConflictError(ValueError):
+    """다른 곳에서 같은 임대인을 수정해 저장할 수 없음"""
+
+    def __init__(self, conflicts):
+        names = ', '.join(f"{building} - {tenant}" for building, tenant in conflicts)
+        super().__init__(f"다른 곳에서 같은 임대인 정보를 수정했습니다: {names}")
+        self.conflicts = conflicts
+
+
+def tenant_to_json(info):
+    """임대인 데이터를 JSON 저장 형식으로 변환"""
+    return {**info,
+            'start_date': info['start_date'].isoformat(),
+            'contract_end_date': info.get('contract_end_date').isoformat() if 'contract_end_date' in info else None,
+            'payments': [{**p, 'date': p['date'].isoformat()} for p in info['payments']]}
+
+
+def tenant_from_json(info):
+    """JSON 저장 형식의 임대인 데이터를 엔진 형식으로 변환"""
+    tenant_data = {
+        'start_date': datetime.fromisoformat(info['start_date']).date(),
+        'monthly_rent': to_won(info['monthly_rent']),
+        'payments': [],
+        'payment_type': info.get('payment_type', 'full')  # 결제 방식 로드 추가
+    }
+    
+    # 납부 기록 처리
+    if 'payments' in info:
+        for payment in info['payments']:
+            tenant_data['payments'].append({
+                'date': datetime.fromisoformat(payment['date']).date(),
+                'amount': to_won(payment['amount'])
+            })
+    
+    # 계약 만료일 처리
+    if 'contract_end_date' in info and info['contract_end_date']:
+        tenant_data['contract_end_date'] = datetime.fromisoformat(info['contract_end_date']).date()
+    
+    # 임대료 수정 기록 처리 (이전 형식의 금액만 있는 값은 {'amount': 금액} 으로 바꾼다)
+    if 'monthly_rent_overrides' in info:
+        tenant_data['monthly_rent_overrides'] = {
+            datetime.fromisoformat(date).date().isoformat():
+                {**amount, 'amount': to_won(amount['amount'])} if isinstance(amount, dict) else {'amount': to_won(amount)}
+            for date, amount in info['monthly_rent_overrides'].items()
+        }
+    
+    return tenant_data
+
+
+def snapshot_module():
+    """rental_snapshot 모듈 (numpy 가 없으면 None)"""
+    try:
+        import rental_snapshot
+    except ImportError:
+        return None
+    return rental_snapshot
+
+
+def flatten_json_data(data):
+    """JSON 저장 형식 dict 를 ({(건물, 임대인): 임대인 dict}, 건물 이름 집합) 으로 변환"""
+    tenants = {}
+    for building, building_tenants in data.items():
+        if isinstance(building_tenants, dict):
+            for tenant, info in building_tenants.items():
+                tenants[(building, tenant)] = info
+    return tenants, set(data)
+
+
+class RentalManagement:
+    REPORT_COLUMNS = ('월', '임대료', '납부일자', '납부액', '잔액', '비고')
+
+    def __init__(self, data_file=DATA_FILE):
+        self.data_file = data_file
+        self.buildings = {}
+        self.read_only = False
+        self.version = 0  # 데이터가 바뀔 때마다 증가
+        self.contract_version = 0  # 건물/임대인/계약 조건/임대료가 바뀔 때마다 증가 (납부 기록 변경은 제외)
+        self._lock = threading.RLock()
+        self._snapshot = None
+        self._owned_tenants = set()  # 마지막 스냅샷 이후 복사해 둔 임대인 (id)
+        # 마지막으로 읽거나 저장한 데이터 파일의 내용과 서명 (다른 곳의 변경 감지용)
+        self._synced = {}
+        self._synced_buildings = set()
+        self._file_signature = None
+        self._conflicts = []
+        self.compiled = None  # 컴파일된 스냅샷에서 불러왔으면 그 스냅샷 (_synced 는 필요할 때 만든다)
+        self.ids = NameIndex()  # 건물/임대인 정수 ID (rental_ids)
+        # 임대인별 캐시는 임대인 ID 로 찾으므로 이름을 바꿔도 그대로 쓴다
+        self._allocations = {}  # 임대인 ID -> (임대인 dict, 기준 월, 납부 배분 결과)
+        self._rent_vectors = {}  # 임대인 ID -> (임대인 dict, 기준 월, 시작 월 번호, 월별 임대료 목록)
+        self._ledgers = {}  # 임대인 ID -> (임대인 dict, 납부 기록 장부)
+        self._tenant_versions = {}  # 임대인 ID -> 마지막으로 바꾼 변경이 시작될 때의 데이터 버전
+        # 감사 기록: 현재 변경에서 바뀐 (건물, 임대인) 또는 (건물, None)
+        self.audit = None
+        self._mutation_depth = 0
+        self._touched = set()
+        self._touched_all = False
+
+    def __getstate__(self):
+        # 프로세스 풀 작업자로 보낼 때는 잠금과 캐시를 빼고 일반 dict 로 보낸다
+        state = self.__dict__.copy()
+        state['buildings'] = {building: dict(tenants) for building, tenants in self.buildings.items()}
+        state['read_only'] = False
+        del state['_lock']
+        state['_snapshot'] = None
+        state['_owned_tenants'] = set()
+        state['audit'] = None
+        state['_allocations'] = {}
+        state['_rent_vectors'] = {}
+        state['_ledgers'] = {}
+        state['_tenant_versions'] = {}
+        state['_synced'] = self._synced_base()
+        state['compiled'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def snapshot(self):
+        """현재 데이터의 읽기 전용 스냅샷
+
+        알림, 내보내기, 저장 같은 백그라운드 작업은 스냅샷에서 읽으므로
+        UI 스레드가 데이터를 바꾸는 중에도 일관된 데이터를 본다.
+        건물/임대인 목록만 복사하고 임대인 데이터는 공유하며, 이후 쓰기는
+        _writable_tenant 에서 임대인을 복사한 뒤 바꾸므로 스냅샷은 바뀌지 않는다.
+        데이터 버전이 같으면 같은 스냅샷을 돌려준다.
+        """
+        if self.read_only:
+            return self
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self.version:
+                snapshot = RentalManagement(self.data_file)
+                snapshot.buildings = MappingProxyType({
+                    building: MappingProxyType(dict(tenants)) if isinstance(tenants, dict)
+                    else tenants.copy(read_only=True)  # 컴파일된 스냅샷의 임대인 목록
+                    for building, tenants in self.buildings.items()
+                })
+                snapshot.version = self.version
+                snapshot.contract_version = self.contract_version
+                snapshot.ids = self.ids.copy()
+                snapshot.read_only = True
+                self._snapshot = snapshot
+                self._owned_tenants = set()
+            return self._snapshot
+
+    def _touch(self, building_name, tenant_name=None):
+        """감사 기록할 변경 표시 (tenant_name 이 None 이면 건물 전체)"""
+        if self.audit is not None:
+            self._touched.add((building_name, tenant_name))
+
+    def _touch_all(self):
+        if self.audit is not None:
+            self._touched_all = True
+
+    def _writable_tenant(self, building_name, tenant_name):
+        """수정할 임대인 데이터 (스냅샷과 공유 중이면 먼저 복사)"""
+        self._touch(building_name, tenant_name)
+        tenant_id = self.ids.tenant_id(building_name, tenant_name)
+        self._allocations.pop(tenant_id, None)
+        self._rent_vectors.pop(tenant_id, None)
+        self._ledgers.pop(tenant_id, None)
+        self._tenant_versions[tenant_id] = self.version
+        tenant = self.buildings[building_name][tenant_name]
+        if id(tenant) not in self._owned_tenants:
+            tenant = dict(tenant)
+            tenant['payments'] = list(tenant['payments'])
+            if 'monthly_rent_overrides' in tenant:
+                tenant['monthly_rent_overrides'] = dict(tenant['monthly_rent_overrides'])
+            self.buildings[building_name][tenant_name] = tenant
+            self._owned_tenants.add(id(tenant))
+        return tenant
+
+    def changed_tenants(self, since_version):
+        """데이터 버전이 since_version 이던 때 이후에 _writable_tenant 로 바뀐 (건물, 임대인) 목록
+
+        임대인 추가/삭제/이름 변경, 전체 교체는 contract_version 으로 따로 확인한다.
+        """
+        keys = []
+        for tenant_id, version in list(self._tenant_versions.items()):
+            if version >= since_version and tenant_id in self.ids.tenant_keys:
+                keys.append(self.ids.tenant_key(tenant_id))
+        return keys
+
+    def tenant_id(self, building_name, tenant_name):
+        """임대인의 정수 ID (이름을 바꾸거나 다른 건물로 옮겨도 유지)"""
+        self._check_tenant(building_name, tenant_name)
+        return self.ids.tenant_id(building_name, tenant_name)
+
+    def tenant_key(self, tenant_id):
+        """임대인 ID 의 현재 (건물, 임대인) (없는 ID 이면 ValueError)"""
+        try:
+            return self.ids.tenant_key(tenant_id)
+        except KeyError:
+            raise ValueError("존재하지 않는 임대인입니다.")
+
+    def _compiled_row(self, building_name, tenant_name):
+        """불러온 뒤 바뀌지 않은 임대인이면 (컴파일된 스냅샷, 행 번호), 아니면 None"""
+        tenants = self.buildings[building_name]
+        row = tenants.compiled_row(tenant_name) if hasattr(tenants, 'compiled_row') else None
+        return None if row is None else (tenants.compiled, row)
+
+    def _check_tenant(self, building_name, tenant_name):
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
+
+    @mutation
+    def add_building(self, building_name):
+        if building_name not in self.buildings:
+            self.buildings[building_name] = {}
+            self.ids.building_id(building_name)
+            self._touch(building_name)
+
+    @mutation
+    def rename_building(self, old_name, new_name):
+        if old_name not in self.buildings:
+            raise ValueError("존재하지 않는 건물입니다.")
+        if new_name != old_name and new_name in self.buildings:
+            raise ValueError("이미 존재하는 건물 이름입니다.")
+        self.buildings[new_name] = self.buildings.pop(old_name)
+        self.ids.rename_building(old_name, new_name)  # 임대인 ID 와 캐시는 그대로
+        self._touch(old_name)
+        self._touch(new_name)
+
+    @mutation
+    def delete_building(self, building_name):
+        if building_name not in self.buildings:
+            raise ValueError("존재하지 않는 건물입니다.")
+        del self.buildings[building_name]
+        self.ids.remove_building(building_name)
+        self._touch(building_name)
+
+    @mutation
+    def clear_data(self):
+        """전체 데이터 삭제"""
+        self.buildings = {}
+        self.ids.sync(self.buildings)
+        self._owned_tenants = set()
+        self._allocations = {}
+        self._rent_vectors = {}
+        self._ledgers = {}
+        self._touch_all()
+
+    @mutation
+    def add_tenant(self, building_name, tenant_name, start_date, monthly_rent, payment_type="full", contract_end_date=None):
+        if building_name not in self.buildings:
+            raise ValueError("존재하지 않는 건물입니다.")
+        
+        tenant = {
+            'start_date': datetime.strptime(start_date, '%Y-%m-%d').date(),
+            'monthly_rent': to_won(monthly_rent),
+            'payments': [],
+            'payment_type': payment_type  # 결제 방식 추가
+        }
+        if contract_end_date:
+            tenant['contract_end_date'] = contract_end_date
+        self.buildings[building_name][tenant_name] = tenant
+        self.ids.tenant_id(building_name, tenant_name)
+        self._owned_tenants.add(id(tenant))
+        self._touch(building_name, tenant_name)
+
+    @mutation
+    def update_tenant(self, building_name, tenant_name, new_building_name, new_tenant_name,
+                      start_date, monthly_rent, payment_type, contract_end_date=None):
+        """임대인 정보 수정 (건물 이동/이름 변경 포함, 날짜는 date 객체)"""
+        self._check_tenant(building_name, tenant_name)
+        
+        moved = new_building_name != building_name or new_tenant_name != tenant_name
+        if moved and new_building_name in self.buildings and new_tenant_name in self.buildings[new_building_name]:
+            raise ValueError("이미 존재하는 임대인 이름입니다.")
+        
+        monthly_rent = to_won(monthly_rent)
+        tenant = self._writable_tenant(building_name, tenant_name)
+        tenant['start_date'] = start_date
+        tenant['monthly_rent'] = monthly_rent
+        tenant['payment_type'] = payment_type
+        if contract_end_date:
+            tenant['contract_end_date'] = contract_end_date
+        else:
+            tenant.pop('contract_end_date', None)
+        
+        if moved:
+            if new_building_name not in self.buildings:
+                self.buildings[new_building_name] = {}
+            del self.buildings[building_name][tenant_name]
+            self.buildings[new_building_name][new_tenant_name] = tenant
+            self.ids.move_tenant(building_name, tenant_name, new_building_name, new_tenant_name)
+            self._touch(new_building_name, new_tenant_name)
+            if not self.buildings[building_name]:
+                del self.buildings[building_name]
+                self.ids.remove_building(building_name)
+                self._touch(building_name)
+
+    @mutation
+    def delete_tenant(self, building_name, tenant_name):
+        self._check_tenant(building_name, tenant_name)
+        del self.buildings[building_name][tenant_name]
+        self.ids.remove_tenant(building_name, tenant_name)
+        self._touch(building_name, tenant_name)
+        if not self.buildings[building_name]:
+            del self.buildings[building_name]
+            self.ids.remove_building(building_name)
+            self._touch(building_name)
+
+    @mutation
+    def set_contract_end_date(self, building_name, tenant_name, contract_end_date):
+        self._check_tenant(building_name, tenant_name)
+        tenant = self._writable_tenant(building_name, tenant_name)
+        if contract_end_date:
+            tenant['contract_end_date'] = contract_end_date
+        else:
+            tenant.pop('contract_end_date', None)
+
+    @mutation
+    @payments_only
+    def add_payment(self, building_name, tenant_name, payment_date, amount):
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
+        
+        try:
+            payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
+            amount = to_won(amount)
+        except ValueError:
+            raise ValueError("날짜 형식(YYYY-MM-DD) 또는 금액이 올바르지 않습니다.")
+        
+        tenant_id = self.ids.tenant_id(building_name, tenant_name)
+        cached = self._allocations.get(tenant_id)
+        previous = self.buildings[building_name][tenant_name]
+        tenant = self._writable_tenant(building_name, tenant_name)
+        tenant['payments'].append({'date': payment_date, 'amount': amount})
+        tenant['payments'].sort(key=lambda x: x['date'])
+        
+        # 마지막 납부 이후의 납부는 캐시된 배분 결과에 이어서 배분
+        if cached is not None and cached[0] is previous and cached[1] == month_index(datetime.now().date()):
+            allocation = cached[2]
+            if allocation.last_payment_date is None or payment_date >= allocation.last_payment_date:
+                allocation.apply(payment_date, amount)
+                self._allocations[tenant_id] = (tenant, cached[1], allocation)
+
+    @mutation
+    @payments_only
+    def add_payments(self, payments):
+        """(건물, 임대인, 납부일, 금액) 목록의 납부를 한 번의 변경으로 추가 (변경 이력에 이벤트 하나만 남는다)
+
+        잘못된 항목은 건너뛰고 [(목록 위치, 오류 메시지)] 를 돌려준다.
+        """
+        errors = []
+        for index, (building_name, tenant_name, payment_date, amount) in enumerate(payments):
+            try:
+                self.add_payment(building_name, tenant_name, payment_date, amount)
+            except ValueError as e:
+                errors.append((index, str(e)))
+        return errors
+
+    @mutation
+    @payments_only
+    def delete_payment(self, building_name, tenant_name, payment):
+        """납부 기록 하나 삭제 (같은 날짜/금액의 첫 번째 기록)"""
+        self._check_tenant(building_name, tenant_name)
+        if payment not in self.buildings[building_name][tenant_name]['payments']:
+            raise ValueError("존재하지 않는 납부 기록입니다.")
+        self._writable_tenant(building_name, tenant_name)['payments'].remove(payment)
+
+    @mutation
+    @payments_only
+    def delete_payments(self, building_name, tenant_name, payment_ids):
+        """납부 ID (payment_ledger 참고) 목록의 납부 기록을 한 번에 삭제 (없는 ID 가 있으면 아무것도 지우지 않는다)"""
+        self._check_tenant(building_name, tenant_name)
+        doomed = {id(payment) for payment in self.payment_ledger(building_name, tenant_name).find(payment_ids)}
+        tenant = self._writable_tenant(building_name, tenant_name)
+        tenant['payments'] = [payment for payment in tenant['payments'] if id(payment) not in doomed]
+        return len(doomed)
+
+    @mutation
+    @payments_only
+    def delete_all_payments(self, building_name, tenant_name):
+        self._check_tenant(building_name, tenant_name)
+        self._writable_tenant(building_name, tenant_name)['payments'] = []
+
+    @timed('calculate_balance')
+    def calculate_balance(self, building_name, tenant_name):
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않 건물 또는 임대입니다.")
+        
+        today = datetime.now().date()
+        compiled = self._compiled_row(building_name, tenant_name)
+        if compiled is not None:
+            snapshot, row = compiled
+            return int(snapshot.balances(today)[row])
+        
+        # 보고서/미납 경과(allocate_payments)와 같은 일할 계산 청구액을 쓰므로 allocate_payments(...).balance 와 같다
+        tenant = self.buildings[building_name][tenant_name]
+        total_due = sum(self.monthly_dues(building_name, tenant_name)[1])
+        total_paid = sum(payment['amount'] for payment in tenant['payments'])
+        return total_due - total_paid
+
+    def total_monthly_rent(self):
+        """전체 임대인의 기본 월 임대료 합계"""
+        total = 0
+        for building, tenants in list(self.buildings.items()):
+            for tenant_name in list(tenants):
+                compiled = self._compiled_row(building, tenant_name)
+                if compiled is not None:
+                    snapshot, row = compiled
+                    total += int(snapshot.rent[row])
+                else:
+                    total += tenants[tenant_name]['monthly_rent']
+        return total
+
+    def iter_monthly_dues(self, building_name, tenant_name):
+        """임대 시작월부터 이번 달까지 월별 청구 임대료 생성 (일할 계산 반영)
+
+        (월, 임대료, 비고 목록) 튜플을 한 달씩 순서대로 돌려준다.
+        """
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
+        
+        tenant = self.buildings[building_name][tenant_name]
+        start_date = tenant['start_date']
+        contract_end_date = tenant.get('contract_end_date')
+        end_index = month_index(contract_end_date) if contract_end_date else None
+        prorated = tenant.get('payment_type') == 'prorated'
+        overrides = tenant.get('monthly_rent_overrides', {})
+        start_index, dues = self.monthly_dues(building_name, tenant_name)
+        
+        for index, monthly_rent in enumerate(dues, start_index):
+            notes = []
+            if index == start_index and prorated:
+                notes.append(f"일할계산({days_in_month(index) - start_date.day + 1}일)")
+            if index == end_index:
+                notes.append(f"만료일할계산({contract_end_date.day}일)")
+            
+            # 임대료 수정 비고
+            override = overrides.get(month_key(index)) if overrides else None
+            if override and override.get('note'):
+                notes.append(override['note'])
+            
+            yield month_start(index), monthly_rent, notes
+
+    def monthly_dues(self, building_name, tenant_name):
+        """임대 시작월부터 이번 달까지의 월별 청구 임대료 (시작 월 번호, [임대료])
+
+        rent_vector 에 첫 달(일할 계산 임대인)과 계약 만료월의 일할 계산을 반영한 새 목록이다.
+        """
+        tenant = self.buildings[building_name][tenant_name]
+        start_index, rents = self.rent_vector(building_name, tenant_name)
+        dues = list(rents)
+        if not dues:
+            return start_index, dues
+        
+        # 첫 달 일할 계산
+        if tenant.get('payment_type') == 'prorated':
+            month_days = days_in_month(start_index)
+            dues[0] = prorate(dues[0], month_days - tenant['start_date'].day + 1, month_days)
+        
+        # 마지막 달 일할 계산
+        contract_end_date = tenant.get('contract_end_date')
+        if contract_end_date:
+            offset = month_index(contract_end_date) - start_index
+            if 0 <= offset < len(dues):
+                dues[offset] = prorate(dues[offset], contract_end_date.day, days_in_month(start_index + offset))
+        return start_index, dues
+
+    def allocate_payments(self, building_name, tenant_name):
+        """납부액을 가장 오래된 미납월부터 배분한 결과 (rental_allocation.TenantAllocation)
+
+        임대인별로 캐시하며, 임대인 데이터가 바뀌거나 달이 바뀌면 다시 계산한다.
+        """
+        self._check_tenant(building_name, tenant_name)
+        tenant = self.buildings[building_name][tenant_name]
+        current_month = month_index(datetime.now().date())
+        tenant_id = self.ids.tenant_id(building_name, tenant_name)
+        cached = self._allocations.get(tenant_id)
+        if cached is not None and cached[0] is tenant and cached[1] == current_month:
+            return cached[2]
+        
+        allocation = allocate(self.iter_monthly_dues(building_name, tenant_name),
+                              sorted(tenant['payments'], key=lambda x: x['date']))
+        self._allocations[tenant_id] = (tenant, current_month, allocation)
+        return allocation
+
+    def payment_ledger(self, building_name, tenant_name):
+        """날짜순 납부 기록 장부 (rental_payments.PaymentLedger)
+
+        임대인별로 캐시하며, 임대인 데이터가 바뀌면 다시 만든다.
+        """
+        self._check_tenant(building_name, tenant_name)
+        tenant = self.buildings[building_name][tenant_name]
+        tenant_id = self.ids.tenant_id(building_name, tenant_name)
+        cached = self._ledgers.get(tenant_id)
+        if cached is not None and cached[0] is tenant:
+            return cached[1]
+        
+        ledger = PaymentLedger(tenant['payments'])
+        self._ledgers[tenant_id] = (tenant, ledger)
+        return ledger
+
+    def aging(self, building_name, tenant_name, today=None):
+        """미납액의 경과 기간별 합계 ({구간 이름: 금액}, rental_allocation.AGING_LABELS 순서)"""
+        return self.allocate_payments(building_name, tenant_name).aging(today or datetime.now().date())
+
+    def iter_report_rows(self, building_name, tenant_name):
+        """월별 보고서 행 생성 (금액은 숫자 그대로)
+
+        (월, 임대료, 납부일자, 납부액, 잔액, 비고) 튜플을 한 달씩 순서대로 돌려준다.
+        납부액은 그 달에 배분된 금액이다 (납부는 가장 오래된 미납월부터 채운다).
+        납부일자는 그 달에 배분된 마지막 납부의 날짜이며 배분된 납부가 없으면 None 이다.
+        잔액은 그 달까지의 미납 누계이고, 모든 달을 채우고 남은 선납액은 마지막 달에서 뺀다.
+        """
+        allocation = self.allocate_payments(building_name, tenant_name)
+        months = allocation.months
+        balance = 0
+        for index, month in enumerate(months):
+            balance += month.outstanding
+            note = month.note
+            if index == len(months) - 1 and allocation.credit:
+                balance -= allocation.credit
+                note = ", ".join(filter(None, (note, f"선납 {int(allocation.credit):,}원")))
+            yield (month.month, month.due, month.paid_date, month.paid, balance, note)
+
+    def portfolio_monthly_totals(self, building_name=None):
+        """전체(또는 건물별) 월별 청구액과 납부액 합계
+
+        임대인별 월 청구액과 납부 기록을 월 단위로 한 번에 합산한다.
+        보고서와 같은 기준으로 임대 기간(시작월~이번 달) 밖의 납부는 제외한다.
+        [(월, 청구액, 납부액)] 을 월 순서로 돌려준다.
+        """
+        if building_name is not None and building_name not in self.buildings:
+            raise ValueError("존재하지 않는 건물입니다.")
+        
+        buildings = [building_name] if building_name is not None else list(self.buildings)
+        today_month = month_index(datetime.now().date())
+        due_by_month = {}
+        paid_by_month = {}
+        
+        for building in buildings:
+            for tenant_name, tenant in list(self.buildings[building].items()):
+                for month, rent, _ in self.iter_monthly_dues(building, tenant_name):
+                    index = month_index(month)
+                    due_by_month[index] = due_by_month.get(index, 0) + rent
+                
+                start_month = month_index(tenant['start_date'])
+                for payment in tenant['payments']:
+                    payment_month = month_index(payment['date'])
+                    if start_month <= payment_month <= today_month:
+                        paid_by_month[payment_month] = paid_by_month.get(payment_month, 0) + payment['amount']
+        
+        return [(month_start(index), due_by_month[index], paid_by_month.get(index, 0)) for index in sorted(due_by_month)]
+
+    @timed('generate_report')
+    def generate_report(self, building_name, tenant_name):
+        """보고서를 표시용 문자열 DataFrame 으로 생성 (pandas 필요)"""
+        try:
+            import pandas as pd
+            
+            rows = []
+            for month, rent, paid_date, paid, balance, note in self.iter_report_rows(building_name, tenant_name):
+                rows.append((
+                    month.strftime('%Y-%m'),
+                    f"{int(rent):,}원",
+                    paid_date.strftime('%Y-%m-%d') if paid_date else '',
+                    '-' if paid == 0 else f"{int(paid):,}원",
+                    f"{int(balance):,}원",
+                    note
+                ))
+            
+            return pd.DataFrame(rows, columns=self.REPORT_COLUMNS)
+            
+        except Exception as e:
+            record_error('generate_report', e)
+            print(f"보고서 생성 중 오류 발생: {str(e)}")
+            return None
+
+    def to_json_data(self):
+        """전체 데이터를 JSON 저장 형식의 dict 로 변환"""
+        return {building: {tenant: tenant_to_json(info) for tenant, info in tenants.items()}
+                for building, tenants in self.buildings.items()}
+
+    @mutation
+    def load_json_data(self, data):
+        """JSON 저장 형식의 dict 로 전체 데이터 교체"""
+        buildings = {}
+        for building, tenants in data.items():
+            buildings[building] = {}
+            if isinstance(tenants, dict):  # tenants가 딕셔너리인 경우에만 처리
+                for tenant, info in tenants.items():
+                    buildings[building][tenant] = tenant_from_json(info)
+        self.buildings = buildings
+        self.ids.sync(buildings)
+        self._owned_tenants = set()
+        self._allocations = {}
+        self._rent_vectors = {}
+        self._ledgers = {}
+        self._touch_all()
+
+    @mutation
+    def load_compiled(self, compiled):
+        """컴파일된 스냅샷으로 전체 데이터 교체 (임대인 데이터는 처음 사용할 때 변환)"""
+        self.buildings = compiled.buildings()
+        self.ids.sync(self.buildings)
+        self._owned_tenants = set()
+        self._allocations = {}
+        self._rent_vectors = {}
+        self._ledgers = {}
+        self.compiled = compiled
+        self._touch_all()
+
+    def _remember_synced(self, data, signature):
+        self._synced, self._synced_buildings = flatten_json_data(data)
+        self._file_signature = signature
+        self._conflicts = []
+
+    def _synced_base(self):
+        """마지막으로 읽거나 저장한 파일 내용 ({(건물, 임대인): JSON 형식 임대인})"""
+        if self._synced is None:
+            # 컴파일된 스냅샷은 파일 내용 그대로이므로 처음 필요할 때 만든다
+            compiled = self.compiled
+            self._synced = {(building, tenant_name): tenant_to_json(compiled.tenant(row))
+                            for building, tenants in compiled.buildings().items()
+                            for tenant_name, row in tenants.rows.items()}
+        return self._synced
+
+    def compile_snapshot_later(self, data, signature):
+        """다음 시작 때 사용할 컴파일된 스냅샷을 백그라운드에서 만든다
+
+        numpy 가 없거나 데이터 폴더에 쓸 수 없으면 건너뛴다.
+        """
+        snapshot = snapshot_module()
+        folder = os.path.dirname(os.path.abspath(self.data_file))
+        if snapshot is not None and signature is not None and os.access(folder, os.W_OK):
+            snapshot.compiler.submit(self.data_file, data, signature)
+
+    def file_changed(self):
+        """마지막으로 읽거나 저장한 뒤 다른 곳에서 데이터 파일이 바뀌었는지"""
+        return file_signature(self.data_file) != self._file_signature
+
+    @mutation
+    def sync_from_file(self, prefer=None):
+        """다른 곳에서 바뀐 데이터 파일의 내용을 현재 데이터에 합치기
+
+        마지막으로 읽거나 저장한 내용과 달라진 임대인만 다시 변환한다.
+        양쪽에서 모두 바뀐 임대인(충돌)은 prefer 에 따라 처리한다.
+          None: 현재 데이터를 유지하고 충돌로 남긴다 (해결 전까지 save_data 가 SaveConflictError 발생)
+          'file': 파일의 내용으로 바꾼다
+          'memory': 현재 데이터를 유지하고 다음 저장에서 파일을 덮어쓴다
+        (바뀐 임대인 목록, 충돌 임대인 목록) 을 돌려준다.
+        """
+        signature = file_signature(self.data_file)
+        data = read_json(self.data_file) if signature is not None else {}
+        theirs, their_buildings = flatten_json_data(data)
+        base = self._synced_base()
+        changed, conflicts = [], []
+        
+        for key in base.keys() | theirs.keys():
+            their_info = theirs.get(key)
+            if their_info == base.get(key):
+                continue
+            if their_info is not None:
+                # 이전 형식으로 저장된 데이터는 현재 형식으로 맞춘 뒤 비교
+                their_info = theirs[key] = tenant_to_json(tenant_from_json(their_info))
+                if their_info == base.get(key):
+                    continue
+            
+            building_name, tenant_name = key
+            current = self.buildings.get(building_name, {}).get(tenant_name)
+            ours = tenant_to_json(current) if current is not None else None
+            if ours == their_info:
+                continue
+            if ours != base.get(key):
+                conflicts.append(key)
+                if prefer == 'memory':
+                    continue
+                if prefer is None:
+                    # 마지막 기준 내용을 유지해야 다음 비교에서도 충돌로 남는다
+                    if key in base:
+                        theirs[key] = base[key]
+                    else:
+                        del theirs[key]
+                    continue
+            
+            if their_info is None:
+                del self.buildings[building_name][tenant_name]
+                self.ids.remove_tenant(building_name, tenant_name)
+            else:
+                tenant = tenant_from_json(their_info)
+                self.buildings.setdefault(building_name, {})[tenant_name] = tenant
+                self.ids.tenant_id(building_name, tenant_name)
+                self._owned_tenants.add(id(tenant))
+            self._touch(building_name, tenant_name)
+            changed.append(key)
+        
+        for building_name in their_buildings - self._synced_buildings:
+            if building_name not in self.buildings:
+                self.buildings[building_name] = {}
+                self.ids.building_id(building_name)
+                self._touch(building_name)
+        for building_name in self._synced_buildings - their_buildings:
+            if building_name in self.buildings and not self.buildings[building_name]:
+                del self.buildings[building_name]
+                self.ids.remove_building(building_name)
+                self._touch(building_name)
+        
+        self._synced, self._synced_buildings, self._file_signature = theirs, their_buildings, signature
+        self._conflicts = conflicts if prefer is None else []
+        return changed, conflicts
+
+    @mutation
+    def restore_json_data(self, data, building_name=None, tenant_name=None):
+        """백업 내용(JSON 저장 형식)으로 전체 또는 건물/임대인 하나를 교체"""
+        if building_name is None:
+            self.load_json_data(data)
+        elif tenant_name is None:
+            self.buildings[building_name] = {tenant: tenant_from_json(info)
+                                             for tenant, info in data[building_name].items()}
+            self.ids.sync(self.buildings)
+            self._touch(building_name)
+        else:
+            self.buildings.setdefault(building_name, {})[tenant_name] = \
+                tenant_from_json(data[building_name][tenant_name])
+            self.ids.tenant_id(building_name, tenant_name)
+            self._touch(building_name, tenant_name)
+
+    @mutation
+    def discard_unsaved(self):
+        """저장하지 않은 변경을 버리고 데이터 파일의 현재 내용으로 되돌리기
+
+        마지막으로 읽거나 저장한 내용으로 되돌린 뒤 그 뒤에 파일에서 바뀐 임대인을 합치므로
+        충돌도 함께 사라진다 (충돌한 임대인은 파일의 내용을 따른다).
+        """
+        data = {building: {} for building in self._synced_buildings}
+        for (building, tenant), info in self._synced_base().items():
+            data.setdefault(building, {})[tenant] = info
+        self.load_json_data(data)
+        self.sync_from_file(prefer='file')
+
+    @timed('save_data')
+    def save_data(self, force=False):
+        """데이터 파일 저장
+
+        마지막으로 읽은 뒤 다른 곳에서 파일이 바뀌었으면 먼저 그 내용을 합친 뒤 저장한다.
+        같은 임대인을 양쪽에서 바꿨으면 저장하지 않고 SaveConflictError 를 발생시킨다.
+        force=True 이면 파일의 변경 내용을 무시하고 현재 데이터로 덮어쓴다.
+        """
+        with DataFileLock(self.data_file):
+            if not force:
+                if self.file_changed():
+                    self.sync_from_file()
+                if self._conflicts:
+                    raise SaveConflictError(self._conflicts)
+            
+            # 스냅샷을 저장하므로 저장 중에 다른 스레드가 데이터를 바꿔도 안전하다
+            data = self.snapshot().to_json_data()
+            write_json_atomic(self.data_file, data)
+            signature = file_signature(self.data_file)
+            self._remember_synced(data, signature)
+        self.compile_snapshot_later(data, signature)
+
+    @timed('load_data')
+    def load_data(self, compile_snapshot=False):
+        """데이터 파일 불러오기
+
+        파일과 일치하는 컴파일된 스냅샷(rental_snapshot)이 있으면 JSON 대신 그것을 연다.
+        compile_snapshot 이면 JSON 을 읽은 뒤 다음 시작을 위해 스냅샷을 백그라운드에서 만든다.
+        읽기만 하는 명령이 데이터 폴더에 파일을 남기지 않도록 기본값은 False 이다.
+        """
+        signature = file_signature(self.data_file)
+        snapshot = snapshot_module() if signature is not None else None
+        compiled = snapshot.open_compiled(self.data_file, signature) if snapshot else None
+        if compiled is not None:
+            self.load_compiled(compiled)
+            self._synced, self._synced_buildings = None, set(self.buildings)
+            self._file_signature = signature
+            self._conflicts = []
+            print(f"데이터 로드 완료: {len(self.buildings)} 개의 건물, {compiled.tenant_count} 명의 임대인 정보를 "
+                  f"스냅샷({compiled.path})에서 불러왔습니다.")
+            return
+        
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                self.load_json_data(data)  # 기존 데이터는 교체됨
+                normalized = self.to_json_data()
+                self._remember_synced(normalized, signature)
+                if compile_snapshot:
+                    self.compile_snapshot_later(normalized, signature)
+                
+                print(f"데이터 로드 완료: {len(self.buildings)} 개의 건물, {sum(len(tenants) for tenants in self.buildings.values())} 명의 임대인 정보를 불러왔습니다.")
+                # 디버깅을 위한 상세 정보 출력
+                for building, tenants in self.buildings.items():
+                    print(f"\n건물: {building}")
+                    for tenant, info in tenants.items():
+                        print(f"  임대인: {tenant}")
+                        print(f"    시작일: {info['start_date']}")
+                        print(f"    월 임대료: {info['monthly_rent']}")
+                        print(f"    결제 방식: {info.get('payment_type', 'full')}")  # 결제 방식 출력 추가
+                        print(f"    납부 기록 수: {len(info['payments'])}")
+                
+        except FileNotFoundError:
+            print(f"{self.data_file} 파일을 찾을 수 없습니다. 새로운 데이터를 시작합니다.")
+            self.clear_data()
+            self._remember_synced({}, signature)
+        except json.JSONDecodeError as e:
+            record_error('load_data', e)
+            print(f"JSON 일 형식이 올바르지 않음: {str(e)}")
+            self.clear_data()
+            self._remember_synced({}, signature)
+        except Exception as e:
+            record_error('load_data', e)
+            print(f"데이터 로드 중 오류 발생: {str(e)}")
+            print(f"상세 오류 보고: {traceback.format_exc()}")
+            self.clear_data()
+            self._remember_synced({}, signature)
+
+    def find_expiring_unpaid(self, days=30, today=None):
+        """미납금이 있고 계약 만료가 임박한 임대인 목록
+
+        [(건물, 임대인, 만료까지 남은 일수, 미납금)] 을 돌려준다.
+        """
+        today = today or datetime.now().date()
+        result = []
+        for building, tenants in list(self.buildings.items()):
+            for tenant_name, tenant in list(tenants.items()):
+                # 미납금 확인
+                balance = self.calculate_balance(building, tenant_name)
+                if balance > 0 and 'contract_end_date' in tenant:
+                    # 계약 만료 확인
+                    days_to_expiry = (tenant['contract_end_date'] - today).days
+                    if 0 < days_to_expiry <= days:
+                        result.append((building, tenant_name, days_to_expiry, balance))
+        return result
+
+    @mutation
+    def add_monthly_rent_override(self, building_name, tenant_name, date, amount, note=''):
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
+        
+        amount = to_won(amount)
+        tenant = self._writable_tenant(building_name, tenant_name)
+        if 'monthly_rent_overrides' not in tenant:
+            tenant['monthly_rent_overrides'] = {}
+        
+        tenant['monthly_rent_overrides'][month_key(month_index(date))] = {
+            'amount': amount,
+            'note': note
+        }
+
+    @mutation
+    def delete_monthly_rent_override(self, building_name, tenant_name, month_key):
+        self._check_tenant(building_name, tenant_name)
+        if month_key not in self.buildings[building_name][tenant_name].get('monthly_rent_overrides', {}):
+            raise ValueError("존재하지 않는 임대료 수정입니다.")
+        del self._writable_tenant(building_name, tenant_name)['monthly_rent_overrides'][month_key]
+
+    def get_monthly_rent(self, building_name, tenant_name, date):
+        index = month_index(date)
+        start_index, rents = self.rent_vector(building_name, tenant_name)
+        if start_index <= index < start_index + len(rents):
+            return rents[index - start_index]
+        
+        # 임대 시작 전이나 다음 달 이후
+        return self._rent_outside_vector(self.buildings[building_name][tenant_name], index)
+
+    @staticmethod
+    def _rent_outside_vector(tenant, index):
+        override = tenant.get('monthly_rent_overrides', {}).get(month_key(index))
+        return override['amount'] if override else tenant['monthly_rent']
+
+    def rent_vector(self, building_name, tenant_name):
+        """임대 시작월부터 이번 달까지의 월별 임대료 (시작 월 번호, [임대료])
+
+        임대료 수정을 반영한 목록을 임대인별로 캐시하며, 임대인 데이터가 바뀌거나 달이 바뀌면 다시 만든다.
+        목록은 캐시와 공유하므로 바꾸지 않는다.
+        """
+        tenant = self.buildings[building_name][tenant_name]
+        current_month = month_index(datetime.now().date())
+        tenant_id = self.ids.tenant_id(building_name, tenant_name)
+        cached = self._rent_vectors.get(tenant_id)
+        if cached is not None and cached[0] is tenant and cached[1] == current_month:
+            return cached[2], cached[3]
+        
+        start_index = month_index(tenant['start_date'])
+        rents = [tenant['monthly_rent']] * max(current_month - start_index + 1, 0)
+        for key, override in tenant.get('monthly_rent_overrides', {}).items():
+            index = key_index(key)
+            if index is not None and 0 <= index - start_index < len(rents):
+                rents[index - start_index] = override['amount']
+        self._rent_vectors[tenant_id] = (tenant, current_month, start_index, rents)
+        return start_index, rents
+
+    @mutation
+    def bulk_rent_increase(self, building_name, tenant_name, start_date, increase_amount, is_percentage=True):
+        if building_name not in self.buildings or tenant_name not in self.buildings[building_name]:
+            raise ValueError("존재하지 않는 건물 또는 임대인입니다.")
+        
+        if not is_percentage:
+            increase_amount = to_won(increase_amount)
+        
+        tenant = self.buildings[building_name][tenant_name]
+        first_index, rents = self.rent_vector(building_name, tenant_name)
+        for index in month_range(month_index(start_date), month_index(datetime.now().date())):
+            if index < first_index:
+                current_rent = self._rent_outside_vector(tenant, index)
+            else:
+                current_rent = rents[index - first_index]
+                
+            if is_percentage:
+                new_rent = apply_percentage(current_rent, increase_amount)
+            else:
+                new_rent = current_rent + increase_amount
+                
+            self.add_monthly_rent_override(building_name, tenant_name, month_start(index), new_rent)
+
+    def _rent_range(self, targets, first_month, last_month):
+        """기간 수정 대상 확인: (중복을 뺀 (건물, 임대인) 목록, 월 번호 range)
+
+        없는 임대인이 있거나 기간이 잘못되었으면 아무것도 바꾸기 전에 ValueError.
+        """
+        targets = list(dict.fromkeys(targets))
+        for building_name, tenant_name in targets:
+            self._check_tenant(building_name, tenant_name)
+        first, last = month_index(first_month), month_index(last_month)
+        if first > last:
+            raise ValueError("시작월이 종료월보다 늦습니다.")
+        return targets, month_range(first, last)
+
+    def _edit_rent_range(self, targets, first_month, last_month, new_rent, note):
+        targets, months = self._rent_range(targets, first_month, last_month)
+        
+        # 모든 임대인의 새 임대료를 먼저 계산한 뒤 한꺼번에 반영 (중간에 실패해도 일부만 바뀌지 않음)
+        plan = []
+        for building_name, tenant_name in targets:
+            start_index, rents = self.rent_vector(building_name, tenant_name)
+            tenant = self.buildings[building_name][tenant_name]
+            updates = {}
+            for index in months:
+                if start_index <= index < start_index + len(rents):
+                    current_rent = rents[index - start_index]
+                else:
+                    current_rent = self._rent_outside_vector(tenant, index)
+                updates[month_key(index)] = {'amount': new_rent(current_rent), 'note': note}
+            plan.append((building_name, tenant_name, updates))
+        
+        for building_name, tenant_name, updates in plan:
+            tenant = self._writable_tenant(building_name, tenant_name)
+            tenant.setdefault('monthly_rent_overrides', {}).update(updates)
+        return targets
+
+    @mutation
+    def set_rent_overrides(self, targets, first_month, last_month, amount, note=''):
+        """여러 임대인의 first_month ~ last_month 임대료를 amount 로 수정
+
+        targets 는 (건물, 임대인) 목록이며 한 번의 변경으로 기록된다. 바뀐 (건물, 임대인) 목록을 돌려준다.
+        """
+        amount = to_won(amount)
+        return self._edit_rent_range(targets, first_month, last_month, lambda rent: amount, note)
+
+    @mutation
+    def adjust_rent_overrides(self, targets, first_month, last_month, amount, is_percentage=False, note=''):
+        """여러 임대인의 기간 내 월별 임대료(기존 수정 반영)를 amount 원 또는 amount% 만큼 조정"""
+        if not is_percentage:
+            amount = to_won(amount)
+        
+        def adjust(rent):
+            return apply_percentage(rent, amount) if is_percentage else rent + amount
+        return self._edit_rent_range(targets, first_month, last_month, adjust, note)
+
+    @mutation
+    def clear_rent_overrides(self, targets, first_month, last_month):
+        """여러 임대인의 기간 내 임대료 수정 삭제 (수정이 있던 (건물, 임대인) 목록을 돌려준다)"""
+        targets, months = self._rent_range(targets, first_month, last_month)
+        changed = []
+        for building_name, tenant_name in targets:
+            overrides = self.buildings[building_name][tenant_name].get('monthly_rent_overrides', {})
+            keys = [key for key in overrides if key_index(key) in months]
+            if keys:
+                overrides = self._writable_tenant(building_name, tenant_name)['monthly_rent_overrides']
+                for key in keys:
+                    del overrides[key]
+                changed.append((building_name, tenant_name))
+        return changed
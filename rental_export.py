@@ -0,0 +1,135 @@
+"""임대료 납부현황 엑셀 내보내기
+
+xlsxwriter 의 constant_memory 모드로 행을 생성하는 즉시 디스크에 기록한다.
+워크북 전체를 메모리에 올리지 않으므로 임대인 수와 관계없이 메모리 사용량이 일정하다.
+같은 폴더의 임시 파일에 쓴 뒤 교체하므로 오류가 나거나 취소해도 기존 파일이 반쯤 쓴 파일로 바뀌지 않는다.
+"""
+import contextlib
+import os
+import re
+
+import xlsxwriter
+
+from rental_profiling import timed
+
+EXPORT_COLUMNS = ('임대인', '월', '임대료', '납부일자', '납부액', '잔액', '비고')
+COLUMN_WIDTHS = (20, 10, 14, 12, 14, 14, 30)
+
+# 엑셀 시트 이름에 사용할 수 없는 문자
+INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+
+def sheet_name_for(building_name, used_names):
+    """건물 이름을 엑셀 시트 이름 규칙(31자, 금지 문자, 중복 불가)에 맞게 변환"""
+    base = INVALID_SHEET_CHARS.sub('_', building_name).strip("'")[:31] or 'Sheet'
+    name = base
+    suffix = 2
+    while name.lower() in used_names:
+        tail = f"({suffix})"
+        name = base[:31 - len(tail)] + tail
+        suffix += 1
+    used_names.add(name.lower())
+    return name
+
+
+class ReportSheetWriter:
+    """시트 하나에 보고서 행을 순서대로 기록"""
+
+    def __init__(self, workbook, worksheet):
+        self.worksheet = worksheet
+        self.row = 0
+        self.header_format = workbook.add_format({'bold': True, 'bg_color': '#f2f2f2', 'border': 1})
+        self.month_format = workbook.add_format({'num_format': 'yyyy-mm'})
+        self.date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        self.money_format = workbook.add_format({'num_format': '#,##0"원"'})
+
+        for col, (title, width) in enumerate(zip(EXPORT_COLUMNS, COLUMN_WIDTHS)):
+            worksheet.set_column(col, col, width)
+            worksheet.write_string(0, col, title, self.header_format)
+        worksheet.freeze_panes(1, 0)
+        self.row = 1
+
+    def write_tenant(self, rental_manager, building_name, tenant_name):
+        """임대인 한 명의 보고서 행을 생성하면서 바로 기록"""
+        ws = self.worksheet
+        for month, rent, paid_date, paid, balance, note in rental_manager.iter_report_rows(building_name, tenant_name):
+            row = self.row
+            ws.write_string(row, 0, tenant_name)
+            ws.write_datetime(row, 1, month, self.month_format)
+            ws.write_number(row, 2, int(rent), self.money_format)
+            if paid_date:
+                ws.write_datetime(row, 3, paid_date, self.date_format)
+            ws.write_number(row, 4, int(paid), self.money_format)
+            ws.write_number(row, 5, int(balance), self.money_format)
+            if note:
+                ws.write_string(row, 6, note)
+            self.row += 1
+
+    def close(self):
+        if self.row > 1:
+            self.worksheet.autofilter(0, 0, self.row - 1, len(EXPORT_COLUMNS) - 1)
+
+
+def write_workbook_atomic(file_path, write):
+    """write(workbook) 으로 file_path + '.tmp' 에 워크북을 쓴 뒤 file_path 로 교체
+
+    write 가 False 를 돌려주거나(취소) 예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둔다.
+    """
+    temp_path = file_path + '.tmp'
+    try:
+        workbook = xlsxwriter.Workbook(temp_path, {'constant_memory': True})
+        try:
+            completed = write(workbook) is not False
+        finally:
+            workbook.close()
+        if not completed:
+            return False
+        with open(temp_path, 'r+b') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+        return True
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+
+
+@timed('export_tenant_report')
+def export_tenant_report(rental_manager, building_name, tenant_name, file_path):
+    """임대인 한 명의 보고서를 엑셀 파일로 저장"""
+    def write(workbook):
+        writer = ReportSheetWriter(workbook, workbook.add_worksheet(sheet_name_for(building_name, set())))
+        writer.write_tenant(rental_manager, building_name, tenant_name)
+        writer.close()
+
+    write_workbook_atomic(file_path, write)
+
+
+@timed('export_all_reports')
+def export_all_reports(rental_manager, file_path, progress=None, cancel_event=None, building_name=None):
+    """전체(또는 지정한 건물) 임대인의 보고서를 건물별 시트로 나누어 한 워크북에 저장
+
+    progress(완료 수, 전체 수) 가 임대인마다 호출된다.
+    cancel_event 가 설정되면 중단하고 False 를 돌려준다 (file_path 는 바꾸지 않는다).
+    """
+    if building_name is not None and building_name not in rental_manager.buildings:
+        raise ValueError("존재하지 않는 건물입니다.")
+    buildings = [(building, list(tenants)) for building, tenants in rental_manager.buildings.items()
+                 if building_name is None or building == building_name]
+    total = sum(len(tenants) for _, tenants in buildings)
+
+    def write(workbook):
+        done = 0
+        used_names = set()
+        for building, tenant_names in buildings:
+            worksheet = workbook.add_worksheet(sheet_name_for(building, used_names))
+            writer = ReportSheetWriter(workbook, worksheet)
+            for tenant_name in tenant_names:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                writer.write_tenant(rental_manager, building, tenant_name)
+                done += 1
+                if progress:
+                    progress(done, total)
+            writer.close()
+
+    return write_workbook_atomic(file_path, write)
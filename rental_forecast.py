@@ -0,0 +1,204 @@
+"""임대료 전망 (건물별 월별 예상 수입)
+
+현재 임대료, 예정된 임대료 수정, 계약 만료와 갱신율 가정으로 앞으로 N년 동안의
+건물별 월별 예상 수입을 계산한다. 임대인별 입력(현재 임대료, 시작/만료 월, 다음 달 이후의
+임대료 수정)은 계약 조건이 바뀔 때만 다시 모으고, 가정을 바꿔 다시 계산할 때는 전체 임대인을
+(임대인 수 x 개월 수) numpy 배열로 한 번에 계산하므로 GUI 에서 바로바로 다시 계산할 수 있다.
+
+    inputs = forecast_inputs(rental_manager)
+    projection = project(inputs, Assumptions(years=5, escalation_percent=5, escalation_interval=24, renewal_rate=80))
+    projection.yearly()  # (건물 수, 연 수) 예상 수입
+
+가정:
+    escalation_percent, escalation_interval   임대 시작월부터 interval 개월마다 percent% 인상 (원 미만 반올림)
+    renewal_rate, renewal_term                계약 만료 때 갱신할 확률(%). 만료 후 term 개월마다 다시 적용
+    collection_rate                           청구액 중 실제로 받을 것으로 보는 비율(%)
+
+이미 만료된 계약 (만료월이 전망 시작월 전):
+    만료 뒤(만료월 포함)에 같은 건물에 다른 임대인이 들어왔으면 그 임대인이 자리를 대신한 것으로 보고 제외한다.
+    그렇지 않으면 아직 입주 중인 것으로 보고 전망 시작월에 갱신한 것으로 계산한다 (지난 기간의 갱신은 세지 않는다).
+
+저장된 미래 달의 임대료 수정은 인상 계산 대신 그 금액을 그대로 쓴다.
+시작월/만료월의 일할 계산은 하지 않는다. 결과는 건물별 월 합계를 원 단위로 반올림한 정수다.
+"""
+import weakref
+from bisect import bisect_left
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from rental_calendar import key_index, month_index, month_start
+
+NO_END = -1  # 계약 만료일 없음
+
+_inputs_cache = weakref.WeakKeyDictionary()  # RentalManagement -> (계약 버전, 기준 월, ForecastInputs)
+
+
+class Assumptions:
+    """전망 가정 (비율은 % 단위)"""
+
+    __slots__ = ('years', 'escalation_percent', 'escalation_interval', 'renewal_rate', 'renewal_term',
+                 'collection_rate')
+
+    def __init__(self, years=5, escalation_percent=0, escalation_interval=12, renewal_rate=100, renewal_term=24,
+                 collection_rate=100):
+        if not 1 <= years <= 50:
+            raise ValueError("전망 기간은 1~50년이어야 합니다.")
+        if escalation_interval < 1 or renewal_term < 1:
+            raise ValueError("인상 주기와 갱신 기간은 1개월 이상이어야 합니다.")
+        if escalation_percent <= -100:
+            raise ValueError("인상률은 -100% 보다 커야 합니다.")
+        if not (0 <= renewal_rate <= 100 and 0 <= collection_rate <= 100):
+            raise ValueError("갱신율과 수납률은 0~100% 이어야 합니다.")
+        self.years = int(years)
+        self.escalation_percent = escalation_percent
+        self.escalation_interval = int(escalation_interval)
+        self.renewal_rate = renewal_rate
+        self.renewal_term = int(renewal_term)
+        self.collection_rate = collection_rate
+
+
+class ForecastInputs:
+    """전망에 쓰는 임대인별 배열 (임대인은 건물 순서대로 모여 있다)
+
+    rent 는 이번 달 임대료(이번 달까지의 임대료 수정 반영), start/end 는 월 번호이며
+    superseded 는 이미 만료되었고 그 뒤에 같은 건물에 다른 임대인이 들어온 계약이다.
+    ovr_* 는 다음 달 이후의 임대료 수정 (임대인 행, 월 번호, 금액)이다.
+    """
+
+    def __init__(self, current_month, buildings, building_offsets, rent, start, end, superseded, ovr_tenant,
+                 ovr_month, ovr_amount):
+        self.current_month = current_month
+        self.buildings = buildings
+        self.building_offsets = building_offsets
+        self.rent = rent
+        self.start = start
+        self.end = end
+        self.superseded = superseded
+        self.ovr_tenant = ovr_tenant
+        self.ovr_month = ovr_month
+        self.ovr_amount = ovr_amount
+
+    @property
+    def tenant_count(self):
+        return len(self.rent)
+
+
+class Projection:
+    """건물별 월별 예상 수입 (expected: (건물 수, 개월 수) int64)"""
+
+    def __init__(self, buildings, first_month, expected):
+        self.buildings = buildings
+        self.first_month = first_month
+        self.expected = expected
+
+    @property
+    def months(self):
+        return [month_start(self.first_month + offset) for offset in range(self.expected.shape[1])]
+
+    def totals(self):
+        """월별 전체 합계"""
+        return self.expected.sum(axis=0)
+
+    def yearly(self):
+        """전망 시작월부터 12개월씩 묶은 건물별 합계 ((건물 수, 연 수))"""
+        buildings, months = self.expected.shape
+        return self.expected.reshape(buildings, months // 12, 12).sum(axis=2)
+
+
+def forecast_inputs(rental_manager, today=None):
+    """임대인별 전망 입력 모으기 (계약 버전과 기준 월이 같으면 이전 결과를 그대로 쓴다)"""
+    today = today or datetime.now().date()
+    current = month_index(today)
+    cached = _inputs_cache.get(rental_manager)
+    if cached is not None and cached[0] == rental_manager.contract_version and cached[1] == current:
+        return cached[2]
+
+    buildings = []
+    offsets = [0]
+    rent, start, end, superseded = [], [], [], []
+    ovr_tenant, ovr_month, ovr_amount = [], [], []
+    for building, tenants in list(rental_manager.buildings.items()):
+        for tenant_name in list(tenants):
+            tenant = tenants[tenant_name]
+            start_index = month_index(tenant['start_date'])
+            if start_index <= current:
+                rent.append(rental_manager.get_monthly_rent(building, tenant_name, today))
+            else:
+                rent.append(tenant['monthly_rent'])
+            start.append(start_index)
+            end_date = tenant.get('contract_end_date')
+            end.append(month_index(end_date) if end_date else NO_END)
+            for key, override in tenant.get('monthly_rent_overrides', {}).items():
+                index = key_index(key)
+                if index is not None and index > current:
+                    ovr_tenant.append(len(rent) - 1)
+                    ovr_month.append(index)
+                    ovr_amount.append(override['amount'])
+        # 만료월 이후에 시작한 다른 임대인이 있으면 자리를 넘긴 계약
+        starts = sorted(start[offsets[-1]:])
+        for row in range(offsets[-1], len(rent)):
+            expired = end[row] != NO_END and end[row] <= current
+            later = len(starts) - bisect_left(starts, end[row]) - (start[row] >= end[row])
+            superseded.append(expired and later > 0)
+        buildings.append(building)
+        offsets.append(len(rent))
+
+    inputs = ForecastInputs(current, buildings, np.array(offsets, dtype=np.int64),
+                            np.array(rent, dtype=np.int64), np.array(start, dtype=np.int64),
+                            np.array(end, dtype=np.int64), np.array(superseded, dtype=bool),
+                            np.array(ovr_tenant, dtype=np.int64),
+                            np.array(ovr_month, dtype=np.int64), np.array(ovr_amount, dtype=np.int64))
+    _inputs_cache[rental_manager] = (rental_manager.contract_version, current, inputs)
+    return inputs
+
+
+def escalation_table(rent, percent, steps):
+    """(임대인 수, steps + 1) 배열: k 번 인상한 임대료 (매번 원 미만 반올림, rental_money.apply_percentage 와 같은 규칙)"""
+    numerator, denominator = Decimal(repr(percent) if isinstance(percent, float) else percent).as_integer_ratio()
+    scale = 100 * denominator
+    factor = scale + numerator
+    table = np.empty((len(rent), steps + 1), dtype=np.int64)
+    table[:, 0] = rent
+    for step in range(steps):
+        previous = table[:, step]
+        magnitude = (np.abs(previous) * factor * 2 + scale) // (2 * scale)
+        table[:, step + 1] = np.where(previous < 0, -magnitude, magnitude)
+    return table
+
+
+def project(inputs, assumptions):
+    """가정에 따른 건물별 월별 예상 수입 (다음 달부터 assumptions.years 년)"""
+    first = inputs.current_month + 1
+    month_count = assumptions.years * 12
+    months = first + np.arange(month_count, dtype=np.int64)
+    start = inputs.start[:, None]
+    end = inputs.end[:, None]
+
+    # 이번 달 이후 지난 인상 시점(임대 시작월 + interval 의 배수) 수
+    interval = assumptions.escalation_interval
+    elapsed = np.maximum((inputs.current_month - inputs.start) // interval, 0)[:, None]
+    steps = np.maximum((months[None, :] - start) // interval - elapsed, 0)
+    if assumptions.escalation_percent and inputs.tenant_count:
+        table = escalation_table(inputs.rent, assumptions.escalation_percent, int(steps.max()))
+        rent = np.take_along_axis(table, steps, axis=1)
+    else:
+        rent = np.broadcast_to(inputs.rent[:, None], steps.shape).copy()
+
+    # 저장된 임대료 수정은 그 금액 그대로
+    in_window = (inputs.ovr_month >= first) & (inputs.ovr_month < first + month_count)
+    rent[inputs.ovr_tenant[in_window], inputs.ovr_month[in_window] - first] = inputs.ovr_amount[in_window]
+
+    # 만료 후 갱신 횟수만큼 갱신율을 곱한 기대값 (이미 만료된 계약은 전망 시작월에 처음 갱신)
+    end = np.where((end != NO_END) & (end < first), first - 1, end)
+    renewals = np.where((end != NO_END) & (months[None, :] > end), (months[None, :] - end - 1) // assumptions.renewal_term + 1, 0)
+    weight = (assumptions.renewal_rate / 100) ** renewals * (months[None, :] >= start) * (assumptions.collection_rate / 100)
+    weight *= ~inputs.superseded[:, None]
+    expected = rent * weight
+
+    # 건물별 합계 (임대인이 건물 순서대로 모여 있으므로 누적합의 차)
+    cumulative = np.vstack([np.zeros((1, month_count)), np.cumsum(expected, axis=0)])
+    offsets = inputs.building_offsets
+    totals = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+    return Projection(inputs.buildings, first, np.rint(totals).astype(np.int64))
@@ -0,0 +1,276 @@
+"""임대료 납부현황 그래프 창
+
+창마다 Figure 하나를 만들어 두고, 임대인이 바뀌면 선 데이터만 교체해 다시 그린다.
+pyplot 을 거치지 않고 Figure 를 직접 만들기 때문에 창을 닫으면 그림도 함께 해제된다.
+기간이 길면 분기/연 단위로 집계하거나 LTTB 로 점을 줄여서 그린다.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import matplotlib
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+# 한글 폰트 설정 (모듈 로드 시 한 번만)
+matplotlib.rcParams['font.family'] = 'Malgun Gothic'
+matplotlib.rcParams['axes.unicode_minus'] = False
+
+SERIES_STYLES = (
+    ('임대료', 'o', '#3498db'),  # 파란색
+    ('납부액', 's', '#2ecc71'),  # 초록색
+    ('잔액', '^', '#e74c3c'),  # 빨간색
+)
+
+# 시리즈별 집계 방식: 임대료/납부액은 기간 합계, 잔액은 기간 말 값
+SERIES_KINDS = ('sum', 'sum', 'last')
+
+POINT_BUDGET = 60   # 자동 모드에서 이 개수를 넘으면 분기 → 연 단위로 집계
+MARKER_LIMIT = 40   # 점이 이보다 많으면 마커 생략
+MAX_TICKS = 12      # x축 레이블 최대 개수
+
+CHART_MODES = (
+    ('자동', 'auto'),
+    ('월별', 'month'),
+    ('분기별', 'quarter'),
+    ('연도별', 'year'),
+    ('LTTB', 'lttb'),
+)
+
+
+def period_label(label, period):
+    """'YYYY-MM' 레이블을 분기('YYYY-Qn') 또는 연('YYYY') 레이블로 변환"""
+    if period == 'quarter':
+        return f"{label[:4]}-Q{(int(label[5:7]) - 1) // 3 + 1}"
+    return label[:4]
+
+
+def aggregate_series(labels, series, period, kinds=SERIES_KINDS):
+    """월별 시리즈를 분기 또는 연 단위로 집계"""
+    out_labels = []
+    out_series = [[] for _ in series]
+    for i, label in enumerate(labels):
+        key = period_label(label, period)
+        if not out_labels or out_labels[-1] != key:
+            out_labels.append(key)
+            for values, out in zip(series, out_series):
+                out.append(values[i])
+            continue
+        for values, out, kind in zip(series, out_series, kinds):
+            out[-1] = out[-1] + values[i] if kind == 'sum' else values[i]
+    return out_labels, out_series
+
+
+def lttb_indices(values, threshold):
+    """Largest-Triangle-Three-Buckets 로 모양을 유지하며 남길 점의 인덱스 선택"""
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    indices = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 버킷의 평균점
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        # 현재 버킷에서 삼각형 넓이가 가장 큰 점
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = a, values[a]
+        best, best_area = start, -1
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return indices
+
+
+def downsample(labels, series, mode='auto', budget=POINT_BUDGET, kinds=SERIES_KINDS):
+    """그래프 모드에 맞게 점 개수를 줄인다
+
+    (x축 레이블, [(x 좌표, 값)]) 을 돌려준다. 집계 모드에서는 모든 시리즈가
+    같은 x 를 쓰고, LTTB 모드에서는 시리즈마다 남긴 월의 위치를 x 로 쓴다.
+    """
+    if mode == 'lttb':
+        return labels, [
+            ([i for i in idx], [values[i] for i in idx])
+            for values in series
+            for idx in [lttb_indices(values, budget)]
+        ]
+
+    if mode == 'auto':
+        # 연 단위가 마지막 단계이므로 그래도 예산을 넘으면 연 단위 그대로 사용
+        for period in ('quarter', 'year'):
+            if len(labels) <= budget:
+                break
+            labels, series = aggregate_series(labels, series, period, kinds)
+    elif mode in ('quarter', 'year'):
+        labels, series = aggregate_series(labels, series, mode, kinds)
+
+    x = list(range(len(labels)))
+    return labels, [(x, list(values)) for values in series]
+
+
+def report_series(rental_manager, building_name, tenant_name):
+    """보고서 모델에서 그래프용 숫자 시리즈 추출 (월 레이블, 임대료, 납부액, 잔액)"""
+    labels, rents, paids, balances = [], [], [], []
+    for month, rent, _, paid, balance, _ in rental_manager.iter_report_rows(building_name, tenant_name):
+        labels.append(month.strftime('%Y-%m'))
+        rents.append(rent)
+        paids.append(paid)
+        balances.append(balance)
+    return labels, rents, paids, balances
+
+
+def portfolio_series(rental_manager, building_name=None):
+    """월별 합계 원장에서 포트폴리오 수납 추이 시리즈 추출 (월 레이블, 청구액, 납부액, 누적 미수금)"""
+    labels, dues, paids, outstanding = [], [], [], []
+    balance = 0
+    for month, due, paid in rental_manager.portfolio_monthly_totals(building_name):
+        balance += due - paid
+        labels.append(month.strftime('%Y-%m'))
+        dues.append(due)
+        paids.append(paid)
+        outstanding.append(balance)
+    return labels, dues, paids, outstanding
+
+
+class ReportGraphWindow:
+    """납부현황 그래프 창 (창 하나에 Figure 하나를 재사용)"""
+
+    def __init__(self, master, on_close=None):
+        self.on_close = on_close
+        self.window = tk.Toplevel(master)
+        self.window.geometry("1000x700")
+        self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # 그래프 모드 선택
+        toolbar = ttk.Frame(self.window)
+        toolbar.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(toolbar, text="표시 단위:").pack(side='left', padx=5)
+        self.mode = ttk.Combobox(toolbar, values=[name for name, _ in CHART_MODES], state='readonly', width=10)
+        self.mode.set(CHART_MODES[0][0])
+        self.mode.pack(side='left', padx=5)
+        self.mode.bind("<<ComboboxSelected>>", lambda e: self._render())
+
+        self.figure = Figure(figsize=(12, 7), facecolor='white')
+        self.ax = self.figure.add_subplot(111)
+        self.data = None
+        self.tick_labels = None
+        self.background = None
+
+        # 데이터 선과 제목은 블리팅으로만 그린다
+        self.lines = []
+        for label, marker, color in SERIES_STYLES:
+            line, = self.ax.plot([], [], marker=marker, label=label, color=color,
+                                 linewidth=2, markersize=8, linestyle='-', animated=True)
+            self.lines.append(line)
+        self.title = self.ax.set_title('', pad=20, fontsize=14, fontweight='bold', animated=True)
+
+        self.ax.set_xlabel('월', fontsize=12, labelpad=10)
+        self.ax.set_ylabel('금액(원)', fontsize=12, labelpad=10)
+        self.ax.grid(True, linestyle='--', alpha=0.7, color='#ecf0f1')
+        self.ax.set_axisbelow(True)  # 그리드를 데이터 선 아래로
+        self.ax.legend(fontsize=12, loc='upper left', bbox_to_anchor=(1, 1),
+                       frameon=True, facecolor='white', edgecolor='#bdc3c7')
+        self.ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: format(int(x), ',')))
+        self.ax.set_facecolor('white')
+
+        # x축 눈금은 최대 MAX_TICKS 개로 자동으로 솎아낸다
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins=MAX_TICKS, integer=True))
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_tick))
+        self.ax.tick_params(axis='x', labelrotation=45)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+
+    def is_open(self):
+        return self.window is not None
+
+    def _on_draw(self, event):
+        """전체 다시 그리기 후 배경을 저장하고 데이터 선을 얹는다"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        self.ax.draw_artist(self.title)
+
+    def _format_tick(self, value, pos):
+        index = int(round(value))
+        if self.tick_labels and abs(value - index) < 1e-6 and 0 <= index < len(self.tick_labels):
+            return self.tick_labels[index]
+        return ''
+
+    def _fit_y_axis(self, low, high):
+        """값이 현재 범위를 벗어나거나 범위가 지나치게 넓을 때만 y축 변경"""
+        span = max(high - low, 1)
+        bottom, top = self.ax.get_ylim()
+        if low >= bottom and high <= top and (top - bottom) <= span * 2:
+            return False
+        margin = span * 0.1
+        self.ax.set_ylim(low - margin, high + margin)
+        return True
+
+    def update(self, title, labels, *series):
+        """새 데이터로 교체 (월별 레이블과 임대료/납부액/잔액 시리즈)"""
+        self.data = (title, list(labels), [list(values) for values in series])
+        self._render()
+
+    def _render(self):
+        """선택한 모드로 점을 줄인 뒤, 축이 그대로면 블리팅으로만 다시 그린다"""
+        if self.data is None or self.window is None:
+            return
+        title, labels, series = self.data
+        mode = dict(CHART_MODES)[self.mode.get()]
+        tick_labels, points = downsample(labels, series, mode)
+
+        show_markers = max((len(x) for x, _ in points), default=0) <= MARKER_LIMIT
+        for (_, marker, _), line, (x, values) in zip(SERIES_STYLES, self.lines, points):
+            line.set_data(x, values)
+            line.set_marker(marker if show_markers else '')
+        self.title.set_text(title)
+        self.window.title(title.replace('\n', ' '))
+
+        values = [value for _, values in points for value in values] or [0]
+        needs_full_draw = self.background is None
+        if tick_labels != self.tick_labels:
+            self.tick_labels = tick_labels
+            self.ax.set_xlim(-0.5, max(len(tick_labels) - 0.5, 0.5))
+            needs_full_draw = True
+        if self._fit_y_axis(min(values), max(values)):
+            needs_full_draw = True
+
+        if needs_full_draw:
+            self.figure.tight_layout()
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+        self.canvas.flush_events()
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        if self.window is None:
+            return
+        self.figure.clear()
+        self.canvas.get_tk_widget().destroy()
+        self.window.destroy()
+        self.window = None
+        self.background = None
+        if self.on_close:
+            self.on_close()
@@ -0,0 +1,108 @@
+"""건물/임대인 정수 ID
+
+건물과 임대인에 정수 ID 를 붙이고 이름 <-> ID 색인을 유지한다. 이름을 바꾸거나 임대인을 다른 건물로
+옮겨도 ID 는 그대로이므로, 임대인별 캐시나 화면 목록은 ID 로 가리키면 이름이 바뀌어도 계속 쓸 수 있다.
+건물 이름 변경은 건물 ID 의 이름만 바꾸므로 그 건물의 임대인 수와 관계없이 O(1) 이다.
+
+    tenant_id = rental_manager.tenant_id(building, tenant)
+    rental_manager.rename_building(building, new_name)
+    rental_manager.tenant_key(tenant_id)  # (new_name, tenant)
+
+ID 는 실행 중에만 쓰는 값으로 데이터 파일에는 저장하지 않는다 (파일 형식은 그대로).
+같은 데이터를 다시 불러오면 이름이 그대로인 건물/임대인은 같은 ID 를 유지한다.
+"""
+
+
+class NameIndex:
+    """건물 이름 <-> 건물 ID, (건물, 임대인) <-> 임대인 ID"""
+
+    __slots__ = ('next_id', 'building_ids', 'building_names', 'tenant_ids', 'tenant_keys')
+
+    def __init__(self):
+        self.next_id = 1
+        self.building_ids = {}    # 건물 이름 -> 건물 ID
+        self.building_names = {}  # 건물 ID -> 건물 이름
+        self.tenant_ids = {}      # 건물 ID -> {임대인 이름: 임대인 ID}
+        self.tenant_keys = {}     # 임대인 ID -> (건물 ID, 임대인 이름)
+
+    def copy(self):
+        index = NameIndex()
+        index.next_id = self.next_id
+        index.building_ids = dict(self.building_ids)
+        index.building_names = dict(self.building_names)
+        index.tenant_ids = {building_id: dict(tenants) for building_id, tenants in self.tenant_ids.items()}
+        index.tenant_keys = dict(self.tenant_keys)
+        return index
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def building_id(self, building_name):
+        """건물 ID (처음 보는 이름이면 새로 붙인다)"""
+        building_id = self.building_ids.get(building_name)
+        if building_id is None:
+            building_id = self.building_ids[building_name] = self._new_id()
+            self.building_names[building_id] = building_name
+            self.tenant_ids[building_id] = {}
+        return building_id
+
+    def tenant_id(self, building_name, tenant_name):
+        """임대인 ID (처음 보는 임대인이면 새로 붙인다)"""
+        building_id = self.building_ids.get(building_name)
+        if building_id is None:
+            building_id = self.building_id(building_name)
+        tenants = self.tenant_ids[building_id]
+        tenant_id = tenants.get(tenant_name)
+        if tenant_id is None:
+            tenant_id = tenants[tenant_name] = self._new_id()
+            self.tenant_keys[tenant_id] = (building_id, tenant_name)
+        return tenant_id
+
+    def building_name(self, building_id):
+        return self.building_names[building_id]
+
+    def tenant_key(self, tenant_id):
+        """임대인 ID 의 (건물, 임대인) (없는 ID 이면 KeyError)"""
+        building_id, tenant_name = self.tenant_keys[tenant_id]
+        return self.building_names[building_id], tenant_name
+
+    def rename_building(self, old_name, new_name):
+        building_id = self.building_ids.pop(old_name, None)
+        if building_id is None:
+            return
+        self.building_ids[new_name] = building_id
+        self.building_names[building_id] = new_name
+
+    def move_tenant(self, building_name, tenant_name, new_building_name, new_tenant_name):
+        """임대인 이름 변경/건물 이동 (ID 유지)"""
+        tenant_id = self.tenant_id(building_name, tenant_name)
+        del self.tenant_ids[self.building_ids[building_name]][tenant_name]
+        building_id = self.building_id(new_building_name)
+        self.tenant_ids[building_id][new_tenant_name] = tenant_id
+        self.tenant_keys[tenant_id] = (building_id, new_tenant_name)
+
+    def remove_tenant(self, building_name, tenant_name):
+        building_id = self.building_ids.get(building_name)
+        tenant_id = self.tenant_ids[building_id].pop(tenant_name, None) if building_id is not None else None
+        if tenant_id is not None:
+            del self.tenant_keys[tenant_id]
+
+    def remove_building(self, building_name):
+        building_id = self.building_ids.pop(building_name, None)
+        if building_id is None:
+            return
+        del self.building_names[building_id]
+        for tenant_id in self.tenant_ids.pop(building_id).values():
+            del self.tenant_keys[tenant_id]
+
+    def sync(self, buildings):
+        """buildings ({건물: {임대인: ...}}) 와 색인 맞추기 (남아 있는 이름은 ID 유지)"""
+        for building_name in [name for name in self.building_ids if name not in buildings]:
+            self.remove_building(building_name)
+        for building_name, tenants in buildings.items():
+            building_id = self.building_id(building_name)
+            for tenant_name in [name for name in self.tenant_ids[building_id] if name not in tenants]:
+                self.remove_tenant(building_name, tenant_name)
+            for tenant_name in tenants:
+                self.tenant_id(building_name, tenant_name)
@@ -0,0 +1,52 @@
+"""원 단위 정수 금액
+
+임대료, 납부액, 잔액은 모두 원 단위 정수(int)로 저장하고 계산한다.
+실수 합산에서 생기는 오차가 없으므로 포트폴리오 전체를 더해도 합계가 정확하다.
+
+반올림 규칙:
+    입력 금액      원 미만은 반올림 (0.5원은 0 에서 먼 쪽으로)  to_won('1,234.5') == 1235
+    일할 계산      원 미만 버림                               prorate(1_000_000, 10, 31) == 322_580
+    비율 인상      원 미만은 반올림                           apply_percentage(1_000_000, 3.3) == 1_033_000
+
+이전 버전이 실수로 저장한 데이터 파일은 불러올 때 to_won 으로 변환되고, 다음 저장부터 정수로 기록된다.
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+
+def to_won(value):
+    """금액(정수, 실수, Decimal, '1,500,000원' 같은 문자열)을 원 단위 정수로 변환. 잘못된 값이면 ValueError"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(exact_amount(value).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"금액이 올바르지 않습니다: {value!r}")
+
+
+def exact_amount(value):
+    """to_won 이 받는 금액을 반올림하지 않은 Decimal 로 변환. 잘못된 값이면 ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(f"금액이 올바르지 않습니다: {value!r}")
+    try:
+        if isinstance(value, float):
+            amount = Decimal(repr(value))
+        elif isinstance(value, str):
+            amount = Decimal(value.strip().replace(',', '').removesuffix('원'))
+        else:
+            amount = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"금액이 올바르지 않습니다: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"금액이 올바르지 않습니다: {value!r}")
+    return amount
+
+
+def prorate(amount, days, month_days):
+    """한 달 금액의 일할 금액 (amount * days / month_days, 원 미만 버림)"""
+    prorated = abs(amount) * days // month_days
+    return prorated if amount >= 0 else -prorated
+
+
+def apply_percentage(amount, percent):
+    """amount 를 percent% 인상한 금액 (원 미만 반올림, 음수면 인하)"""
+    return to_won(Decimal(amount) * (100 + Decimal(repr(percent) if isinstance(percent, float) else percent)) / 100)
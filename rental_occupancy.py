@@ -0,0 +1,137 @@
+"""건물별 입주/공실 추이
+
+각 임대인의 계약 기간(임대 시작월 ~ 계약 만료월)을 구간으로 보고, 건물별로 구간의 시작과 끝을
+월 번호 순으로 정렬해 한 번 훑어(interval sweep) 달마다 입주 임대인 수와 임대료 합계를 구한다.
+계약 수를 n, 기간 내 임대료 수정 수를 m 이라 하면 O((n + m) log(n + m)) 에 개월 수만큼의 출력이 더해진다.
+
+    timeline = occupancy_timeline(rental_manager)
+    timeline.summary()            # 건물별 현재 입주 수, 최대 입주 수, 입주율, 임대인-월, 임대료-월, 공실 손실
+    timeline.series('영진프라자')    # [(월, 입주 수, 임대료 합계, 공실 수, 공실 손실 추정)] (건물의 첫 임대월부터)
+
+데이터에 호실 수가 없으므로 기간 중 가장 많이 입주했던 임대인 수를 건물의 호실 수로 본다.
+공실 손실은 공실 수 x 그 건물의 평균 임대료(임대료-월 / 임대인-월, 원 미만 반올림)로 추정한다.
+건물마다 첫 임대인의 임대 시작월부터 공실을 센다 (그 전은 아직 운영하지 않은 달로 보고 공실 0).
+계약 만료일이 없는 임대인은 이번 달까지 입주한 것으로 보고, 시작월/만료월의 일할 계산은 하지 않는다.
+결과는 계약 버전(RentalManagement.contract_version)이나 달이 바뀔 때까지 캐시한다.
+"""
+import weakref
+from datetime import datetime
+
+from rental_calendar import key_index, month_index, month_range, month_start
+
+_timeline_cache = weakref.WeakKeyDictionary()  # RentalManagement -> (계약 버전, 기준 월, OccupancyTimeline)
+
+
+class BuildingOccupancy:
+    """건물 하나의 월별 입주 수와 임대료 합계 (OccupancyTimeline.first_month 부터)
+
+    opened 는 건물의 첫 임대월의 목록 위치로, 그 전 달은 공실로 세지 않는다.
+    """
+
+    __slots__ = ('name', 'occupied', 'rent', 'opened', 'capacity', 'average_rent')
+
+    def __init__(self, name, occupied, rent, opened=0):
+        self.name = name
+        self.occupied = occupied
+        self.rent = rent
+        self.opened = opened
+        self.capacity = max(occupied, default=0)
+        tenant_months = sum(occupied)
+        self.average_rent = (sum(rent) * 2 + tenant_months) // (tenant_months * 2) if tenant_months else 0
+
+    @property
+    def vacant(self):
+        return [self.capacity - occupied if position >= self.opened else 0
+                for position, occupied in enumerate(self.occupied)]
+
+    @property
+    def lost_rent(self):
+        return [vacant * self.average_rent for vacant in self.vacant]
+
+
+class OccupancyTimeline:
+    """건물별 입주 추이 (first_month ~ last_month, 월 번호)"""
+
+    def __init__(self, first_month, last_month, buildings):
+        self.first_month = first_month
+        self.last_month = last_month
+        self.buildings = buildings  # {건물 이름: BuildingOccupancy}
+
+    @property
+    def months(self):
+        return [month_start(index) for index in month_range(self.first_month, self.last_month)]
+
+    def series(self, building_name):
+        """건물의 첫 임대월부터 이번 달까지의 월별 값"""
+        building = self.buildings[building_name]
+        rows = zip(self.months, building.occupied, building.rent, building.vacant, building.lost_rent)
+        return list(rows)[building.opened:]
+
+    def summary(self):
+        """건물별 (건물, 이번 달 입주 수, 최대 입주 수, 입주율(%, 임대인이 없었으면 None), 임대인-월, 임대료-월, 공실 손실 합계)"""
+        rows = []
+        for name, building in self.buildings.items():
+            occupied = building.occupied[-1] if building.occupied else 0
+            rate = round(occupied * 100 / building.capacity, 1) if building.capacity else None
+            rows.append((name, occupied, building.capacity, rate, sum(building.occupied), sum(building.rent),
+                         sum(building.lost_rent)))
+        return rows
+
+
+def contract_events(tenant, last_month):
+    """임대인 하나의 (월 번호, 입주 수 변화, 임대료 변화) 목록"""
+    start = month_index(tenant['start_date'])
+    end_date = tenant.get('contract_end_date')
+    stop = min(month_index(end_date), last_month) + 1 if end_date else last_month + 1
+    if start >= stop:
+        return []
+    rent = tenant['monthly_rent']
+    events = [(start, 1, rent), (stop, -1, -rent)]
+    for key, override in tenant.get('monthly_rent_overrides', {}).items():
+        index = key_index(key)
+        if index is not None and start <= index < stop:
+            difference = override['amount'] - rent
+            events.append((index, 0, difference))
+            events.append((index + 1, 0, -difference))
+    return events
+
+
+def sweep(events, first_month, last_month):
+    """정렬한 변화 목록을 한 번 훑어 월별 (입주 수 목록, 임대료 합계 목록) 생성"""
+    events.sort(key=lambda event: event[0])
+    occupied, rent = [], []
+    count = total = 0
+    position = 0
+    for index in month_range(first_month, last_month):
+        while position < len(events) and events[position][0] <= index:
+            count += events[position][1]
+            total += events[position][2]
+            position += 1
+        occupied.append(count)
+        rent.append(total)
+    return occupied, rent
+
+
+def occupancy_timeline(rental_manager, today=None):
+    """건물별 입주 추이 (가장 이른 임대 시작월부터 이번 달까지)"""
+    current = month_index(today or datetime.now().date())
+    cached = _timeline_cache.get(rental_manager)
+    if cached is not None and cached[0] == rental_manager.contract_version and cached[1] == current:
+        return cached[2]
+
+    events_by_building = {}
+    for building, tenants in list(rental_manager.buildings.items()):
+        events = events_by_building[building] = []
+        for tenant_name in list(tenants):
+            events.extend(contract_events(tenants[tenant_name], current))
+    first = min((event[0] for events in events_by_building.values() for event in events), default=current)
+    first = min(first, current)
+
+    buildings = {}
+    for building, events in events_by_building.items():
+        # 임대인이 한 번도 없었던 건물은 공실도 세지 않는다
+        opened = min((event[0] for event in events), default=current + 1) - first
+        buildings[building] = BuildingOccupancy(building, *sweep(events, first, current), opened)
+    timeline = OccupancyTimeline(first, current, buildings)
+    _timeline_cache[rental_manager] = (rental_manager.contract_version, current, timeline)
+    return timeline
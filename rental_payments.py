@@ -0,0 +1,76 @@
+"""임대인 한 명의 납부 기록 장부 (날짜순, 납부 ID, 기간 조회)
+
+납부 기록을 날짜순으로 정렬해 두고 날짜 목록과 누적 금액을 함께 만들어,
+기간(시작일~종료일)에 해당하는 구간을 bisect 로 O(log n) 에 찾고 구간 합계를 O(1) 에 구한다.
+
+    ledger = rental_manager.payment_ledger(building, tenant)
+    first, last = ledger.locate(date(2024, 1, 1), date(2024, 12, 31))
+    ledger.entries(first, last)  # [(납부 ID, 납부 기록)]
+    ledger.total(first, last)
+
+납부 ID 는 'YYYY-MM-DD:금액:순번' 형식이며 순번은 날짜와 금액이 같은 기록 중 몇 번째인지다.
+목록 위치가 아니라 내용으로 정하므로 다른 기록을 추가하거나 지워도, 저장했다가 다시 불러와도 바뀌지 않는다.
+(날짜와 금액이 같은 기록은 서로 구별할 필요가 없으므로 어느 것을 지워도 결과가 같다.)
+"""
+from bisect import bisect_left, bisect_right
+
+PAGE_SIZE = 100  # 납부 관리 화면 한 페이지의 기록 수
+
+
+def payment_id(payment, occurrence=0):
+    return f"{payment['date'].isoformat()}:{payment['amount']}:{occurrence}"
+
+
+class PaymentLedger:
+    """날짜순 납부 기록, 납부 ID, 날짜 목록, 누적 금액
+
+    payments 는 임대인 데이터의 납부 dict 를 그대로 담으므로 바꾸지 않는다.
+    """
+
+    __slots__ = ('payments', 'ids', 'dates', 'cumulative', 'positions')
+
+    def __init__(self, payments):
+        self.payments = sorted(payments, key=lambda x: x['date'])
+        self.ids = []
+        self.dates = []
+        self.cumulative = [0]
+        occurrences = {}
+        for payment in self.payments:
+            key = (payment['date'], payment['amount'])
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            self.ids.append(payment_id(payment, occurrence))
+            self.dates.append(payment['date'])
+            self.cumulative.append(self.cumulative[-1] + payment['amount'])
+        self.positions = {identifier: position for position, identifier in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.payments)
+
+    def locate(self, first=None, last=None):
+        """first ~ last (날짜, 포함, None 이면 제한 없음) 에 해당하는 구간 [시작, 끝)"""
+        start = bisect_left(self.dates, first) if first is not None else 0
+        stop = bisect_right(self.dates, last) if last is not None else len(self.dates)
+        return start, max(start, stop)
+
+    def entries(self, start, stop):
+        """구간의 [(납부 ID, 납부 기록)]"""
+        return list(zip(self.ids[start:stop], self.payments[start:stop]))
+
+    def page(self, start, stop, page, page_size=PAGE_SIZE):
+        """구간 중 page 번째 페이지의 [(납부 ID, 납부 기록)]"""
+        first = start + page * page_size
+        return self.entries(first, min(first + page_size, stop))
+
+    def page_count(self, start, stop, page_size=PAGE_SIZE):
+        return max((stop - start + page_size - 1) // page_size, 1)
+
+    def total(self, start, stop):
+        return self.cumulative[stop] - self.cumulative[start]
+
+    def find(self, identifiers):
+        """납부 ID 목록의 납부 기록 (없는 ID 가 있으면 ValueError)"""
+        missing = [identifier for identifier in identifiers if identifier not in self.positions]
+        if missing:
+            raise ValueError(f"존재하지 않는 납부 기록입니다: {', '.join(missing)}")
+        return [self.payments[self.positions[identifier]] for identifier in dict.fromkeys(identifiers)]
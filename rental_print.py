@@ -0,0 +1,139 @@
+"""임대료 납부현황 인쇄용 HTML 생성
+
+여러 임대인의 납부현황을 한 HTML 문서에 임대인별 페이지로 나누어 기록한다.
+템플릿은 모듈 로드 시 한 번만 만들어 두고, 행은 생성되는 대로 파일에 바로 쓴다.
+"""
+import contextlib
+import html
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from rental_profiling import timed
+
+PRINT_DIR = os.path.join(tempfile.gettempdir(), 'rental_prints')
+
+DOCUMENT_HEAD = """<html><head><meta charset='utf-8'><title>{title}</title>
+<style>
+    body {{ font-family: 'Malgun Gothic', sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
+    thead {{ display: table-header-group; }}
+    tr {{ page-break-inside: avoid; }}
+    th, td {{ border: 1px solid black; padding: 8px; text-align: right; }}
+    th {{ background-color: #f2f2f2; }}
+    .title {{ text-align: center; font-size: 20px; margin-bottom: 20px; }}
+    .page {{ text-align: right; font-size: 12px; color: #555; }}
+    .summary td {{ font-weight: bold; }}
+    .statement {{ page-break-after: always; }}
+    .statement:last-child {{ page-break-after: auto; }}
+</style>
+</head><body>
+""".format
+
+STATEMENT_HEAD = """<section class='statement'>
+<div class='page'>{page} / {pages}</div>
+<div class='title'>{building} - {tenant} 임대료 납부현황</div>
+<table class='table'>
+<thead><tr><th>월</th><th>임대료</th><th>납부일자</th><th>납부액</th><th>잔액</th><th>비고</th></tr></thead>
+<tbody>
+""".format
+
+STATEMENT_ROW = "<tr><td>{0}</td><td>{1}</td><td>{2}</td><td>{3}</td><td>{4}</td><td>{5}</td></tr>\n".format
+
+STATEMENT_FOOT = """</tbody>
+<tfoot><tr class='summary'><td>합계</td><td>{rent}</td><td></td><td>{paid}</td><td>{balance}</td><td></td></tr></tfoot>
+</table>
+</section>
+""".format
+
+DOCUMENT_FOOT = "</body></html>\n"
+
+
+def format_won(amount):
+    return f"{int(amount):,}원"
+
+
+def building_targets(rental_manager, building_name=None):
+    """(건물, 임대인) 목록 생성 (건물을 지정하지 않으면 전체)"""
+    if building_name is not None:
+        if building_name not in rental_manager.buildings:
+            raise ValueError("존재하지 않는 건물입니다.")
+        return [(building_name, tenant) for tenant in sorted(rental_manager.buildings[building_name])]
+    return [(building, tenant)
+            for building in sorted(rental_manager.buildings)
+            for tenant in sorted(rental_manager.buildings[building])]
+
+
+@timed('write_statements')
+def write_statements(rental_manager, targets, file_path, title="임대료 납부현황", progress=None, cancel_event=None):
+    """임대인별 납부현황을 페이지로 나누어 HTML 파일 하나에 기록
+
+    progress(완료 수, 전체 수) 가 임대인마다 호출된다.
+    cancel_event 가 설정되면 중단하고 False 를 돌려준다.
+    file_path + '.tmp' 에 모두 쓴 뒤 교체하므로, 취소하거나 예외가 나면 기존 파일은 그대로 남는다.
+    """
+    escape = html.escape
+    total = len(targets)
+    temp_path = file_path + '.tmp'
+
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(DOCUMENT_HEAD(title=escape(title)))
+            for page, (building_name, tenant_name) in enumerate(targets, start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+
+                chunk = [STATEMENT_HEAD(page=page, pages=total,
+                                        building=escape(building_name), tenant=escape(tenant_name))]
+                total_rent = total_paid = balance = 0
+                for month, rent, paid_date, paid, balance, note in rental_manager.iter_report_rows(building_name, tenant_name):
+                    total_rent += rent
+                    total_paid += paid
+                    chunk.append(STATEMENT_ROW(
+                        month.strftime('%Y-%m'),
+                        format_won(rent),
+                        paid_date.strftime('%Y-%m-%d') if paid_date else '',
+                        '-' if paid == 0 else format_won(paid),
+                        format_won(balance),
+                        escape(note)
+                    ))
+                chunk.append(STATEMENT_FOOT(rent=format_won(total_rent), paid=format_won(total_paid),
+                                            balance=format_won(balance)))
+                f.write(''.join(chunk))
+
+                if progress:
+                    progress(page, total)
+            f.write(DOCUMENT_FOOT)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+        return True
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+
+
+def new_print_path(label):
+    """브라우저 출력용 파일 경로 생성
+
+    브라우저가 파일을 읽는 시점을 알 수 없으므로 바로 삭제하지 않고,
+    cleanup_print_dir 에서 오래된 파일만 정리한다.
+    """
+    os.makedirs(PRINT_DIR, exist_ok=True)
+    safe_label = "".join(c if c.isalnum() else '_' for c in label)
+    return os.path.join(PRINT_DIR, f"{safe_label}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.html")
+
+
+def cleanup_print_dir(max_age_seconds=86400):
+    """하루 이상 지난 출력용 임시 파일 삭제"""
+    if not os.path.isdir(PRINT_DIR):
+        return
+    cutoff = time.time() - max_age_seconds
+    for name in os.listdir(PRINT_DIR):
+        path = os.path.join(PRINT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # 다른 프로그램이 사용 중인 파일은 다음에 정리
@@ -0,0 +1,240 @@
+"""실행 시간 측정과 프로파일링
+
+주요 경로(데이터 로드/저장, 잔액 계산, 보고서, 화면 갱신, 내보내기)에 timer/timed 를 걸어
+이름별 실행 시간을 히스토그램으로 모은다. 표준 라이브러리만 사용하며 측정 비용은 호출당 몇 마이크로초다.
+
+    with timer('export_all'):
+        ...
+
+    @timed('calculate_balance')
+    def calculate_balance(...): ...
+
+arm_capture('show_report') 를 호출하면 그 뒤 처음 실행되는 그 이름의 측정 구간 하나를 cProfile 과
+tracemalloc 으로 기록해 임시 폴더의 rental_profiles 에 텍스트 보고서를 남긴다.
+이름 없이 arm_capture() 를 호출하면 호출한 스레드에서 처음 시작되는 최상위 구간을 기록한다.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+CAPTURE_TOP = 40  # 보고서에 넣을 함수/메모리 할당 위치 수
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_errors = {}
+_local = threading.local()
+_capture = None  # 예약된 캡처 (구간 이름 또는 None, 예약한 스레드 id)
+_capture_listeners = []
+
+
+class Histogram:
+    """실행 시간 히스토그램 (마이크로초 단위 2의 거듭제곱 구간)"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        """구간 상한으로 근사한 백분위수 (초)"""
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def to_json(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'min_ms': (self.min or 0.0) * 1000,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p90_ms': self.percentile(0.90) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+            # 구간 상한(마이크로초) -> 호출 수
+            'buckets_us': {str(1 << bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+
+def observe(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+def count(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_error(name, error):
+    """삼켜지는 오류도 횟수와 마지막 메시지를 남긴다"""
+    with _lock:
+        entry = _errors.setdefault(name, {'count': 0, 'last': ''})
+        entry['count'] += 1
+        entry['last'] = f"{type(error).__name__}: {error}"
+
+
+@contextlib.contextmanager
+def timer(name):
+    """구간 실행 시간을 name 히스토그램에 추가 (캡처가 예약되어 있으면 이 구간을 프로파일링)"""
+    depth = getattr(_local, 'depth', 0)
+    session = _claim_capture(name, depth) if _capture is not None else None
+    if session:
+        session.start()
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+        _local.depth = depth
+        if session:
+            path = session.stop()
+            for listener in list(_capture_listeners):
+                listener(name, path)
+
+
+def timed(name):
+    """함수 실행 시간을 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stats():
+    """지금까지 모은 통계 (JSON 으로 저장 가능한 dict)"""
+    with _lock:
+        return {
+            'timers': {name: histogram.to_json() for name, histogram in sorted(_histograms.items())},
+            'counters': dict(sorted(_counters.items())),
+            'errors': {name: dict(entry) for name, entry in sorted(_errors.items())},
+        }
+
+
+def dump_json(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats(), f, ensure_ascii=False, indent=2)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _errors.clear()
+
+
+def arm_capture(name=None):
+    """다음에 시작되는 측정 구간 하나를 cProfile/tracemalloc 으로 기록하도록 예약
+
+    name 을 주면 그 이름의 구간을 (어느 스레드에서든, 다른 구간 안에서 실행되어도) 기록하고,
+    없으면 이 함수를 호출한 스레드에서 처음 시작되는 최상위 구간을 기록한다.
+    알림이나 스냅샷 생성 같은 백그라운드 작업이 사용자가 고른 작업 대신 기록되지 않는다.
+    """
+    global _capture
+    with _lock:
+        _capture = (name, threading.get_ident())
+
+
+def _claim_capture(name, depth):
+    """예약된 캡처가 이 구간을 가리키면 예약을 해제하고 CaptureSession 을 돌려준다"""
+    global _capture
+    with _lock:
+        if _capture is None:
+            return None
+        target, thread = _capture
+        if target is None:
+            if depth or threading.get_ident() != thread:
+                return None
+        elif target != name:
+            return None
+        _capture = None
+    return CaptureSession(name)
+
+
+def add_capture_listener(listener):
+    """listener(구간 이름, 보고서 경로) 는 측정 구간을 실행한 스레드에서 호출된다"""
+    _capture_listeners.append(listener)
+
+
+def profile_dir():
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), 'rental_profiles')
+
+
+class CaptureSession:
+    """측정 구간 하나의 CPU 프로파일과 메모리 할당 기록"""
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+        self.started_tracemalloc = False
+
+    def start(self):
+        # 보고서에 필요한 모듈은 기록 시작 전에 불러와 할당 기록에 섞이지 않게 한다
+        import cProfile
+        import io  # noqa: F401
+        import pstats  # noqa: F401
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self.started_tracemalloc = True
+        self.before = tracemalloc.take_snapshot()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop(self):
+        """보고서를 파일로 저장하고 경로를 돌려준다"""
+        import io
+        import pstats
+        import tracemalloc
+        self.profiler.disable()
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+        out = io.StringIO()
+        out.write(f"{self.name} 프로파일 ({datetime.now().isoformat(timespec='seconds')})\n\n")
+        out.write(f"메모리: 현재 {current / 1024:,.0f}KB, 최대 {peak / 1024:,.0f}KB\n\n")
+        out.write("[메모리 할당 증가 상위]\n")
+        for stat in after.compare_to(self.before, 'lineno')[:CAPTURE_TOP]:
+            out.write(f"{stat}\n")
+        out.write("\n[CPU 누적 시간 상위]\n")
+        pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(CAPTURE_TOP)
+
+        directory = profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        return path
@@ -0,0 +1,209 @@
+"""연체 위험 점수
+
+임대인별 월별 청구 목록(monthly_dues)과 날짜순 납부 기록으로 납부 습관을 요약하고 0~100 점의 위험 점수를 매긴다.
+
+    평균 지연 일수   납부 기한이 지난 달마다 (완납일 또는 오늘) - 납부 기한 의 평균
+    연속 미납 개월   납부 기한이 지났는데 아직 완납되지 않은 달 수 (가장 오래된 달부터 채우므로 항상 최근 달들이다)
+    미납 경과 일수   아직 완납되지 않은 가장 오래된 달의 1일부터 오늘까지 일수 (rental_allocation.aging 과 같은 기준)
+    부분 납부 비율   납부 중 그때 채우던 달의 청구액보다 적게 낸 납부의 비율
+    지연 추세       완납한 달 중 최근 6개월 평균 지연 일수 - 그 전 6개월 평균 지연 일수 (양수면 나빠지는 중)
+    미납액 비율     calculate_balance 의 잔액 / 월 임대료 (미납 목록과 같은 잔액)
+
+납부 기한은 매월 1일(일할 계산 임대인은 말일)이다. 지연 추세는 완납한 달만 비교한다. 미납 중인 달의 지연은
+오늘까지의 일수라 최근 달일수록 짧으므로, 계속 내지 않는 임대인이 나아지는 것처럼 보이기 때문이다
+(계속 미납은 연속 미납 개월로 반영된다). 달마다 완납일은 rental_allocation 과 같은
+가장 오래된 달부터 채우는 배분으로 정하며, 전체 임대인의 월/납부 배열을 이어 붙여
+누적 합계와 searchsorted 로 한 번에 계산한다.
+
+    book = risk_book(rental_manager)
+    book.score(building, tenant)
+    book.ranked()  # [(점수, 건물, 임대인)] 높은 순
+
+데이터가 바뀌면 바뀐 임대인만 다시 계산하고, 임대인 구성이나 계약이 바뀌거나 날짜가 바뀌면 전체를 다시 계산한다.
+"""
+import weakref
+from datetime import datetime
+
+import numpy as np
+
+from rental_calendar import month_start_ordinal
+
+RECENT_MONTHS = 6  # 지연 추세를 비교할 기간
+
+# 점수 구성 (항목별 최대 점수와 최대 점수가 되는 값)
+RISK_WEIGHTS = (
+    ('days_late', 35, 60),   # 평균 60일 이상 지연
+    ('missed', 30, 3),       # 3개월 이상 연속 미납
+    ('partial', 15, 1),      # 모든 납부가 부분 납부
+    ('trend', 10, 30),       # 최근 6개월 지연이 30일 이상 늘어남
+    ('balance', 10, 3),      # 미납액이 월 임대료의 3배 이상
+)
+RISK_LEVELS = ((70, '높음'), (40, '주의'), (0, '낮음'))
+
+_book_cache = weakref.WeakKeyDictionary()  # RentalManagement -> RiskBook
+
+
+def risk_level(score):
+    for limit, label in RISK_LEVELS:
+        if score >= limit:
+            return label
+    return RISK_LEVELS[-1][1]
+
+
+def segment_ids(lengths):
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+
+def segment_starts(lengths):
+    return (np.cumsum(lengths) - lengths).astype(np.int64)
+
+
+def segment_cumsum(values, lengths):
+    """구간(임대인)마다 처음부터 다시 시작하는 누적 합계"""
+    cumulative = np.cumsum(values)
+    before = np.concatenate(([0], cumulative))[segment_starts(lengths)]
+    return cumulative - np.repeat(before, lengths)
+
+
+def segment_mean(values, ids, mask, count):
+    """구간(임대인)별 mask 인 값의 평균 (값이 없으면 0)"""
+    totals = np.bincount(ids, weights=values * mask, minlength=count)
+    counts = np.bincount(ids, weights=mask, minlength=count)
+    return np.divide(totals, counts, out=np.zeros(count), where=counts > 0)
+
+
+def profile(rental_manager, keys, today):
+    """keys ((건물, 임대인) 목록)의 납부 습관과 점수 배열 ({항목 이름: 배열}, 배열 순서는 keys 순서)"""
+    count = len(keys)
+    today_ordinal = today.toordinal()
+    due_amount, due_ordinal, month_ordinal, due_lengths, rents, balances = [], [], [], [], [], []
+    pay_amount, pay_ordinal, pay_lengths = [], [], []
+    for building, tenant_name in keys:
+        tenant = rental_manager.buildings[building][tenant_name]
+        start_index, dues = rental_manager.monthly_dues(building, tenant_name)
+        end_of_month = tenant.get('payment_type') == 'prorated'
+        due_amount.extend(dues)
+        starts = [month_start_ordinal(index) for index in range(start_index, start_index + len(dues) + 1)]
+        month_ordinal.extend(starts[:-1])
+        due_ordinal.extend([ordinal - 1 for ordinal in starts[1:]] if end_of_month else starts[:-1])
+        due_lengths.append(len(dues))
+        rents.append(tenant['monthly_rent'])
+        balances.append(rental_manager.calculate_balance(building, tenant_name))
+        payments = tenant['payments']
+        pay_amount.extend(payment['amount'] for payment in payments)
+        pay_ordinal.extend(payment['date'].toordinal() for payment in payments)
+        pay_lengths.append(len(payments))
+
+    due_amount = np.array(due_amount, dtype=np.int64)
+    due_ordinal = np.array(due_ordinal, dtype=np.int64)
+    month_ordinal = np.array(month_ordinal, dtype=np.int64)
+    due_ids = segment_ids(due_lengths)
+    pay_ids = segment_ids(pay_lengths)
+    pay_amount = np.array(pay_amount, dtype=np.int64)
+    pay_ordinal = np.array(pay_ordinal, dtype=np.int64)
+    order = np.lexsort((pay_ordinal, pay_ids))  # 임대인별 날짜순
+    pay_amount, pay_ordinal = pay_amount[order], pay_ordinal[order]
+
+    # 임대인별 누적 합계를 (임대인 번호, 누적 금액) 순서가 되도록 한 축에 펼친다
+    due_cumulative = segment_cumsum(due_amount, due_lengths)
+    pay_cumulative = segment_cumsum(pay_amount, pay_lengths)
+    span = int(max(due_cumulative.max(initial=0), pay_cumulative.max(initial=0))) + 1
+    due_key = due_ids * span + due_cumulative
+    pay_key = pay_ids * span + pay_cumulative
+
+    # 달마다 완납시킨 납부 = 누적 납부액이 누적 청구액 이상이 되는 첫 납부
+    settling = np.searchsorted(pay_key, due_key, side='left')
+    found = settling < len(pay_key)
+    found[found] = pay_ids[settling[found]] == due_ids[found]
+    settled_ordinal = np.full(len(due_key), -1, dtype=np.int64)
+    settled_ordinal[found] = pay_ordinal[settling[found]]
+
+    # 납부마다 그때 채우던 달 = 납부 전 누적 납부액보다 누적 청구액이 큰 첫 달
+    paying = np.searchsorted(due_key, pay_key - pay_amount, side='right')
+    partial = paying < len(due_key)
+    partial[partial] = (due_ids[paying[partial]] == pay_ids[partial]) & \
+        (pay_amount[partial] < due_amount[paying[partial]])
+
+    overdue = (due_ordinal <= today_ordinal) & (due_amount > 0)
+    late = np.maximum(np.where(settled_ordinal >= 0, settled_ordinal, today_ordinal) - due_ordinal, 0)
+    unpaid = overdue & (settled_ordinal < 0)
+    oldest = np.full(count, today_ordinal, dtype=np.int64)
+    outstanding_month = (settled_ordinal < 0) & (due_amount > 0)
+    np.minimum.at(oldest, due_ids[outstanding_month], month_ordinal[outstanding_month])
+
+    # 지연 추세: 기한이 지나 완납한 달을 최근부터 센 순서로 최근 6개월과 그 전 6개월 비교
+    settled = overdue & (settled_ordinal >= 0)
+    settled_count = np.bincount(due_ids, weights=settled, minlength=count).astype(np.int64)
+    from_end = settled_count[due_ids] - segment_cumsum(settled.astype(np.int64), due_lengths)
+    recent = settled & (from_end < RECENT_MONTHS)
+    earlier = settled & (from_end >= RECENT_MONTHS) & (from_end < RECENT_MONTHS * 2)
+    earlier_mean = segment_mean(late, due_ids, earlier, count)
+    trend = np.where(np.bincount(due_ids, weights=earlier, minlength=count) > 0,
+                     segment_mean(late, due_ids, recent, count) - earlier_mean, 0)
+
+    pay_counts = np.bincount(pay_ids, minlength=count)
+    outstanding = np.array(balances, dtype=np.float64)
+    rents = np.array(rents, dtype=np.float64)
+    features = {
+        'days_late': segment_mean(late, due_ids, overdue, count),
+        'missed': np.bincount(due_ids, weights=unpaid, minlength=count),
+        'partial': np.divide(np.bincount(pay_ids, weights=partial, minlength=count), pay_counts,
+                             out=np.zeros(count), where=pay_counts > 0),
+        'trend': trend,
+        'balance': np.divide(np.maximum(outstanding, 0), rents, out=np.zeros(count), where=rents > 0),
+    }
+    age = np.maximum(today_ordinal - oldest, 0)
+    score = np.zeros(count)
+    for name, points, saturation in RISK_WEIGHTS:
+        score += np.clip(features[name] / saturation, 0, 1) * points
+    features['score'] = np.round(score, 1)
+    features['age'] = age
+    return features
+
+
+class RiskBook:
+    """전체 임대인의 납부 습관과 위험 점수"""
+
+    def __init__(self, rental_manager, today):
+        self.keys = [(building, tenant) for building, tenants in list(rental_manager.buildings.items())
+                     for tenant in list(tenants)]
+        self.index = {key: row for row, key in enumerate(self.keys)}
+        self.today = today
+        self.contract_version = rental_manager.contract_version
+        self.version = rental_manager.version
+        self.features = profile(rental_manager, self.keys, today)
+
+    def refresh(self, rental_manager, today):
+        """바뀐 임대인만 다시 계산 (전체를 다시 계산해야 하면 False)"""
+        if today != self.today or rental_manager.contract_version != self.contract_version:
+            return False
+        if rental_manager.version != self.version:
+            changed = [key for key in rental_manager.changed_tenants(self.version) if key in self.index]
+            if changed:
+                rows = [self.index[key] for key in changed]
+                for name, values in profile(rental_manager, changed, today).items():
+                    self.features[name][rows] = values
+            self.version = rental_manager.version
+        return True
+
+    def score(self, building, tenant):
+        return float(self.features['score'][self.index[(building, tenant)]])
+
+    def details(self, building, tenant):
+        row = self.index[(building, tenant)]
+        return {name: float(values[row]) for name, values in self.features.items()}
+
+    def ranked(self, minimum=0):
+        """[(점수, 건물, 임대인)] 점수가 높은 순"""
+        scores = self.features['score']
+        order = np.argsort(-scores, kind='stable')
+        return [(float(scores[row]), *self.keys[row]) for row in order.tolist() if scores[row] >= minimum]
+
+
+def risk_book(rental_manager, today=None):
+    """rental_manager 의 위험 점수 (이전 결과가 있으면 바뀐 임대인만 다시 계산)"""
+    today = today or datetime.now().date()
+    book = _book_cache.get(rental_manager)
+    if book is None or not book.refresh(rental_manager, today):
+        book = _book_cache[rental_manager] = RiskBook(rental_manager, today)
+    return book
@@ -0,0 +1,442 @@
+"""컴파일된 읽기 전용 스냅샷 (메모리 매핑)
+
+큰 데이터 파일은 JSON 을 전부 읽고 변환해야 창을 띄울 수 있다. 저장할 때마다 같은 내용을
+고정 폭 배열로 바꾼 이진 파일을 함께 만들어 두고, 다음 시작 때는 이 파일을 mmap 으로 열어
+NumPy 배열 뷰로 바로 읽는다 (복사 없음).
+
+    임대인 표     건물/이름(문자열 번호), 시작일/만료일(서수), 월 임대료, 결제 방식, 납부 합계
+    납부 기록     날짜(서수)/금액 배열, 임대인별 구간은 pay_offsets
+    임대료 수정   날짜(서수)/월 번호/금액/비고 배열, 임대인별 구간은 ovr_offsets
+    문자열 표     UTF-8 바이트와 시작 위치
+
+파일 머리에는 만들 때의 데이터 파일 서명(rental_storage.file_signature)을 적어 두고,
+지금 데이터 파일의 서명과 같을 때만 사용한다. 다른 곳에서 파일이 바뀌었으면 JSON 을 읽는다.
+데이터 파일 옆의 두 칸(.snapshot0/.snapshot1)을 번갈아 쓰므로, 열려 있는(매핑된) 칸을
+교체할 수 없는 Windows 에서도 다음 스냅샷을 만들 수 있다.
+
+RentalManagement.load_data 가 자동으로 사용하며, numpy 가 없으면 이 모듈 없이 JSON 만 사용한다.
+"""
+import json
+import mmap
+import os
+import threading
+from collections.abc import MutableMapping
+from datetime import date, datetime
+
+import numpy as np
+
+from rental_calendar import month_index
+from rental_money import to_won
+from rental_storage import file_signature
+
+MAGIC = b'RNTSNAP1'
+FORMAT_VERSION = 2  # 2: 금액을 원 단위 정수로 저장
+SNAPSHOT_SUFFIXES = ('.snapshot0', '.snapshot1')
+ALIGNMENT = 8
+
+NO_NOTE = -1      # 비고 키가 없는 임대료 수정
+LEGACY_VALUE = -2  # 이전 형식(금액만 저장)의 임대료 수정
+
+ARRAY_DTYPES = {
+    'strings': np.uint8,
+    'string_offsets': np.int64,
+    'building_name': np.int32,
+    'building_offsets': np.int64,   # 건물별 임대인 행 구간
+    'tenant_name': np.int32,
+    'start': np.int32,
+    'start_month': np.int32,        # 연*12+월-1
+    'end': np.int32,                # 계약 만료일 (없으면 0)
+    'rent': np.int64,
+    'payment_type': np.int32,
+    'paid_total': np.int64,
+    'has_overrides': np.uint8,
+    'pay_offsets': np.int64,
+    'pay_date': np.int32,
+    'pay_amount': np.int64,
+    'ovr_offsets': np.int64,
+    'ovr_tenant': np.int32,
+    'ovr_date': np.int32,
+    'ovr_month': np.int32,          # 1일이 아닌 이전 형식 키는 -1 (조회되지 않음)
+    'ovr_amount': np.int64,
+    'ovr_note': np.int32,
+}
+
+
+def snapshot_paths(data_file):
+    return [data_file + suffix for suffix in SNAPSHOT_SUFFIXES]
+
+
+def parse_date(value):
+    return datetime.fromisoformat(value).date()
+
+
+class StringTable:
+    def __init__(self):
+        self.index = {}
+        self.encoded = []
+
+    def add(self, text):
+        number = self.index.get(text)
+        if number is None:
+            number = self.index[text] = len(self.encoded)
+            self.encoded.append(text.encode('utf-8'))
+        return number
+
+    def arrays(self):
+        offsets = np.zeros(len(self.encoded) + 1, dtype=np.int64)
+        np.cumsum([len(raw) for raw in self.encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(self.encoded), dtype=np.uint8), offsets
+
+
+def compile_arrays(data):
+    """JSON 저장 형식(to_json_data)의 데이터를 스냅샷 배열로 변환
+
+    배열로 옮길 수 없는 값(알 수 없는 키가 있는 임대료 수정 등)이 있으면 ValueError.
+    """
+    strings = StringTable()
+    columns = {name: [] for name in ARRAY_DTYPES if name not in ('strings', 'string_offsets')}
+    columns['building_offsets'].append(0)
+    columns['pay_offsets'].append(0)
+    columns['ovr_offsets'].append(0)
+
+    for building, tenants in data.items():
+        columns['building_name'].append(strings.add(building))
+        for tenant, info in (tenants.items() if isinstance(tenants, dict) else ()):
+            row = len(columns['tenant_name'])
+            start = parse_date(info['start_date'])
+            end = info.get('contract_end_date')
+            columns['tenant_name'].append(strings.add(tenant))
+            columns['start'].append(start.toordinal())
+            columns['start_month'].append(month_index(start))
+            columns['end'].append(parse_date(end).toordinal() if end else 0)
+            columns['rent'].append(to_won(info['monthly_rent']))
+            columns['payment_type'].append(strings.add(info.get('payment_type', 'full')))
+
+            paid_total = 0
+            for payment in info.get('payments', []):
+                amount = to_won(payment['amount'])
+                columns['pay_date'].append(parse_date(payment['date']).toordinal())
+                columns['pay_amount'].append(amount)
+                paid_total += amount
+            columns['paid_total'].append(paid_total)
+            columns['pay_offsets'].append(len(columns['pay_date']))
+
+            overrides = info.get('monthly_rent_overrides')
+            columns['has_overrides'].append(overrides is not None)
+            for key, value in (overrides or {}).items():
+                day = parse_date(key)
+                if isinstance(value, dict):
+                    if set(value) - {'amount', 'note'}:
+                        raise ValueError(f"스냅샷으로 만들 수 없는 임대료 수정입니다: {building} - {tenant} {key}")
+                    amount = value['amount']
+                    note = strings.add(value['note']) if 'note' in value else NO_NOTE
+                else:
+                    amount, note = value, LEGACY_VALUE
+                columns['ovr_tenant'].append(row)
+                columns['ovr_date'].append(day.toordinal())
+                columns['ovr_month'].append(month_index(day) if day.day == 1 else -1)
+                columns['ovr_amount'].append(to_won(amount))
+                columns['ovr_note'].append(note)
+            columns['ovr_offsets'].append(len(columns['ovr_date']))
+        columns['building_offsets'].append(len(columns['tenant_name']))
+
+    arrays = {name: np.asarray(values, dtype=ARRAY_DTYPES[name]) for name, values in columns.items()}
+    arrays['strings'], arrays['string_offsets'] = strings.arrays()
+    return arrays
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot_file(path, arrays, source):
+    """배열을 스냅샷 파일 하나로 기록 (임시 파일에 쓴 뒤 교체)"""
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, offset, len(array)]
+        offset = align(offset + array.nbytes)
+    header = json.dumps({'version': FORMAT_VERSION, 'source': list(source), 'arrays': layout}).encode('utf-8')
+    data_start = align(len(MAGIC) + 8 + len(header))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name][1])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+def write_compiled(data_file, data, source):
+    """데이터 파일의 스냅샷을 두 칸 중 오래된 칸에 기록하고 경로를 돌려준다
+
+    source 는 data 를 저장한 직후의 데이터 파일 서명이다.
+    """
+    arrays = compile_arrays(data)
+    # 지금 열려 있을 가능성이 높은 최신 칸을 피한다 (Windows 는 매핑된 파일을 교체할 수 없다)
+    paths = sorted(snapshot_paths(data_file), key=lambda path: file_signature(path) or (0,))
+    for path in paths:
+        try:
+            write_snapshot_file(path, arrays, source)
+            return path
+        except PermissionError:
+            if path == paths[-1]:
+                raise
+
+
+def read_header(path):
+    """(머리 정보, 배열 시작 위치). 스냅샷 파일이 아니면 ValueError"""
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC) + 8)
+        if len(prefix) < len(MAGIC) + 8 or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"스냅샷 파일 형식이 아닙니다: {path}")
+        length = int.from_bytes(prefix[len(MAGIC):], 'little')
+        header = json.loads(f.read(length))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {path}")
+    return header, align(len(MAGIC) + 8 + length)
+
+
+def open_compiled(data_file, signature):
+    """데이터 파일 서명과 일치하는 스냅샷을 열기. 없거나 오래되었으면 None"""
+    for path in snapshot_paths(data_file):
+        try:
+            header, data_start = read_header(path)
+            if tuple(header['source']) == tuple(signature):
+                return CompiledSnapshot(path, header, data_start)
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"스냅샷 확인 중 오류 발생: {str(e)}")
+    return None
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def split_ordinals(ordinals):
+    """날짜 서수 배열을 (월 번호 배열, 일 배열) 로"""
+    days = (np.asarray(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    return months.astype(np.int64) + 1970 * 12, (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+
+
+def days_in_months(month_indexes):
+    """월 번호 배열의 달마다 일 수"""
+    months = (np.asarray(month_indexes, dtype=np.int64) - 1970 * 12).astype('datetime64[M]')
+    return ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+
+
+def prorate_array(amounts, days, month_days):
+    """rental_money.prorate 의 배열 버전 (원 미만 버림, 음수는 0 쪽으로)"""
+    prorated = np.abs(amounts) * days // month_days
+    return np.where(amounts >= 0, prorated, -prorated)
+
+
+class CompiledSnapshot:
+    """메모리 매핑한 스냅샷 파일. 배열은 파일 내용을 그대로 가리키는 읽기 전용 뷰다"""
+
+    def __init__(self, path, header, data_start):
+        self.path = path
+        self.source = tuple(header['source'])
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for name, (dtype, offset, count) in header['arrays'].items():
+            setattr(self, name, np.frombuffer(self.mmap, dtype=np.dtype(dtype), count=count,
+                                              offset=data_start + offset))
+        self._balances = (None, None)
+
+    @property
+    def tenant_count(self):
+        return len(self.tenant_name)
+
+    def string(self, number):
+        start, end = self.string_offsets[number], self.string_offsets[number + 1]
+        return self.strings[start:end].tobytes().decode('utf-8')
+
+    def buildings(self):
+        """{건물: CompiledTenants} (임대인 데이터는 처음 꺼낼 때 변환)"""
+        buildings = {}
+        offsets = self.building_offsets.tolist()
+        names = self.tenant_name.tolist()
+        for index, name in enumerate(self.building_name.tolist()):
+            rows = range(offsets[index], offsets[index + 1])
+            buildings[self.string(name)] = CompiledTenants(self, {self.string(names[row]): row for row in rows})
+        return buildings
+
+    def tenant(self, row):
+        """행 하나를 엔진 형식의 임대인 dict 로 변환"""
+        pay = slice(self.pay_offsets[row], self.pay_offsets[row + 1])
+        tenant = {
+            'start_date': date.fromordinal(int(self.start[row])),
+            'monthly_rent': int(self.rent[row]),
+            'payments': [{'date': date.fromordinal(day), 'amount': amount}
+                         for day, amount in zip(self.pay_date[pay].tolist(), self.pay_amount[pay].tolist())],
+            'payment_type': self.string(self.payment_type[row]),
+        }
+        if self.end[row]:
+            tenant['contract_end_date'] = date.fromordinal(int(self.end[row]))
+        if self.has_overrides[row]:
+            tenant['monthly_rent_overrides'] = self.overrides(row)
+        return tenant
+
+    def overrides(self, row):
+        ovr = slice(self.ovr_offsets[row], self.ovr_offsets[row + 1])
+        overrides = {}
+        for day, amount, note in zip(self.ovr_date[ovr].tolist(), self.ovr_amount[ovr].tolist(),
+                                     self.ovr_note[ovr].tolist()):
+            if note in (NO_NOTE, LEGACY_VALUE):  # 이전 형식도 엔진처럼 {'amount': 금액} 으로
+                value = {'amount': amount}
+            else:
+                value = {'amount': amount, 'note': self.string(note)}
+            overrides[date.fromordinal(day).isoformat()] = value
+        return overrides
+
+    def balances(self, today):
+        """모든 임대인의 잔액 int64 배열
+
+        calculate_balance 와 같은 기준이다: 시작월~이번 달 청구액(RentalManagement.monthly_dues,
+        첫 달과 계약 만료월의 일할 계산 포함) - 납부 합계. 같은 달 안에서는 계산한 배열을 다시 사용한다.
+        """
+        current = month_index(today)
+        cached_month, cached = self._balances
+        if cached_month == current:
+            return cached
+        start_month = self.start_month.astype(np.int64)
+        months = np.maximum(current - start_month + 1, 0)
+        due = months * self.rent
+        # 임대 기간 안의 수정 임대료는 기본 임대료와의 차이만큼 더한다 (정수 그대로 합산)
+        owner = self.ovr_tenant
+        inside = (self.ovr_month >= self.start_month[owner]) & (self.ovr_month <= current)
+        np.add.at(due, owner[inside], self.ovr_amount[inside] - self.rent[owner[inside]])
+
+        # 첫 달 일할 계산 (일할 계산 임대인)
+        active = months > 0
+        first_due = self.month_rent(start_month, inside)
+        prorated = active & np.isin(self.payment_type, self.string_numbers('prorated'))
+        year_month, day = split_ordinals(self.start)
+        month_days = days_in_months(year_month)
+        first_prorated = np.where(prorated, prorate_array(first_due, month_days - day + 1, month_days), first_due)
+        due += first_prorated - first_due
+
+        # 계약 만료월 일할 계산 (첫 달이면 일할 계산한 금액을 다시 나눈다)
+        has_end = self.end > 0
+        end_month, end_day = split_ordinals(np.where(has_end, self.end, self.start))
+        end_month = end_month.astype(np.int64)
+        ending = active & has_end & (end_month >= start_month) & (end_month <= current)
+        end_due = np.where(end_month == start_month, first_prorated, self.month_rent(end_month, inside))
+        end_prorated = prorate_array(end_due, end_day, days_in_months(end_month))
+        due += np.where(ending, end_prorated - end_due, 0)
+
+        balances = due - self.paid_total
+        self._balances = (current, balances)
+        return balances
+
+    def month_rent(self, months, inside):
+        """임대인마다 months[임대인] 달의 임대료 (그 달의 수정 임대료가 있으면 그 금액)"""
+        rents = self.rent.astype(np.int64)
+        owner = self.ovr_tenant
+        match = inside & (self.ovr_month == months[owner])
+        rents[owner[match]] = self.ovr_amount[match]
+        return rents
+
+    def string_numbers(self, value):
+        """문자열 표에서 value 인 문자열 번호 목록 (같은 문자열이 한 번만 저장되므로 보통 하나)"""
+        return [number for number in range(len(self.string_offsets) - 1) if self.string(number) == value]
+
+
+class CompiledTenants(MutableMapping):
+    """건물 하나의 임대인 목록 (스냅샷 행은 처음 꺼낼 때 dict 로 변환해 보관)
+
+    한 번도 바뀌지 않은 임대인은 compiled_row 로 스냅샷 행 번호를 알 수 있어
+    잔액 같은 값을 배열에서 바로 읽을 수 있다.
+    """
+
+    def __init__(self, compiled, rows, values=None, read_only=False):
+        self.compiled = compiled
+        self.rows = rows  # 스냅샷과 내용이 같은 임대인 -> 행 번호
+        self.values = dict(rows) if values is None else values  # 이름 -> 행 번호 또는 변환한 dict
+        self.read_only = read_only
+
+    def __getitem__(self, name):
+        value = self.values[name]
+        if isinstance(value, int):
+            value = self.values[name] = self.compiled.tenant(value)
+        return value
+
+    def __setitem__(self, name, tenant):
+        if self.read_only:
+            raise TypeError("읽기 전용 스냅샷은 수정할 수 없습니다.")
+        self.values[name] = tenant
+        self.rows.pop(name, None)
+
+    def __delitem__(self, name):
+        if self.read_only:
+            raise TypeError("읽기 전용 스냅샷은 수정할 수 없습니다.")
+        del self.values[name]
+        self.rows.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"CompiledTenants({list(self.values)!r})"
+
+    def compiled_row(self, name):
+        return self.rows.get(name)
+
+    def copy(self, read_only=False):
+        return CompiledTenants(self.compiled, dict(self.rows), dict(self.values), read_only)
+
+
+class SnapshotCompiler:
+    """저장 뒤 스냅샷을 백그라운드 스레드에서 다시 만든다
+
+    작업 중에 새 요청이 들어오면 밀린 요청 중 가장 최근 것만 처리한다.
+    종료를 늦추지 않도록 데몬 스레드를 사용한다. 스냅샷 파일은 임시 파일을 교체해 기록하므로
+    도중에 끝나도 다음 시작 때 JSON 을 읽을 뿐이다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    def submit(self, data_file, data, source):
+        with self._lock:
+            self._pending[data_file] = (data, source)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapshot-compiler', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                data_file, (data, source) = self._pending.popitem()
+            try:
+                write_compiled(data_file, data, source)
+            except (OSError, ValueError) as e:
+                # 스냅샷이 없어도 다음 시작 때 JSON 을 읽으면 되므로 알리기만 한다
+                print(f"스냅샷 생성 중 오류 발생: {str(e)}")
+
+    def wait(self):
+        """진행 중인 스냅샷 생성이 끝날 때까지 대기"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+
+compiler = SnapshotCompiler()
@@ -0,0 +1,95 @@
+"""데이터 파일 잠금과 변경 감지
+
+여러 프로그램(또는 여러 사용자)이 같은 rental_data.json 을 열어 둘 때 사용한다.
+
+- 저장은 데이터 파일 옆의 .lock 파일에 대한 권고 잠금(advisory lock) 아래에서만 한다.
+- 저장은 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 잠금 없이도 반쯤 쓰인 파일을 보지 않는다.
+- 파일 서명(수정 시각, 크기, inode)을 버전 표시로 사용해, 마지막으로 읽거나 쓴 뒤
+  다른 곳에서 파일이 바뀌었는지 확인한다.
+"""
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_TIMEOUT = 10.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+class DataFileLock:
+    """데이터 파일 쓰기 잠금 (프로세스 간 권고 잠금)
+
+    같은 데이터 파일을 쓰는 모든 프로그램이 이 잠금을 사용해야 효과가 있다.
+    timeout 초 안에 잠금을 얻지 못하면 TimeoutError 를 발생시킨다.
+    """
+
+    def __init__(self, data_file, timeout=LOCK_TIMEOUT):
+        self.path = data_file + '.lock'
+        self.timeout = timeout
+        self.file = None
+
+    def acquire(self):
+        self.file = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                return self
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self.file.close()
+                    self.file = None
+                    raise TimeoutError(f"다른 프로그램이 데이터 파일을 저장하는 중입니다: {self.path}")
+                time.sleep(LOCK_POLL_INTERVAL)
+
+    def release(self):
+        if self.file is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def file_signature(path):
+    """파일 버전 표시 (수정 시각, 크기, inode). 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체 (DataFileLock 을 잡은 상태에서 호출)"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
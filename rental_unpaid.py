@@ -0,0 +1,106 @@
+"""대시보드 미납 목록 모델
+
+전체 임대인의 미납액, 미납 경과 일수, 연체 위험 점수를 열마다 numpy 배열로 들고 있고,
+필터(건물, 최소 미납액)와 정렬은 배열 위에서 한 번에 계산한다. 화면에는 한 페이지 분량의
+행만 만들어 넣으므로 미납 임대인이 수천 명이어도 Treeview 항목은 페이지 크기를 넘지 않는다.
+
+    model = unpaid_model(rental_manager)
+    rows = model.view(sort='amount', descending=True, building='영진프라자', minimum=100000)
+    model.rows(rows, page=0)  # [(건물, 임대인, 미납액, 경과 일수, 위험 점수)]
+
+행 순서와 위험 점수, 경과 일수는 rental_risk.RiskBook 을 그대로 쓰고, 납부만 바뀌었으면
+바뀐 임대인의 미납액만 다시 계산한다.
+"""
+import weakref
+from datetime import datetime
+
+import numpy as np
+
+from rental_risk import risk_book
+
+PAGE_SIZE = 100  # 한 페이지에 보여줄 행 수
+SORT_COLUMNS = ('name', 'amount', 'age', 'risk')
+
+_model_cache = weakref.WeakKeyDictionary()  # RentalManagement -> UnpaidModel
+
+
+class UnpaidModel:
+    """전체 임대인의 미납 목록 열 (행 순서는 RiskBook.keys)"""
+
+    def __init__(self, rental_manager, book):
+        self.book = book
+        self.keys = book.keys
+        self.version = rental_manager.version
+        self.buildings = list(dict.fromkeys(building for building, _ in self.keys))
+        building_ids = {building: number for number, building in enumerate(self.buildings)}
+        self.building = np.array([building_ids[building] for building, _ in self.keys], dtype=np.int64)
+        self.balance = np.array([rental_manager.calculate_balance(building, tenant) for building, tenant in self.keys],
+                                dtype=np.int64)
+        # 이름순 정렬은 미리 구한 순위로 (이름 목록을 매번 정렬하지 않는다)
+        name_order = sorted(range(len(self.keys)), key=lambda row: self.keys[row])
+        self.name_rank = np.empty(len(self.keys), dtype=np.int64)
+        self.name_rank[name_order] = np.arange(len(self.keys))
+
+    def refresh(self, rental_manager, book):
+        """바뀐 임대인의 미납액만 다시 계산 (위험 점수가 전체 다시 계산되었으면 False)"""
+        if book is not self.book:
+            return False
+        if rental_manager.version != self.version:
+            index = book.index
+            for key in rental_manager.changed_tenants(self.version):
+                row = index.get(key)
+                if row is not None:
+                    self.balance[row] = rental_manager.calculate_balance(*key)
+            self.version = rental_manager.version
+        return True
+
+    def column(self, name):
+        if name == 'name':
+            return self.name_rank
+        if name == 'amount':
+            return self.balance
+        if name == 'age':
+            return self.book.features['age']
+        if name == 'risk':
+            return self.book.features['score']
+        raise ValueError(f"알 수 없는 정렬 열입니다: {name}")
+
+    def view(self, sort='risk', descending=True, building=None, minimum=0):
+        """필터를 통과한 행 번호 배열 (sort 열 순서, 같은 값은 이름순)"""
+        mask = self.balance > max(minimum, 0)
+        if building is not None:
+            if building not in self.buildings:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.building == self.buildings.index(building)
+        rows = np.flatnonzero(mask)
+        values = self.column(sort)[rows]
+        if descending:
+            values = -values
+        order = np.lexsort((self.name_rank[rows], values))
+        return rows[order]
+
+    def total(self, rows=None):
+        """미납액 합계 (rows 가 없으면 미납이 있는 전체 임대인)"""
+        balance = self.balance if rows is None else self.balance[rows]
+        return int(balance[balance > 0].sum())
+
+    def rows(self, rows, page=0, page_size=PAGE_SIZE):
+        """rows 중 page 번째 페이지의 [(건물, 임대인, 미납액, 경과 일수, 위험 점수)]"""
+        page_rows = rows[page * page_size:(page + 1) * page_size].tolist()
+        age = self.book.features['age']
+        score = self.book.features['score']
+        return [(*self.keys[row], int(self.balance[row]), int(age[row]), float(score[row])) for row in page_rows]
+
+
+def page_count(rows, page_size=PAGE_SIZE):
+    return max((len(rows) + page_size - 1) // page_size, 1)
+
+
+def unpaid_model(rental_manager, today=None):
+    """rental_manager 의 미납 목록 모델 (이전 결과가 있으면 바뀐 임대인만 다시 계산)"""
+    today = today or datetime.now().date()
+    book = risk_book(rental_manager, today)
+    model = _model_cache.get(rental_manager)
+    if model is None or not model.refresh(rental_manager, book):
+        model = _model_cache[rental_manager] = UnpaidModel(rental_manager, book)
+    return model